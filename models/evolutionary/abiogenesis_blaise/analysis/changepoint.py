@@ -0,0 +1,429 @@
+"""
+Online change-point detection for the replication phase transition.
+
+``CusumDetector`` is a one-sided CUSUM over a scalar stream. The first
+``warmup`` observations fix the pre-change mean and standard deviation;
+after that each observation z (in standard deviations from that mean,
+sign-flipped for decreases) updates
+
+    S = max(0, S + z - drift)
+
+and a change is declared once S exceeds ``threshold``. The change is
+placed at the last observation where S was 0 (the start of the
+excursion that raised the alarm). Each update is O(1); ``update_batch``
+runs the same recursion vectorized over an array.
+
+Confidence is one minus the probability that CUSUM on pre-change data
+alone would have alarmed within the observations monitored so far,
+using Siegmund's approximation of the in-control average run length
+
+    ARL0 = (exp(2 k b) - 2 k b - 1) / (2 k^2),   b = threshold + 1.166
+
+with k = drift. It assumes roughly Gaussian standardized observations,
+so treat it as a guide, not a p-value.
+
+``TransitionDetector`` watches the two streams that move at the BFF
+transition: per-interaction operation counts, on a log2(1 + ops) scale
+(copy loops replace a mix of short runs and timeouts, which moves the
+typical count by orders of magnitude even when the raw mean barely
+changes), and sampled diversity, which collapses as one replicator
+fills the soup. The transition is declared when both are in an alarm
+at once.
+
+Usage:
+    detector = TransitionDetector()
+    detector.update_ops(records.operations, first_interaction=soup.interaction_count - n + 1)
+    detector.update_diversity(soup.get_diversity(), soup.interaction_count)
+    if detector.transition is not None:
+        detector.transition.position, detector.transition.confidence
+"""
+
+import math
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# Siegmund's correction to the CUSUM threshold
+_SIEGMUND_OFFSET = 1.166
+
+
+@dataclass
+class ChangePoint:
+    """
+    A detected change.
+
+    Attributes:
+        position: Position (e.g. interaction count) where the change began
+        detected_at: Position of the observation that raised the alarm
+        magnitude: Estimated mean shift after the change, in pre-change
+            standard deviations (signed)
+        confidence: Probability that the alarm is not a false alarm
+    """
+    position: int
+    detected_at: int
+    magnitude: float
+    confidence: float
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form."""
+        return asdict(self)
+
+
+def false_alarm_run_length(drift: float, threshold: float) -> float:
+    """Approximate mean number of in-control observations before a false alarm."""
+    b = 2 * drift * (threshold + _SIEGMUND_OFFSET)
+    if b > 700:
+        return math.inf
+    return (math.exp(b) - b - 1) / (2 * drift ** 2)
+
+
+class CusumDetector:
+    """
+    One-sided CUSUM change detector over a scalar stream.
+
+    Attributes:
+        direction: +1 to detect increases, -1 for decreases
+        drift: Slack per observation, in standard deviations (half the
+            smallest shift worth detecting)
+        threshold: Alarm level of the CUSUM statistic, in standard deviations
+        warmup: Observations used to estimate the pre-change mean and std
+        min_std: Floor on the estimated std (for near-constant streams)
+        clip: Standardized observations are clipped to [-clip, clip]
+            (None = no clipping), which bounds the effect of heavy tails
+        latch: Keep the first change for good; otherwise a change is
+            withdrawn when the statistic falls back to 0 and the next
+            alarm replaces it
+        count: Observations seen
+        change: Current ChangePoint, else None
+        withdrawn: Number of withdrawn (unlatched) alarms
+    """
+
+    def __init__(
+        self,
+        direction: int = 1,
+        drift: float = 0.5,
+        threshold: float = 8.0,
+        warmup: int = 100,
+        min_std: float = 1e-9,
+        clip: Optional[float] = None,
+        latch: bool = True
+    ):
+        if direction not in (1, -1):
+            raise ValueError(f"direction must be +1 or -1, got {direction}")
+        if warmup < 2:
+            raise ValueError(f"warmup must be >= 2, got {warmup}")
+        self.direction = direction
+        self.drift = drift
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_std = min_std
+        self.clip = clip
+        self.latch = latch
+        self.count = 0
+        self.change: Optional[ChangePoint] = None
+        self.withdrawn = 0
+        # Welford accumulators over the warm-up
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._std = None
+        self._statistic = 0.0
+        # Position and observation index where the statistic was last 0
+        self._reset_position = 0
+        self._reset_count = 0
+
+    @property
+    def statistic(self) -> float:
+        """Current CUSUM statistic (standard deviations)."""
+        return self._statistic
+
+    def _standardize(self, values):
+        """Signed standardized increments z - drift (scalar or array)."""
+        z = self.direction * (values - self._mean) / self._std
+        if self.clip is not None:
+            z = np.clip(z, -self.clip, self.clip)
+        return z - self.drift
+
+    def update(self, value: float, position: Optional[int] = None) -> Optional[ChangePoint]:
+        """
+        Add one observation.
+
+        Args:
+            value: Observation
+            position: Its position (default: the observation count)
+
+        Returns:
+            The ChangePoint if this observation raised an alarm, else None
+        """
+        if self.change is not None and self.latch:
+            return None
+        self.count += 1
+        position = self.count if position is None else int(position)
+        if self._std is None:
+            delta = value - self._mean
+            self._mean += delta / self.count
+            self._m2 += delta * (value - self._mean)
+            if self.count == self.warmup:
+                self._finish_warmup(position)
+            return None
+
+        self._statistic = max(0.0, self._statistic + float(self._standardize(value)))
+        if self._statistic == 0.0:
+            self._reset(position)
+        elif self.change is None and self._statistic > self.threshold:
+            self._raise_alarm(position)
+            return self.change
+        return None
+
+    def update_batch(
+        self,
+        values: np.ndarray,
+        positions: Optional[np.ndarray] = None
+    ) -> Optional[ChangePoint]:
+        """
+        Add a batch of observations (same result as calling update on each).
+
+        Args:
+            values: 1-D array of observations
+            positions: Their positions (default: consecutive observation counts)
+
+        Returns:
+            The ChangePoint if the batch raised an alarm that is still
+            current, else None
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if positions is None:
+            positions = np.arange(self.count + 1, self.count + 1 + values.shape[0])
+        positions = np.asarray(positions, dtype=np.int64)
+
+        if self._std is None:
+            take = min(values.shape[0], self.warmup - self.count)
+            for k in range(take):
+                self.update(float(values[k]), int(positions[k]))
+            values, positions = values[take:], positions[take:]
+
+        raised = None
+        while values.shape[0] and not (self.change is not None and self.latch):
+            # S_t = D_t - min(-S_0, min_{j<=t} D_j) with D the cumulative sum of z - drift
+            cumulative = np.cumsum(self._standardize(values))
+            statistic = cumulative - np.minimum.accumulate(
+                np.minimum(cumulative, -self._statistic)
+            )
+            zeros = np.flatnonzero(statistic == 0.0)
+            if self.change is None:
+                # Run to the first alarm
+                alarms = np.flatnonzero(statistic > self.threshold)
+                end = alarms[0] + 1 if alarms.shape[0] else statistic.shape[0]
+            else:
+                # Run to the first return to 0, which withdraws the change
+                end = zeros[0] + 1 if zeros.shape[0] else statistic.shape[0]
+            zeros = zeros[zeros < end]
+            if zeros.shape[0]:
+                self._reset(int(positions[zeros[-1]]), self.count + int(zeros[-1]) + 1)
+            self.count += int(end)
+            self._statistic = float(statistic[end - 1])
+            if self.change is None and self._statistic > self.threshold:
+                self._raise_alarm(int(positions[end - 1]))
+                raised = self.change
+            values, positions = values[end:], positions[end:]
+        return raised if raised is self.change else None
+
+    def _finish_warmup(self, position: int) -> None:
+        """Fix the pre-change mean and std from the warm-up observations."""
+        variance = self._m2 / (self.count - 1)
+        self._std = max(math.sqrt(variance), self.min_std)
+        self._reset_position = position
+        self._reset_count = self.count
+
+    def _reset(self, position: int, count: Optional[int] = None) -> None:
+        """Note that the statistic is 0 at ``position``, withdrawing any change."""
+        self._reset_position = position
+        self._reset_count = self.count if count is None else count
+        if self.change is not None:
+            self.change = None
+            self.withdrawn += 1
+
+    def _raise_alarm(self, position: int) -> None:
+        """Record the change that the current excursion represents."""
+        length = self.count - self._reset_count
+        # Mean increment over the excursion is statistic / length
+        magnitude = self.direction * (self._statistic / length + self.drift)
+        monitored = self._reset_count - self.warmup
+        run_length = false_alarm_run_length(self.drift, self.threshold)
+        self.change = ChangePoint(
+            position=self._reset_position,
+            detected_at=position,
+            magnitude=magnitude,
+            confidence=math.exp(-monitored / run_length),
+        )
+
+    def get_state(self) -> Dict:
+        """JSON-serializable detector state (for run checkpoints)."""
+        return {
+            'direction': self.direction,
+            'drift': self.drift,
+            'threshold': self.threshold,
+            'warmup': self.warmup,
+            'min_std': self.min_std,
+            'clip': self.clip,
+            'latch': self.latch,
+            'count': self.count,
+            'change': self.change.to_dict() if self.change is not None else None,
+            'withdrawn': self.withdrawn,
+            'mean': self._mean,
+            'm2': self._m2,
+            'std': self._std,
+            'statistic': self._statistic,
+            'reset_position': self._reset_position,
+            'reset_count': self._reset_count,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'CusumDetector':
+        """Restore a detector from get_state()."""
+        detector = cls(
+            direction=state['direction'], drift=state['drift'], threshold=state['threshold'],
+            warmup=state['warmup'], min_std=state['min_std'], clip=state['clip'],
+            latch=state['latch']
+        )
+        detector.count = state['count']
+        if state['change'] is not None:
+            detector.change = ChangePoint(**state['change'])
+        detector.withdrawn = state['withdrawn']
+        detector._mean = state['mean']
+        detector._m2 = state['m2']
+        detector._std = state['std']
+        detector._statistic = state['statistic']
+        detector._reset_position = state['reset_position']
+        detector._reset_count = state['reset_count']
+        return detector
+
+
+class TransitionDetector:
+    """
+    Replication phase-transition detector over the ops and diversity streams.
+
+    Both streams use unlatched detectors, so a transient alarm on one
+    stream is withdrawn once it settles. The transition is declared (for
+    good) when both streams are in an alarm at the same time.
+
+    Attributes:
+        ops: CusumDetector for increases in log2(1 + ops) per interaction
+        diversity: CusumDetector for decreases in sampled diversity
+        transition: ChangePoint once declared, else None
+    """
+
+    def __init__(
+        self,
+        ops_warmup: int = 10_000,
+        ops_drift: float = 1.0,
+        ops_threshold: float = 25.0,
+        diversity_warmup: int = 10,
+        diversity_threshold: float = 8.0,
+        diversity_min_std: float = 0.05
+    ):
+        """
+        Args:
+            ops_warmup: Interactions used as the pre-transition baseline
+            ops_drift: CUSUM slack of the ops stream (std units). Copy
+                loops shift log ops by about 2 std; before the transition
+                the soup drifts by well under 0.5 std per million
+                interactions
+            ops_threshold: CUSUM alarm level of the ops stream (std units;
+                high because it sees every interaction)
+            diversity_warmup: Diversity samples used as the baseline
+            diversity_threshold: CUSUM alarm level of the diversity stream
+            diversity_min_std: Std floor for diversity, which is almost
+                constant before the transition
+        """
+        self.ops = CusumDetector(
+            direction=1, drift=ops_drift, threshold=ops_threshold, warmup=ops_warmup,
+            clip=3.0, latch=False
+        )
+        self.diversity = CusumDetector(
+            direction=-1, drift=0.5, threshold=diversity_threshold,
+            warmup=diversity_warmup, min_std=diversity_min_std, latch=False
+        )
+        self.transition: Optional[ChangePoint] = None
+
+    def update_ops(
+        self,
+        operations: np.ndarray,
+        first_interaction: int
+    ) -> Optional[ChangePoint]:
+        """
+        Add per-interaction operation counts.
+
+        Args:
+            operations: Operation counts in execution order
+            first_interaction: Interaction number of operations[0]
+
+        Returns:
+            The transition if this update declared it, else None
+        """
+        if self.transition is not None:
+            return None
+        operations = np.asarray(operations)
+        self.ops.update_batch(
+            np.log2(1.0 + operations),
+            np.arange(first_interaction, first_interaction + operations.shape[0])
+        )
+        return self._check()
+
+    def update_diversity(self, diversity: float, interaction: int) -> Optional[ChangePoint]:
+        """
+        Add a diversity sample taken at ``interaction``.
+
+        Returns:
+            The transition if this update declared it, else None
+        """
+        if self.transition is not None:
+            return None
+        self.diversity.update(diversity, interaction)
+        return self._check()
+
+    def _check(self) -> Optional[ChangePoint]:
+        """
+        Declare the transition once both streams are in an alarm (or
+        diversity alone if no ops were ever supplied).
+
+        Its position is the ops change point (per-interaction resolution)
+        when available; confidence combines the streams as if their false
+        alarms were independent.
+        """
+        diversity = self.diversity.change
+        if diversity is None:
+            return None
+        if self.ops.count == 0:
+            self.transition = diversity
+            return self.transition
+        ops = self.ops.change
+        if ops is None:
+            return None
+        self.transition = ChangePoint(
+            position=ops.position,
+            detected_at=max(ops.detected_at, diversity.detected_at),
+            magnitude=ops.magnitude,
+            confidence=1 - (1 - ops.confidence) * (1 - diversity.confidence),
+        )
+        return self.transition
+
+    def get_state(self) -> Dict:
+        """JSON-serializable detector state (for run checkpoints)."""
+        return {
+            'ops': self.ops.get_state(),
+            'diversity': self.diversity.get_state(),
+            'transition': self.transition.to_dict() if self.transition is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'TransitionDetector':
+        """Restore a detector from get_state()."""
+        detector = cls.__new__(cls)
+        detector.ops = CusumDetector.from_state(state['ops'])
+        detector.diversity = CusumDetector.from_state(state['diversity'])
+        detector.transition = (
+            ChangePoint(**state['transition']) if state['transition'] is not None else None
+        )
+        return detector
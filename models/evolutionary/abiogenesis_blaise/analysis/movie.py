@@ -0,0 +1,333 @@
+"""
+Soup movies: render a series of soup states as images.
+
+Each frame is the soup's size x tape_length byte matrix, one row per
+tape, coloured through a 256-entry palette: data bytes in dim greys and
+instruction bytes in bright colours by action (pointer moves blue,
+increments green, copies red, loops yellow), so replicators stand out as
+coloured bands. Rows can be reordered by replicator family
+(``family_order``) and tiled into several columns for large soups.
+
+Frames come from a snapshot file (core.recorder, one frame per
+recorded arena) or from a series of binary checkpoints (core.checkpoint,
+one frame per file). Colouring is a single palette lookup,
+``palette[arena]`` (render_frame). Movie frames are loaded, laid out
+and encoded by a pool of worker processes, each opening its sources by
+path, so no arena is pickled on the way in; a 1024 x 64 frame takes
+about 3 ms on one core.
+
+The output is a directory of PNG frames (``frame_00000.png``, ...) or,
+for a ``.gif`` path, an animated GIF. Both store palette images, with
+the laid-out bytes as colour indices and the byte palette as colour
+table: lossless, one byte per pixel, and cheap to encode.
+
+Usage:
+    render_movie('experiments/run_20260101_120000.snap', 'movie.gif', workers=4)
+    render_movie(sorted(Path('ckpts').glob('*.ckpt')), 'frames/', family_sort=True)
+"""
+
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from core.checkpoint import read_checkpoint
+from core.instruction_set import InstructionSet, get_instruction_set
+from core.recorder import SnapshotReader
+from analysis.replicators import find_families
+
+
+# RGB colour of each action code (core.instruction_set)
+ACTION_COLORS = {
+    1: (70, 130, 255),     # data_left
+    2: (120, 190, 255),    # data_right
+    3: (0, 200, 200),      # console_left
+    4: (90, 240, 230),     # console_right
+    5: (60, 220, 80),      # increment
+    6: (170, 240, 60),     # decrement
+    7: (255, 70, 60),      # copy_console
+    8: (255, 120, 40),     # copy_to_data
+    9: (255, 80, 170),     # copy_to_console
+    10: (255, 220, 0),     # loop_start
+    11: (255, 170, 0),     # loop_end
+}
+
+# Grey levels of data bytes 0 and 255 (dim, so instructions stand out)
+DATA_GREY = (16, 72)
+
+# One frame reference: (source path, frame index within the source)
+FrameRef = Tuple[str, int]
+
+
+def byte_palette(instruction_set: Union[str, InstructionSet, None] = None) -> np.ndarray:
+    """
+    Colour of every byte value.
+
+    Args:
+        instruction_set: Instruction set whose opcodes are highlighted
+            (default: the default set)
+
+    Returns:
+        (256, 3) uint8 array of RGB colours indexed by byte
+    """
+    instruction_set = get_instruction_set(instruction_set)
+    low, high = DATA_GREY
+    grey = low + (np.arange(256) * (high - low)) // 255
+    palette = np.repeat(grey[:, None], 3, axis=1).astype(np.uint8)
+    for byte, action in enumerate(instruction_set.actions):
+        if action:
+            palette[byte] = ACTION_COLORS[action]
+    return palette
+
+
+def family_order(
+    arena: np.ndarray,
+    instruction_set: Union[str, InstructionSet, None] = None,
+    **family_kwargs
+) -> np.ndarray:
+    """
+    Row order grouping tapes by replicator family.
+
+    Families come first, largest first; tapes in no family follow.
+    Within each group tapes are sorted by content, so copies line up.
+
+    Args:
+        arena: 2-D uint8 array of shape (size, tape_length)
+        instruction_set: Instruction set of the soup (default set if None)
+        **family_kwargs: Passed to analysis.replicators.find_families
+
+    Returns:
+        Permutation of the tape indices
+    """
+    families = find_families(arena, instruction_set=instruction_set, **family_kwargs)
+    rank = np.full(arena.shape[0], len(families), dtype=np.int64)
+    for family in families:
+        rank[family.tapes] = family.family_id
+    # lexsort's last key is the primary one: family rank, then bytes left to right
+    return np.lexsort((*arena.T[::-1], rank))
+
+
+def layout_frame(
+    arena: np.ndarray,
+    order: Optional[np.ndarray] = None,
+    columns: int = 1,
+    scale: int = 1
+) -> np.ndarray:
+    """
+    Arrange an arena's bytes as an image of palette indices.
+
+    Args:
+        arena: 2-D uint8 array of shape (size, tape_length)
+        order: Row order of the tapes (default: soup order)
+        columns: Side-by-side columns of tapes (must divide the soup size)
+        scale: Pixels per byte along each axis
+
+    Returns:
+        uint8 array of shape (scale * size / columns, scale * columns * tape_length)
+
+    Raises:
+        ValueError: If ``columns`` does not divide the soup size
+    """
+    size, tape_length = arena.shape
+    if size % columns:
+        raise ValueError(f"columns={columns} does not divide the soup size {size}")
+    if order is not None:
+        arena = arena[order]
+    rows = size // columns
+    image = arena.reshape(columns, rows, tape_length).transpose(1, 0, 2).reshape(rows, -1)
+    if scale > 1:
+        image = np.repeat(np.repeat(image, scale, axis=0), scale, axis=1)
+    return np.ascontiguousarray(image)
+
+
+def render_frame(
+    arena: np.ndarray,
+    palette: Optional[np.ndarray] = None,
+    family_sort: bool = False,
+    columns: int = 1,
+    scale: int = 1,
+    instruction_set: Union[str, InstructionSet, None] = None
+) -> np.ndarray:
+    """
+    Render one soup state as an RGB image.
+
+    Args:
+        arena: 2-D uint8 array of shape (size, tape_length)
+        palette: (256, 3) colours (default: byte_palette(instruction_set))
+        family_sort: Group tapes by replicator family (family_order)
+        columns: Side-by-side columns of tapes
+        scale: Pixels per byte along each axis
+        instruction_set: Instruction set of the soup (default set if None)
+
+    Returns:
+        uint8 array of shape (height, width, 3)
+    """
+    if palette is None:
+        palette = byte_palette(instruction_set)
+    order = family_order(arena, instruction_set) if family_sort else None
+    return palette[layout_frame(arena, order, columns, scale)]
+
+
+def palette_image(indices: np.ndarray, palette: np.ndarray) -> Image.Image:
+    """
+    Wrap laid-out byte indices as a palette image.
+
+    The image stores one byte per pixel and ``palette`` as its colour
+    table, so it shows exactly ``palette[indices]`` at a third of the
+    size of the RGB frame and encodes several times faster.
+    """
+    image = Image.frombytes('P', indices.shape[::-1], indices.tobytes())
+    image.putpalette(palette.tobytes())
+    return image
+
+
+def frame_refs(sources: Union[str, Path, Sequence[Union[str, Path]]], step: int = 1) -> List[FrameRef]:
+    """
+    List the frames of a movie.
+
+    Args:
+        sources: A snapshot file (every recorded frame), a directory of
+            .ckpt files (sorted by name), or a sequence of files of either
+            kind, in movie order
+        step: Keep every ``step``-th frame
+
+    Returns:
+        (path, frame index) references
+    """
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+    refs = []
+    for source in map(Path, sources):
+        if source.is_dir():
+            refs.extend((str(path), 0) for path in sorted(source.glob('*.ckpt')))
+        elif source.suffix == '.snap':
+            refs.extend((str(source), index) for index in range(len(SnapshotReader(source))))
+        else:
+            refs.append((str(source), 0))
+    return refs[::step]
+
+
+def source_instruction_set(path: Union[str, Path]) -> InstructionSet:
+    """The instruction set recorded with a checkpoint or snapshot (default if none)."""
+    if Path(path).suffix == '.snap':
+        return get_instruction_set(SnapshotReader(path).extra.get('config', {}).get('instruction_set'))
+    metadata, _, _ = read_checkpoint(path)
+    return get_instruction_set(metadata.get('instruction_set'))
+
+
+# Snapshot readers opened by this process, by path
+_readers: Dict[str, SnapshotReader] = {}
+
+
+def load_frame(ref: FrameRef) -> np.ndarray:
+    """Load the arena of one frame reference."""
+    path, index = ref
+    if path.endswith('.snap'):
+        if path not in _readers:
+            _readers[path] = SnapshotReader(path)
+        return _readers[path][index]
+    return read_checkpoint(path)[1]
+
+
+def _render_job(
+    job: Tuple[int, FrameRef],
+    palette: np.ndarray,
+    instruction_set: InstructionSet,
+    family_sort: bool,
+    columns: int,
+    scale: int,
+    frame_dir: Optional[str]
+) -> Union[str, np.ndarray]:
+    """Lay out one frame; write it as PNG into ``frame_dir``, or return its indices."""
+    number, ref = job
+    arena = load_frame(ref)
+    order = family_order(arena, instruction_set) if family_sort else None
+    indices = layout_frame(arena, order, columns, scale)
+    if frame_dir is None:
+        return indices
+    path = Path(frame_dir) / f"frame_{number:05d}.png"
+    palette_image(indices, palette).save(path, compress_level=1)
+    return str(path)
+
+
+def render_movie(
+    sources: Union[str, Path, Sequence[Union[str, Path]]],
+    output: Union[str, Path],
+    fps: float = 20,
+    step: int = 1,
+    family_sort: bool = False,
+    columns: int = 1,
+    scale: int = 1,
+    instruction_set: Union[str, InstructionSet, None] = None,
+    workers: int = 0
+) -> Path:
+    """
+    Render a soup movie.
+
+    Args:
+        sources: Frame sources (see frame_refs)
+        output: A ``.gif`` file, or a directory for the PNG frames
+        fps: GIF frame rate
+        step: Keep every ``step``-th frame
+        family_sort: Group tapes by replicator family in every frame
+        columns: Side-by-side columns of tapes
+        scale: Pixels per byte along each axis
+        instruction_set: Instruction set of the soup, whose opcodes are
+            highlighted and group families (default: from the first source)
+        workers: Worker processes (0 = render in this process)
+
+    Returns:
+        Path of the GIF or the frame directory
+
+    Raises:
+        ValueError: If the sources contain no frames
+    """
+    refs = frame_refs(sources, step=step)
+    if not refs:
+        raise ValueError(f"No frames found in {sources}")
+    if instruction_set is None:
+        instruction_set = source_instruction_set(refs[0][0])
+    instruction_set = get_instruction_set(instruction_set)
+    palette = byte_palette(instruction_set)
+
+    output = Path(output)
+    gif = output.suffix.lower() == '.gif'
+    if gif:
+        output.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+
+    render = partial(
+        _render_job, palette=palette, instruction_set=instruction_set,
+        family_sort=family_sort, columns=columns,
+        scale=scale, frame_dir=None if gif else str(output)
+    )
+    jobs = list(enumerate(refs))
+    if workers == 0:
+        results = list(map(render, jobs))
+    else:
+        # spawn: forking after numba has started threads is not safe
+        context = mp.get_context('spawn')
+        chunksize = max(1, len(jobs) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(render, jobs, chunksize=chunksize))
+
+    if gif:
+        _write_gif(output, results, palette, fps)
+    return output
+
+
+def _write_gif(path: Path, frames: Iterable[np.ndarray], palette: np.ndarray, fps: float) -> None:
+    """Save index frames as a looping GIF with ``palette`` as the colour table.
+
+    Pillow merges identical consecutive frames into one longer frame.
+    """
+    images = [palette_image(indices, palette) for indices in frames]
+    images[0].save(
+        path, save_all=True, append_images=images[1:], loop=0,
+        duration=max(1, int(round(1000 / fps))), optimize=False
+    )
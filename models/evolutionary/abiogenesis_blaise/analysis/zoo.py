@@ -0,0 +1,392 @@
+"""
+Persistent catalog ("zoo") of replicators seen across runs.
+
+Replicators are stored in SQLite under their canonical form: the tape's
+instruction bytes only, with every data byte removed. Copies that differ
+only in data bytes, or that are shifted within the tape, share one entry.
+Which bytes are instructions depends on the soup's instruction set
+(core.instruction_set), so programs are keyed by set name and canonical
+form together; the same bytes under two sets are two programs.
+
+Tables:
+    runs       id, name (unique), config (JSON), seed, created
+    programs   id, instruction_set, canonical ((instruction_set, canonical)
+               unique, indexed), tape (most abundant exact variant at peak),
+               instructions, first_run, first_interaction, peak_abundance,
+               peak_run, peak_interaction
+    sightings  (run_id, program_id) -> first_interaction, peak_abundance,
+               peak_interaction
+
+A program is recorded when at least ``min_abundance`` tapes of a soup
+share its canonical form and it has at least ``min_instructions``
+instructions (short canonical forms recur in random soups by chance).
+
+Ingestion is incremental: ``ingest`` folds a soup snapshot into an
+in-memory batch, and every ``batch_size`` snapshots (or on ``flush``)
+the batch is upserted in one transaction. Several processes may feed
+one zoo; SQLite serializes their transactions.
+
+Usage:
+    with ReplicatorZoo('experiments/zoo.sqlite') as zoo:
+        run_id = zoo.start_run('run_20250101_120000', config, seed=42)
+        zoo.ingest(run_id, soup.arena, soup.interaction_count, soup.instruction_set)
+
+    zoo.lookup(tape_bytes)   # by canonical form (default set), via the index
+    zoo.top(10)
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core.instruction_set import InstructionSet, get_instruction_set
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    config TEXT NOT NULL,
+    seed INTEGER,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS programs (
+    id INTEGER PRIMARY KEY,
+    instruction_set TEXT NOT NULL,
+    canonical BLOB NOT NULL,
+    tape BLOB NOT NULL,
+    instructions INTEGER NOT NULL,
+    first_run INTEGER NOT NULL REFERENCES runs(id),
+    first_interaction INTEGER NOT NULL,
+    peak_abundance INTEGER NOT NULL,
+    peak_run INTEGER NOT NULL REFERENCES runs(id),
+    peak_interaction INTEGER NOT NULL,
+    UNIQUE (instruction_set, canonical)
+);
+CREATE TABLE IF NOT EXISTS sightings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    program_id INTEGER NOT NULL REFERENCES programs(id),
+    first_interaction INTEGER NOT NULL,
+    peak_abundance INTEGER NOT NULL,
+    peak_interaction INTEGER NOT NULL,
+    PRIMARY KEY (run_id, program_id)
+);
+CREATE INDEX IF NOT EXISTS sightings_program ON sightings(program_id);
+CREATE INDEX IF NOT EXISTS programs_peak ON programs(peak_abundance);
+"""
+
+# Columns of a program dict (lookup, top)
+_PROGRAM_COLUMNS = (
+    'id', 'instruction_set', 'canonical', 'tape', 'instructions', 'first_run', 'first_interaction',
+    'peak_abundance', 'peak_run', 'peak_interaction',
+)
+_SELECT_PROGRAMS = f"SELECT {', '.join(_PROGRAM_COLUMNS)} FROM programs"
+
+
+def canonical_form(
+    tape: Union[bytes, np.ndarray],
+    instruction_set: Union[str, InstructionSet, None] = None
+) -> bytes:
+    """Instruction bytes of a tape, in order, with data bytes removed."""
+    mask = get_instruction_set(instruction_set).mask
+    data = np.frombuffer(tape, dtype=np.uint8) if isinstance(tape, bytes) else tape
+    return data[mask[data]].tobytes()
+
+
+def observe_replicators(
+    arena: np.ndarray,
+    min_abundance: int = 2,
+    min_instructions: int = 8,
+    instruction_set: Union[str, InstructionSet, None] = None
+) -> List[Tuple[bytes, bytes, int]]:
+    """
+    Group a soup's tapes by canonical form.
+
+    Args:
+        arena: 2-D uint8 array of shape (size, tape_length)
+        min_abundance: Minimum number of tapes sharing a canonical form
+        min_instructions: Minimum instructions in the canonical form
+        instruction_set: Instruction set of the soup (default set if None)
+
+    Returns:
+        List of (canonical, most common exact tape, abundance), most
+        abundant first
+    """
+    mask = get_instruction_set(instruction_set).mask
+    # Exact duplicates first: canonical forms are computed once per distinct tape
+    rows, counts = np.unique(arena, axis=0, return_counts=True)
+    instruction_counts = mask[rows].sum(axis=1)
+    keep = instruction_counts >= min_instructions
+    rows, counts = rows[keep], counts[keep]
+
+    groups: Dict[bytes, List] = {}
+    for row, count in zip(rows, counts.tolist()):
+        canonical = row[mask[row]].tobytes()
+        group = groups.get(canonical)
+        if group is None:
+            groups[canonical] = [row.tobytes(), count, count]
+        else:
+            group[2] += count
+            if count > group[1]:
+                group[0], group[1] = row.tobytes(), count
+
+    observed = [
+        (canonical, tape, abundance)
+        for canonical, (tape, _, abundance) in groups.items()
+        if abundance >= min_abundance
+    ]
+    observed.sort(key=lambda entry: -entry[2])
+    return observed
+
+
+class ReplicatorZoo:
+    """
+    SQLite-backed replicator catalog with batched, incremental ingestion.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 16,
+        min_abundance: int = 2,
+        min_instructions: int = 8,
+        timeout: float = 60.0
+    ):
+        """
+        Open (or create) a zoo database.
+
+        Args:
+            path: SQLite database file
+            batch_size: Snapshots folded in memory between writes
+            min_abundance: See observe_replicators
+            min_instructions: See observe_replicators
+            timeout: Seconds to wait for another process's write lock
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.min_abundance = min_abundance
+        self.min_instructions = min_instructions
+        self._connection = sqlite3.connect(self.path, timeout=timeout)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection.execute('PRAGMA table_info(programs)')}
+        if 'instruction_set' not in columns:
+            self._connection.close()
+            raise ValueError(
+                f"{self.path} predates per-instruction-set programs; start a new zoo"
+            )
+        # (run_id, instruction set name, canonical)
+        #   -> [tape, first_interaction, peak_abundance, peak_interaction]
+        self._pending: Dict[Tuple[int, str, bytes], List] = {}
+        self._pending_snapshots = 0
+
+    def start_run(self, name: str, config: Dict, seed: Optional[int] = None) -> int:
+        """
+        Register a run (or find it again when resuming).
+
+        Args:
+            name: Unique run name
+            config: JSON-serializable run configuration
+            seed: Random seed of the run
+
+        Returns:
+            Run id
+        """
+        with self._connection:
+            self._connection.execute(
+                'INSERT OR IGNORE INTO runs (name, config, seed, created) VALUES (?, ?, ?, ?)',
+                (name, json.dumps(config), seed, time.time())
+            )
+        (run_id,) = self._connection.execute(
+            'SELECT id FROM runs WHERE name = ?', (name,)
+        ).fetchone()
+        return run_id
+
+    def ingest(
+        self,
+        run_id: int,
+        arena: np.ndarray,
+        interaction: int,
+        instruction_set: Union[str, InstructionSet, None] = None
+    ) -> int:
+        """
+        Fold one soup snapshot into the pending batch.
+
+        Args:
+            run_id: Id from start_run
+            arena: 2-D uint8 soup arena
+            interaction: Interaction count of the snapshot
+            instruction_set: Instruction set of the soup (default set if None)
+
+        Returns:
+            Number of replicators observed in the snapshot
+        """
+        instruction_set = get_instruction_set(instruction_set)
+        observed = observe_replicators(
+            arena, self.min_abundance, self.min_instructions, instruction_set
+        )
+        for canonical, tape, abundance in observed:
+            key = (run_id, instruction_set.name, canonical)
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [tape, interaction, abundance, interaction]
+            elif abundance > entry[2]:
+                entry[0], entry[2], entry[3] = tape, abundance, interaction
+        self._pending_snapshots += 1
+        if self._pending_snapshots >= self.batch_size:
+            self.flush()
+        return len(observed)
+
+    def flush(self) -> None:
+        """Write the pending batch in one transaction."""
+        if not self._pending:
+            self._pending_snapshots = 0
+            return
+        rows = [
+            (name, canonical, tape, len(canonical), run_id, first, peak, run_id, peak_at)
+            for (run_id, name, canonical), (tape, first, peak, peak_at) in self._pending.items()
+        ]
+        with self._connection:
+            connection = self._connection
+            connection.executemany(
+                """
+                INSERT INTO programs (instruction_set, canonical, tape, instructions,
+                    first_run, first_interaction, peak_abundance, peak_run, peak_interaction)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (instruction_set, canonical) DO UPDATE SET
+                    tape = excluded.tape,
+                    peak_abundance = excluded.peak_abundance,
+                    peak_run = excluded.peak_run,
+                    peak_interaction = excluded.peak_interaction
+                WHERE excluded.peak_abundance > programs.peak_abundance
+                """,
+                rows
+            )
+            connection.executemany(
+                """
+                INSERT INTO sightings (run_id, program_id, first_interaction,
+                    peak_abundance, peak_interaction)
+                SELECT ?, id, ?, ?, ? FROM programs
+                WHERE instruction_set = ? AND canonical = ?
+                ON CONFLICT (run_id, program_id) DO UPDATE SET
+                    peak_abundance = excluded.peak_abundance,
+                    peak_interaction = excluded.peak_interaction
+                WHERE excluded.peak_abundance > sightings.peak_abundance
+                """,
+                [
+                    (run_id, first, peak, peak_at, name, canonical)
+                    for (run_id, name, canonical), (_, first, peak, peak_at)
+                    in self._pending.items()
+                ]
+            )
+        self._pending.clear()
+        self._pending_snapshots = 0
+
+    def lookup(
+        self,
+        tape: Union[bytes, np.ndarray],
+        instruction_set: Union[str, InstructionSet, None] = None
+    ) -> Optional[Dict]:
+        """
+        Find a program by any tape with its canonical form.
+
+        Args:
+            tape: Tape bytes (data bytes are ignored)
+            instruction_set: Instruction set the tape runs under (default set if None)
+
+        Returns:
+            Program dict, or None if not in the zoo
+        """
+        instruction_set = get_instruction_set(instruction_set)
+        row = self._connection.execute(
+            f'{_SELECT_PROGRAMS} WHERE instruction_set = ? AND canonical = ?',
+            (instruction_set.name, canonical_form(tape, instruction_set))
+        ).fetchone()
+        return dict(zip(_PROGRAM_COLUMNS, row)) if row is not None else None
+
+    def top(
+        self,
+        n: int = 10,
+        instruction_set: Union[str, InstructionSet, None] = None,
+        tape_length: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        The ``n`` programs with the highest peak abundance.
+
+        Args:
+            n: Number of programs
+            instruction_set: Only programs of this instruction set (None = any)
+            tape_length: Only programs whose tape has this length (None = any)
+
+        Returns:
+            Program dicts, most abundant first
+        """
+        conditions, parameters = [], []
+        if instruction_set is not None:
+            conditions.append('instruction_set = ?')
+            parameters.append(get_instruction_set(instruction_set).name)
+        if tape_length is not None:
+            conditions.append('length(tape) = ?')
+            parameters.append(tape_length)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        rows = self._connection.execute(
+            f'{_SELECT_PROGRAMS}{where} ORDER BY peak_abundance DESC, id LIMIT ?',
+            (*parameters, n)
+        ).fetchall()
+        return [dict(zip(_PROGRAM_COLUMNS, row)) for row in rows]
+
+    def runs(self) -> List[Dict]:
+        """All registered runs, in registration order."""
+        rows = self._connection.execute(
+            'SELECT id, name, config, seed FROM runs ORDER BY id'
+        ).fetchall()
+        return [
+            {'run_id': run_id, 'name': name, 'config': json.loads(config), 'seed': seed}
+            for run_id, name, config, seed in rows
+        ]
+
+    def sightings(self, program_id: int) -> List[Dict]:
+        """Per-run sightings of a program, with run name, config and seed."""
+        rows = self._connection.execute(
+            """
+            SELECT runs.id, runs.name, runs.config, runs.seed, s.first_interaction,
+                s.peak_abundance, s.peak_interaction
+            FROM sightings AS s JOIN runs ON runs.id = s.run_id
+            WHERE s.program_id = ? ORDER BY runs.id
+            """,
+            (program_id,)
+        ).fetchall()
+        return [
+            {
+                'run_id': run_id,
+                'name': name,
+                'config': json.loads(config),
+                'seed': seed,
+                'first_interaction': first,
+                'peak_abundance': peak,
+                'peak_interaction': peak_at,
+            }
+            for run_id, name, config, seed, first, peak, peak_at in rows
+        ]
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute('SELECT COUNT(*) FROM programs').fetchone()
+        return count
+
+    def close(self) -> None:
+        """Flush pending snapshots and close the database."""
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> 'ReplicatorZoo':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"ReplicatorZoo({str(self.path)!r})"
@@ -6,15 +6,28 @@ This implements the BFF variant where:
 2. Three pointers: instruction pointer, data pointer, console pointer
 3. Only 7 instructions: < > + - , [ ]
 4. All other bytes are no-ops
+
+The opcodes are those of the default instruction set; other variants
+(core.instruction_set) are selected with ``instruction_set=``.
 """
 
+import math
 import random
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Union
+
+import numpy as np
+
 from .tape import Tape
+from .profiling import ExecutionProfile
+from .instruction_set import (
+    InstructionSet, get_instruction_set, NOOP, DATA_LEFT, DATA_RIGHT, CONSOLE_LEFT,
+    CONSOLE_RIGHT, INCREMENT, DECREMENT, COPY_CONSOLE, COPY_TO_DATA, COPY_TO_CONSOLE,
+    LOOP_START, LOOP_END, WRITE_ACTIONS
+)
 
 
-# Brainfuck instruction characters
+# Brainfuck instruction characters of the default instruction set
 INST_LEFT = ord('<')         # 60: move data pointer left
 INST_RIGHT = ord('>')        # 62: move data pointer right
 INST_INCREMENT = ord('+')    # 43: increment byte at data pointer
@@ -23,6 +36,38 @@ INST_COPY = ord(',')         # 44: copy from console pointer to data pointer
 INST_LOOP_START = ord('[')   # 91: begin loop
 INST_LOOP_END = ord(']')     # 93: end loop
 
+# Actions whose creation or removal invalidates bracket matching
+BRACKET_ACTIONS = frozenset({LOOP_START, LOOP_END})
+
+
+def draw_timeout_budget(
+    timeout_prob: float,
+    max_ops: int,
+    rng: Optional[random.Random] = None
+) -> int:
+    """
+    Draw the number of operations an execution may run before timing out.
+
+    A timeout that strikes each operation independently with probability
+    ``timeout_prob`` happens after a geometric number of completed
+    operations, so it is drawn once up front (by inversion) instead of
+    per operation.
+
+    Args:
+        timeout_prob: Probability per operation of random timeout
+        max_ops: Upper bound on the budget
+        rng: Random source (default: the module-level ``random``)
+
+    Returns:
+        Operation budget in [0, max_ops]; ``max_ops`` if timeouts are off
+    """
+    if timeout_prob <= 0:
+        return max_ops
+    if timeout_prob >= 1:
+        return 0
+    u = (rng or random).random()
+    return min(int(math.log(1.0 - u) / math.log1p(-timeout_prob)), max_ops)
+
 
 @dataclass
 class ExecutionResult:
@@ -55,17 +100,30 @@ class BrainfuckInterpreter:
     - The tape contains both code and data
     - Three pointers operate on the same tape
     - Programs can modify themselves during execution
-    - Most bytes are no-ops (only 7 valid instructions)
+    - Most bytes are no-ops (only 7 valid instructions by default)
     """
 
-    def __init__(self, tape: Tape):
+    def __init__(
+        self,
+        tape: Tape,
+        profile: Optional[ExecutionProfile] = None,
+        instruction_set: Union[str, InstructionSet, None] = None
+    ):
         """
         Initialize interpreter with a tape.
 
         Args:
             tape: Tape containing both code and data
+            profile: Counters to accumulate run_from_tape executions into
+                (None disables profiling)
+            instruction_set: Opcode table (name or InstructionSet; None = default)
         """
+        if profile is not None and profile.length != tape.length:
+            raise ValueError(f"Profile length {profile.length} != tape length {tape.length}")
         self.tape = tape
+        self.profile = profile
+        self.instruction_set = get_instruction_set(instruction_set)
+        self._actions = self.instruction_set.actions
         self.instruction_pointer = 0  # Where we're reading instructions from
         self.data_pointer = 0         # Where data operations happen
         self.console_pointer = 0      # Where copy operations read from
@@ -80,35 +138,56 @@ class BrainfuckInterpreter:
         Returns:
             True if instruction was valid, False if no-op
         """
-        inst_byte = ord(instruction) if len(instruction) == 1 else -1
+        action = self._action(instruction)
 
-        if inst_byte == INST_RIGHT:
+        if action == DATA_RIGHT:
             self.move_data_right()
             return True
 
-        elif inst_byte == INST_LEFT:
+        elif action == DATA_LEFT:
             self.move_data_left()
             return True
 
-        elif inst_byte == INST_INCREMENT:
+        elif action == CONSOLE_RIGHT:
+            self.move_console_right()
+            return True
+
+        elif action == CONSOLE_LEFT:
+            self.move_console_left()
+            return True
+
+        elif action == INCREMENT:
             self.tape.increment_byte(self.data_pointer)
             return True
 
-        elif inst_byte == INST_DECREMENT:
+        elif action == DECREMENT:
             self.tape.decrement_byte(self.data_pointer)
             return True
 
-        elif inst_byte == INST_COPY:
+        elif action == COPY_CONSOLE or action == COPY_TO_DATA:
             # Copy from console pointer to data pointer
             value = self.tape.get_byte(self.console_pointer)
             self.tape.set_byte(self.data_pointer, value)
-            self.move_console_right()
+            if action == COPY_CONSOLE:
+                self.move_console_right()
+            return True
+
+        elif action == COPY_TO_CONSOLE:
+            # Copy from data pointer to console pointer
+            value = self.tape.get_byte(self.data_pointer)
+            self.tape.set_byte(self.console_pointer, value)
             return True
 
         # Loops are handled separately in run() method
         # Other bytes are no-ops
         return False
 
+    def _action(self, instruction: str) -> int:
+        """Action code of a single-character instruction (NOOP if not an opcode)."""
+        if len(instruction) != 1 or ord(instruction) > 255:
+            return NOOP
+        return self._actions[ord(instruction)]
+
     def move_data_right(self):
         """Move data pointer right with wrapping."""
         self.data_pointer = (self.data_pointer + 1) % self.tape.length
@@ -121,12 +200,17 @@ class BrainfuckInterpreter:
         """Move console pointer right with wrapping."""
         self.console_pointer = (self.console_pointer + 1) % self.tape.length
 
+    def move_console_left(self):
+        """Move console pointer left with wrapping."""
+        self.console_pointer = (self.console_pointer - 1) % self.tape.length
+
     def run(
         self,
         program: str = '',
         start_position: int = 0,
         max_ops: int = 10000,
-        timeout_prob: float = 0.0
+        timeout_prob: float = 0.0,
+        rng: Optional[random.Random] = None
     ) -> ExecutionResult:
         """
         Run a Brainfuck program.
@@ -136,24 +220,27 @@ class BrainfuckInterpreter:
             start_position: Starting instruction pointer position
             max_ops: Maximum operations before forced termination
             timeout_prob: Probability per operation of random timeout (0.0 to 1.0)
+            rng: Random source for the timeout draw (default: module ``random``)
 
         Returns:
             ExecutionResult with execution metadata
         """
         if program:
             # Run explicit program string
-            return self._run_string(program, max_ops, timeout_prob)
+            return self._run_string(program, max_ops, timeout_prob, rng)
         else:
             # Run from tape itself (self-modifying code)
-            return self.run_from_tape(start_position, max_ops, timeout_prob)
+            return self.run_from_tape(start_position, max_ops, timeout_prob, rng)
 
     def _run_string(
         self,
         program: str,
         max_ops: int,
-        timeout_prob: float
+        timeout_prob: float,
+        rng: Optional[random.Random] = None
     ) -> ExecutionResult:
         """Run program from explicit string."""
+        budget = draw_timeout_budget(timeout_prob, max_ops, rng)
         operations = 0
         ip = 0  # Instruction pointer in program string
 
@@ -170,29 +257,18 @@ class BrainfuckInterpreter:
                 final_console_pointer=self.console_pointer
             )
 
-        while ip < len(program) and operations < max_ops:
-            # Probabilistic timeout (for BFF simulation)
-            if timeout_prob > 0 and random.random() < timeout_prob:
-                return ExecutionResult(
-                    operations=operations,
-                    terminated=False,
-                    timed_out=True,
-                    final_instruction_pointer=ip,
-                    final_data_pointer=self.data_pointer,
-                    final_console_pointer=self.console_pointer
-                )
-
+        while ip < len(program) and operations < budget:
             instruction = program[ip]
-            inst_byte = ord(instruction)
+            action = self._action(instruction)
 
             # Handle loops specially
-            if inst_byte == INST_LOOP_START:
+            if action == LOOP_START:
                 if self.tape.get_byte(self.data_pointer) == 0:
                     # Skip to matching ]
                     ip = bracket_map[ip]
                 operations += 1
 
-            elif inst_byte == INST_LOOP_END:
+            elif action == LOOP_END:
                 if self.tape.get_byte(self.data_pointer) != 0:
                     # Jump back to matching [
                     ip = bracket_map[ip]
@@ -205,11 +281,12 @@ class BrainfuckInterpreter:
 
             ip += 1
 
+        terminated = ip >= len(program)
         return ExecutionResult(
             operations=operations,
-            terminated=(ip >= len(program)),
+            terminated=terminated,
             crashed=False,
-            timed_out=False,
+            timed_out=not terminated and budget < max_ops,
             final_instruction_pointer=ip,
             final_data_pointer=self.data_pointer,
             final_console_pointer=self.console_pointer
@@ -219,7 +296,8 @@ class BrainfuckInterpreter:
         self,
         start_position: int = 0,
         max_ops: int = 10000,
-        timeout_prob: float = 0.0
+        timeout_prob: float = 0.0,
+        rng: Optional[random.Random] = None
     ) -> ExecutionResult:
         """
         Run program from the tape itself (self-modifying code).
@@ -231,31 +309,50 @@ class BrainfuckInterpreter:
             start_position: Starting instruction pointer
             max_ops: Maximum operations before forced termination
             timeout_prob: Probability per operation of random timeout
+                (drawn once as an operation budget, see draw_timeout_budget)
+            rng: Random source for the timeout draw (default: module ``random``)
 
         Returns:
             ExecutionResult with execution metadata
         """
+        budget = draw_timeout_budget(timeout_prob, max_ops, rng)
+        result = self._execute_from_tape(start_position, budget)
+        if budget < max_ops and result.operations == budget and not (
+            result.terminated or result.crashed
+        ):
+            result.timed_out = True
+        if self.profile is not None:
+            self.profile.record_interaction(result.operations)
+        return result
+
+    def _execute_from_tape(
+        self,
+        start_position: int,
+        max_ops: int
+    ) -> ExecutionResult:
+        """Interpreter loop of run_from_tape (fixed operation budget)."""
         operations = 0
         self.instruction_pointer = start_position
+        tape = self.tape
+        length = tape.length
+        profile = self.profile
+        actions = self._actions
 
-        # Pre-compute bracket matching (gets stale if code modifies itself,
-        # but that's okay - we'll just crash or behave weirdly, like life!)
-        bracket_map = self._build_bracket_map_from_tape()
+        # Bracket matching is built lazily on the first loop instruction
+        # and dropped whenever a write creates or destroys a bracket, so
+        # loops always match against the current (self-modified) tape
+        bracket_map = None
+
+        # Next-instruction index lets runs of no-op bytes be jumped in one step
+        skip = self._build_skip_table()
 
         while operations < max_ops:
-            # Probabilistic timeout
-            if timeout_prob > 0 and random.random() < timeout_prob:
-                return ExecutionResult(
-                    operations=operations,
-                    terminated=False,
-                    timed_out=True,
-                    final_instruction_pointer=self.instruction_pointer,
-                    final_data_pointer=self.data_pointer,
-                    final_console_pointer=self.console_pointer
-                )
+            # Jump over no-op bytes
+            if self.instruction_pointer < length:
+                self.instruction_pointer = skip[self.instruction_pointer]
 
             # Check if we've run off the end of the tape
-            if self.instruction_pointer >= self.tape.length:
+            if self.instruction_pointer >= length:
                 return ExecutionResult(
                     operations=operations,
                     terminated=True,
@@ -265,11 +362,14 @@ class BrainfuckInterpreter:
                 )
 
             # Fetch instruction from tape
-            inst_byte = self.tape.get_byte(self.instruction_pointer)
+            inst_byte = tape.get_byte(self.instruction_pointer)
+            action = actions[inst_byte]
 
             # Handle loops
-            if inst_byte == INST_LOOP_START:
-                if self.tape.get_byte(self.data_pointer) == 0:
+            if action == LOOP_START:
+                if bracket_map is None:
+                    bracket_map = self._build_bracket_map_from_tape()
+                if tape.get_byte(self.data_pointer) == 0:
                     # Skip to matching ] (or end of tape if not found)
                     if self.instruction_pointer in bracket_map:
                         self.instruction_pointer = bracket_map[self.instruction_pointer]
@@ -284,11 +384,18 @@ class BrainfuckInterpreter:
                             final_console_pointer=self.console_pointer
                         )
                 operations += 1
-
-            elif inst_byte == INST_LOOP_END:
-                if self.tape.get_byte(self.data_pointer) != 0:
+                if profile is not None:
+                    profile.opcodes[inst_byte] += 1
+                    profile.reads[self.data_pointer] += 1
+
+            elif action == LOOP_END:
+                if bracket_map is None:
+                    bracket_map = self._build_bracket_map_from_tape()
+                if tape.get_byte(self.data_pointer) != 0:
                     # Jump back to matching [
                     if self.instruction_pointer in bracket_map:
+                        if profile is not None:
+                            profile.loop_iterations[self.instruction_pointer] += 1
                         self.instruction_pointer = bracket_map[self.instruction_pointer]
                     else:
                         # Unmatched bracket - crash
@@ -301,12 +408,41 @@ class BrainfuckInterpreter:
                             final_console_pointer=self.console_pointer
                         )
                 operations += 1
+                if profile is not None:
+                    profile.opcodes[inst_byte] += 1
+                    profile.reads[self.data_pointer] += 1
+
+            elif action in WRITE_ACTIONS:
+                # Writes may create or destroy instructions and brackets
+                if action == COPY_TO_CONSOLE:
+                    target, source = self.console_pointer, self.data_pointer
+                elif action == COPY_CONSOLE or action == COPY_TO_DATA:
+                    target, source = self.data_pointer, self.console_pointer
+                else:
+                    target = source = self.data_pointer
+                old_byte = tape.get_byte(target)
+                if profile is not None:
+                    profile.opcodes[inst_byte] += 1
+                    profile.writes[target] += 1
+                    profile.reads[source] += 1
+                self.execute_instruction(chr(inst_byte))
+                operations += 1
+                new_byte = tape.get_byte(target)
+                if new_byte != old_byte:
+                    if bracket_map is not None and (
+                        actions[old_byte] in BRACKET_ACTIONS or actions[new_byte] in BRACKET_ACTIONS
+                    ):
+                        bracket_map = None
+                    if (actions[new_byte] == NOOP) != (actions[old_byte] == NOOP):
+                        self._update_skip_table(skip, target)
 
             else:
                 # Regular instruction
                 instruction = chr(inst_byte)
                 if self.execute_instruction(instruction):
                     operations += 1
+                    if profile is not None:
+                        profile.opcodes[inst_byte] += 1
 
             self.instruction_pointer += 1
 
@@ -319,6 +455,46 @@ class BrainfuckInterpreter:
             final_console_pointer=self.console_pointer
         )
 
+    def _build_skip_table(self) -> List[int]:
+        """
+        Build the next-instruction index for the tape.
+
+        Returns:
+            List of length ``tape.length + 1`` where entry i is the first
+            position >= i holding a valid instruction (``tape.length`` if none)
+        """
+        length = self.tape.length
+        positions = np.append(
+            np.flatnonzero(self.instruction_set.mask[self.tape.buffer]), length
+        )
+        return positions[np.searchsorted(positions, np.arange(length + 1))].tolist()
+
+    def _update_skip_table(self, skip: List[int], position: int) -> None:
+        """
+        Patch the next-instruction index after ``position`` changed type.
+
+        Only the run of entries that pointed past (or at) ``position``
+        from the left changes, so the cost is the length of the preceding
+        no-op gap rather than the whole tape.
+
+        Args:
+            skip: Table from _build_skip_table (modified in place)
+            position: Tape position whose instruction status flipped
+        """
+        if self._actions[self.tape.get_byte(position)] != NOOP:
+            # New instruction: entries that pointed beyond it now stop here
+            i = position
+            while i >= 0 and skip[i] > position:
+                skip[i] = position
+                i -= 1
+        else:
+            # Instruction removed: entries that stopped here move on
+            following = skip[position + 1]
+            i = position
+            while i >= 0 and skip[i] == position:
+                skip[i] = following
+                i -= 1
+
     def _build_bracket_map(self, program: str) -> Optional[dict]:
         """
         Build mapping of bracket positions for jumps.
@@ -334,9 +510,10 @@ class BrainfuckInterpreter:
         stack = []
 
         for i, char in enumerate(program):
-            if char == '[':
+            action = self._action(char)
+            if action == LOOP_START:
                 stack.append(i)
-            elif char == ']':
+            elif action == LOOP_END:
                 if not stack:
                     return None  # Unmatched ]
                 start = stack.pop()
@@ -350,7 +527,10 @@ class BrainfuckInterpreter:
 
     def _build_bracket_map_from_tape(self) -> dict:
         """
-        Build bracket mapping from tape data.
+        Build bracket mapping from the current tape data.
+
+        Unmatched ``]`` are ignored and unmatched ``[`` are left out, so
+        jumping from either crashes the program.
 
         Returns:
             Dictionary mapping bracket positions (best effort, may be incomplete)
@@ -358,11 +538,12 @@ class BrainfuckInterpreter:
         bracket_map = {}
         stack = []
 
+        actions = self._actions
         for i in range(self.tape.length):
-            byte = self.tape.get_byte(i)
-            if byte == INST_LOOP_START:
+            action = actions[self.tape.get_byte(i)]
+            if action == LOOP_START:
                 stack.append(i)
-            elif byte == INST_LOOP_END:
+            elif action == LOOP_END:
                 if stack:
                     start = stack.pop()
                     bracket_map[start] = i
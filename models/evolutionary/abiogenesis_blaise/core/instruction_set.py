@@ -0,0 +1,175 @@
+"""
+Declarative BFF instruction sets.
+
+An instruction set is a table mapping opcode bytes to interpreter
+actions, selected per Soup (``Soup(instruction_set='bff')``). The python
+engine dispatches through the set's 256-entry action table. The numba
+kernel receives the set as ``opcode_bytes`` (the byte of each action)
+and compares instruction bytes against those values, exactly as it did
+against the fixed opcodes before; for the default set they are
+compile-time constants, so the default loop is unchanged.
+
+Actions use the interpreter's two heads: the data pointer (head 0) and
+the console pointer (head 1).
+
+Built-in variants:
+    bff7    The 7-instruction set of this experiment: ``<`` ``>`` move the
+            data pointer, ``+`` ``-`` change the byte under it, ``,``
+            copies the byte under the console pointer to the data pointer
+            and advances the console pointer, ``[`` ``]`` loop while the
+            byte under the data pointer is non-zero.
+    bff     Two-head BFF of the original paper: ``{`` ``}`` move the
+            console pointer, ``.`` copies data -> console and ``,``
+            copies console -> data, without moving either head.
+
+Usage:
+    custom = InstructionSet('bff7-push', {**BFF7.table, ',': 'copy_to_console'})
+    soup = Soup(size=1024, instruction_set=custom)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Tuple, Union
+
+import numpy as np
+
+
+# Action codes (values of an action table; 0 = no-op byte)
+NOOP = 0
+DATA_LEFT = 1          # data pointer - 1
+DATA_RIGHT = 2         # data pointer + 1
+CONSOLE_LEFT = 3       # console pointer - 1
+CONSOLE_RIGHT = 4      # console pointer + 1
+INCREMENT = 5          # byte at data pointer + 1
+DECREMENT = 6          # byte at data pointer - 1
+COPY_CONSOLE = 7       # data <- console, then console pointer + 1
+COPY_TO_DATA = 8       # data <- console
+COPY_TO_CONSOLE = 9    # console <- data
+LOOP_START = 10        # skip past matching loop end if byte at data pointer is 0
+LOOP_END = 11          # jump back to matching loop start if byte at data pointer is not 0
+
+ACTIONS = {
+    'data_left': DATA_LEFT,
+    'data_right': DATA_RIGHT,
+    'console_left': CONSOLE_LEFT,
+    'console_right': CONSOLE_RIGHT,
+    'increment': INCREMENT,
+    'decrement': DECREMENT,
+    'copy_console': COPY_CONSOLE,
+    'copy_to_data': COPY_TO_DATA,
+    'copy_to_console': COPY_TO_CONSOLE,
+    'loop_start': LOOP_START,
+    'loop_end': LOOP_END,
+}
+
+# Actions that write a tape byte
+WRITE_ACTIONS = frozenset({INCREMENT, DECREMENT, COPY_CONSOLE, COPY_TO_DATA, COPY_TO_CONSOLE})
+
+
+@dataclass(frozen=True)
+class InstructionSet:
+    """
+    A named opcode table; each action has at most one opcode.
+
+    Attributes:
+        name: Variant name (stored in soup metadata)
+        table: Single-character opcode -> action name (keys of ACTIONS)
+        actions: Tuple of 256 action codes indexed by byte (a tuple for
+            fast Python-level indexing in the interpreter loop)
+        mask: Read-only boolean array, True for opcode bytes
+        opcode_bytes: Tuple indexed by action code: the action's byte, or
+            -1 if the set lacks it (the kernel argument of the same name)
+    """
+    name: str
+    table: Mapping[str, str]
+    actions: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    mask: np.ndarray = field(init=False, repr=False, compare=False)
+    opcode_bytes: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        actions = [NOOP] * 256
+        opcode_bytes = [-1] * (max(ACTIONS.values()) + 1)
+        for char, action in self.table.items():
+            if len(char) != 1 or ord(char) > 255:
+                raise ValueError(f"Opcode {char!r} is not a single byte")
+            if action not in ACTIONS:
+                raise ValueError(f"Unknown action {action!r}, expected one of {sorted(ACTIONS)}")
+            code = ACTIONS[action]
+            if opcode_bytes[code] >= 0:
+                raise ValueError(f"Action {action!r} has more than one opcode")
+            actions[ord(char)] = code
+            opcode_bytes[code] = ord(char)
+        if opcode_bytes[LOOP_START] < 0 or opcode_bytes[LOOP_END] < 0:
+            raise ValueError("Instruction set needs loop_start and loop_end opcodes")
+        mask = np.array(actions) != NOOP
+        mask.setflags(write=False)
+        object.__setattr__(self, 'table', dict(self.table))
+        object.__setattr__(self, 'actions', tuple(actions))
+        object.__setattr__(self, 'mask', mask)
+        object.__setattr__(self, 'opcode_bytes', tuple(opcode_bytes))
+
+    def to_dict(self) -> Dict:
+        """Serialize to a JSON-compatible dict."""
+        return {'name': self.name, 'table': dict(self.table)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'InstructionSet':
+        """Inverse of to_dict."""
+        return cls(data['name'], data['table'])
+
+
+BFF7 = InstructionSet('bff7', {
+    '<': 'data_left',
+    '>': 'data_right',
+    '+': 'increment',
+    '-': 'decrement',
+    ',': 'copy_console',
+    '[': 'loop_start',
+    ']': 'loop_end',
+})
+
+BFF = InstructionSet('bff', {
+    '<': 'data_left',
+    '>': 'data_right',
+    '{': 'console_left',
+    '}': 'console_right',
+    '+': 'increment',
+    '-': 'decrement',
+    '.': 'copy_to_console',
+    ',': 'copy_to_data',
+    '[': 'loop_start',
+    ']': 'loop_end',
+})
+
+INSTRUCTION_SETS = {instruction_set.name: instruction_set for instruction_set in (BFF7, BFF)}
+
+DEFAULT_INSTRUCTION_SET = BFF7
+
+
+def get_instruction_set(instruction_set: Union[str, InstructionSet, Dict, None]) -> InstructionSet:
+    """
+    Resolve a variant name, serialized dict or InstructionSet.
+
+    Args:
+        instruction_set: Name in INSTRUCTION_SETS, output of
+            InstructionSet.to_dict, an InstructionSet, or None (default)
+
+    Returns:
+        InstructionSet
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if instruction_set is None:
+        return DEFAULT_INSTRUCTION_SET
+    if isinstance(instruction_set, InstructionSet):
+        return instruction_set
+    if isinstance(instruction_set, dict):
+        known = INSTRUCTION_SETS.get(instruction_set['name'])
+        if known is not None and known.table == instruction_set['table']:
+            return known
+        return InstructionSet.from_dict(instruction_set)
+    if instruction_set not in INSTRUCTION_SETS:
+        raise ValueError(
+            f"Unknown instruction set {instruction_set!r}, expected one of {sorted(INSTRUCTION_SETS)}"
+        )
+    return INSTRUCTION_SETS[instruction_set]
@@ -0,0 +1,546 @@
+"""
+Compiled BFF interpreter kernel.
+
+This is a straight-line re-implementation of
+``BrainfuckInterpreter.run_from_tape`` over a raw ``uint8`` buffer, compiled
+with numba. It produces bit-identical tapes and results to the reference
+interpreter; the reference stays the readable specification and the
+kernel is the fast path used by ``Soup(engine='numba')``.
+
+If numba is not installed the same functions run as plain Python, so
+callers never need to branch on availability (they just run slower).
+
+The module-level functions interpret the default instruction set.
+``kernels_for`` returns the same functions compiled for any other
+instruction set (core.instruction_set), with its opcodes built in.
+"""
+
+import types
+from typing import Callable, Dict, NamedTuple, Tuple
+
+import numpy as np
+
+from .instruction_set import DEFAULT_INSTRUCTION_SET, InstructionSet
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - numba is a declared dependency
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Bits of the per-pair flags array written by run_pairs
+FLAG_TERMINATED = 1
+FLAG_CRASHED = 2
+FLAG_TIMED_OUT = 4
+
+
+# Opcode bytes of the default instruction set (-1: action not in the set).
+# numba freezes globals as compile-time constants; kernels_for recompiles
+# the interpreter with these names rebound to another set's bytes.
+(
+    _, _DATA_LEFT, _DATA_RIGHT, _CONSOLE_LEFT, _CONSOLE_RIGHT, _INCREMENT, _DECREMENT,
+    _COPY_CONSOLE, _COPY_TO_DATA, _COPY_TO_CONSOLE, _LOOP_START, _LOOP_END
+) = DEFAULT_INSTRUCTION_SET.opcode_bytes
+_OPCODE_GLOBALS = (
+    '_DATA_LEFT', '_DATA_RIGHT', '_CONSOLE_LEFT', '_CONSOLE_RIGHT', '_INCREMENT', '_DECREMENT',
+    '_COPY_CONSOLE', '_COPY_TO_DATA', '_COPY_TO_CONSOLE', '_LOOP_START', '_LOOP_END'
+)
+
+
+@njit(cache=True)
+def _build_bracket_match(buf, match):
+    """
+    Fill ``match`` with partner positions for matched brackets (-1 otherwise).
+
+    Same best-effort matching as ``_build_bracket_map_from_tape``:
+    unmatched ``]`` are skipped and unmatched ``[`` are left unpaired.
+    """
+    n = buf.shape[0]
+    stack = np.empty(n, dtype=np.int64)
+    depth = 0
+    for i in range(n):
+        match[i] = -1
+    for i in range(n):
+        byte = buf[i]
+        if byte == _LOOP_START:
+            stack[depth] = i
+            depth += 1
+        elif byte == _LOOP_END:
+            if depth > 0:
+                depth -= 1
+                start = stack[depth]
+                match[start] = i
+                match[i] = start
+
+
+@njit(cache=True)
+def _execute(buf, start_position, max_ops, counters):
+    """
+    Interpreter loop shared by execute_tape and execute_tape_profiled.
+
+    ``counters`` is None or a tuple (opcodes, loop_iterations, reads,
+    writes) of int64 arrays. numba compiles a separate specialization
+    for None in which the dead counter branches are pruned, so the
+    unprofiled loop carries no profiling code.
+
+    Opcodes are the module constants above; comparisons against actions
+    the instruction set lacks (-1) fold away at compile time.
+    """
+    n = buf.shape[0]
+    # Built lazily on the first loop instruction; invalidated by writes
+    # that create or destroy a bracket byte
+    match = np.empty(n, dtype=np.int64)
+    match_valid = False
+
+    ops = 0
+    ip = start_position
+    dp = 0
+    cp = 0
+
+    while ops < max_ops:
+        if ip >= n:
+            return ops, True, False, False, ip, dp, cp
+
+        byte = buf[ip]
+
+        if byte == _LOOP_START:
+            if not match_valid:
+                _build_bracket_match(buf, match)
+                match_valid = True
+            if buf[dp] == 0:
+                if match[ip] < 0:
+                    return ops, False, True, False, ip, dp, cp
+                ip = match[ip]
+            ops += 1
+            if counters is not None:
+                counters[0][byte] += 1
+                counters[2][dp] += 1
+        elif byte == _LOOP_END:
+            if not match_valid:
+                _build_bracket_match(buf, match)
+                match_valid = True
+            if buf[dp] != 0:
+                if match[ip] < 0:
+                    return ops, False, True, False, ip, dp, cp
+                if counters is not None:
+                    counters[1][ip] += 1
+                ip = match[ip]
+            ops += 1
+            if counters is not None:
+                counters[0][byte] += 1
+                counters[2][dp] += 1
+        elif byte == _DATA_RIGHT:
+            dp = (dp + 1) % n
+            ops += 1
+            if counters is not None:
+                counters[0][byte] += 1
+        elif byte == _DATA_LEFT:
+            dp = (dp - 1) % n
+            ops += 1
+            if counters is not None:
+                counters[0][byte] += 1
+        elif byte == _CONSOLE_RIGHT:
+            cp = (cp + 1) % n
+            ops += 1
+            if counters is not None:
+                counters[0][byte] += 1
+        elif byte == _CONSOLE_LEFT:
+            cp = (cp - 1) % n
+            ops += 1
+            if counters is not None:
+                counters[0][byte] += 1
+        elif (byte == _INCREMENT or byte == _DECREMENT or byte == _COPY_CONSOLE
+                or byte == _COPY_TO_DATA or byte == _COPY_TO_CONSOLE):
+            # Every write lands on the data pointer except copy_to_console
+            to_console = byte == _COPY_TO_CONSOLE
+            target = cp if to_console else dp
+            if counters is not None:
+                counters[0][byte] += 1
+                counters[3][target] += 1
+                if byte == _INCREMENT or byte == _DECREMENT or to_console:
+                    counters[2][dp] += 1
+                else:
+                    counters[2][cp] += 1
+            old_byte = buf[target]
+            if byte == _INCREMENT:
+                buf[target] = (int(old_byte) + 1) & 255
+            elif byte == _DECREMENT:
+                buf[target] = (int(old_byte) + 255) & 255
+            elif to_console:
+                buf[target] = buf[dp]
+            else:
+                buf[target] = buf[cp]
+                if byte == _COPY_CONSOLE:
+                    cp = (cp + 1) % n
+            ops += 1
+            new_byte = buf[target]
+            if match_valid and (
+                old_byte == _LOOP_START or old_byte == _LOOP_END
+                or new_byte == _LOOP_START or new_byte == _LOOP_END
+            ):
+                match_valid = False
+
+        ip += 1
+
+    return ops, False, False, False, ip, dp, cp
+
+
+@njit(cache=True)
+def execute_tape(buf, start_position, max_ops):
+    """
+    Run the program stored in ``buf`` in place.
+
+    Args:
+        buf: 1-D uint8 array holding code and data (modified in place)
+        start_position: Starting instruction pointer
+        max_ops: Maximum operations before forced termination
+
+    Returns:
+        Tuple (operations, terminated, crashed, timed_out,
+        instruction_pointer, data_pointer, console_pointer)
+    """
+    return _execute(buf, start_position, max_ops, None)
+
+
+@njit(cache=True)
+def execute_tape_profiled(buf, start_position, max_ops, opcodes, loop_iterations,
+                          reads, writes, ops_histogram):
+    """
+    Run ``buf`` like execute_tape while adding to profiling counters.
+
+    Counter arrays are those of core.profiling.ExecutionProfile (position
+    counters must have length ``buf.shape[0]``).
+
+    Returns:
+        Same tuple as ``execute_tape``
+    """
+    result = _execute(
+        buf, start_position, max_ops, (opcodes, loop_iterations, reads, writes)
+    )
+    ops = result[0]
+    bin_index = 0
+    while ops > 0 and bin_index < ops_histogram.shape[0] - 1:
+        ops >>= 1
+        bin_index += 1
+    ops_histogram[bin_index] += 1
+    return result
+
+
+@njit(cache=True)
+def _load_pair(arena, idx1, idx2, pair_buffer):
+    """Concatenate arena rows ``idx1`` and ``idx2`` into ``pair_buffer``."""
+    length = arena.shape[1]
+    for i in range(length):
+        pair_buffer[i] = arena[idx1, i]
+        pair_buffer[length + i] = arena[idx2, i]
+
+
+@njit(cache=True)
+def _store_pair(arena, idx1, idx2, pair_buffer):
+    """Write ``pair_buffer`` back into arena rows ``idx1`` and ``idx2``."""
+    length = arena.shape[1]
+    for i in range(length):
+        arena[idx1, i] = pair_buffer[i]
+        arena[idx2, i] = pair_buffer[length + i]
+
+
+@njit(cache=True)
+def run_pair(arena, idx1, idx2, pair_buffer, max_ops):
+    """
+    Run one pair interaction directly on a soup arena.
+
+    Rows ``idx1`` and ``idx2`` are concatenated into ``pair_buffer``
+    (length ``2 * tape_length``), executed from position 0, and written back.
+
+    Returns:
+        Same tuple as ``execute_tape``
+    """
+    _load_pair(arena, idx1, idx2, pair_buffer)
+    result = execute_tape(pair_buffer, 0, max_ops)
+    _store_pair(arena, idx1, idx2, pair_buffer)
+    return result
+
+
+@njit(cache=True)
+def run_pair_profiled(arena, idx1, idx2, pair_buffer, max_ops, opcodes,
+                      loop_iterations, reads, writes, ops_histogram):
+    """
+    Run one pair like run_pair while adding to profiling counters.
+
+    Returns:
+        Same tuple as ``execute_tape``
+    """
+    _load_pair(arena, idx1, idx2, pair_buffer)
+    result = execute_tape_profiled(
+        pair_buffer, 0, max_ops, opcodes, loop_iterations, reads, writes, ops_histogram
+    )
+    _store_pair(arena, idx1, idx2, pair_buffer)
+    return result
+
+
+@njit(cache=True)
+def _run_pair_budget(arena, idx1, idx2, pair_buffer, max_ops, budget):
+    """
+    Run one pair with an operation budget drawn from a timeout distribution.
+
+    ``budget`` below ``max_ops`` means the interaction times out once it
+    has executed ``budget`` operations without terminating or crashing.
+
+    Returns:
+        Tuple (operations, flags) with flags built from FLAG_* bits
+    """
+    limit = min(budget, max_ops)
+    ops, terminated, crashed, _, _, _, _ = run_pair(
+        arena, idx1, idx2, pair_buffer, limit
+    )
+    flags = 0
+    if terminated:
+        flags |= FLAG_TERMINATED
+    if crashed:
+        flags |= FLAG_CRASHED
+    if limit < max_ops and ops == limit and not terminated and not crashed:
+        flags |= FLAG_TIMED_OUT
+    return ops, flags
+
+
+@njit(parallel=True, cache=True)
+def run_pairs(arena, idx1, idx2, budgets, max_ops, ops_out, flags_out):
+    """
+    Run a batch of disjoint pair interactions concurrently.
+
+    The pairs must not share tapes (as in one soup epoch), so they can
+    execute in any order or in parallel with identical results.
+
+    Args:
+        arena: 2-D uint8 soup arena (modified in place)
+        idx1, idx2: int64 arrays of first/second tape indices per pair
+        budgets: int64 per-pair operation budgets (timeout draws)
+        max_ops: Maximum operations per interaction
+        ops_out: int64 output array of operation counts
+        flags_out: uint8 output array of FLAG_* bits
+    """
+    length = arena.shape[1]
+    for k in prange(idx1.shape[0]):
+        pair_buffer = np.empty(2 * length, dtype=np.uint8)
+        ops, flags = _run_pair_budget(
+            arena, idx1[k], idx2[k], pair_buffer, max_ops, budgets[k]
+        )
+        ops_out[k] = ops
+        flags_out[k] = flags
+
+
+@njit(cache=True)
+def run_sequence(arena, idx1, idx2, budgets, max_ops, ops_out, flags_out):
+    """
+    Run a batch of pair interactions one after another.
+
+    Unlike run_pairs, pairs may share tapes, so they execute strictly in
+    order (the serial random-pair schedule of Soup.run).
+
+    Args:
+        arena: 2-D uint8 soup arena (modified in place)
+        idx1, idx2: int64 arrays of first/second tape indices per pair
+        budgets: int64 per-pair operation budgets (timeout draws)
+        max_ops: Maximum operations per interaction
+        ops_out: int64 output array of operation counts
+        flags_out: uint8 output array of FLAG_* bits
+    """
+    pair_buffer = np.empty(2 * arena.shape[1], dtype=np.uint8)
+    for k in range(idx1.shape[0]):
+        ops, flags = _run_pair_budget(
+            arena, idx1[k], idx2[k], pair_buffer, max_ops, budgets[k]
+        )
+        ops_out[k] = ops
+        flags_out[k] = flags
+
+
+@njit(parallel=True, cache=True)
+def run_pair_groups(arena, idx1, idx2, budgets, max_ops, ops_out, flags_out):
+    """
+    Run groups of pair interactions: groups concurrently, pairs in order.
+
+    Pairs within a group may share tapes and run strictly in order, as in
+    run_sequence. Different groups must not share tapes (e.g. separated
+    blocks of a spatial grid), so they can run in parallel with identical
+    results.
+
+    Args:
+        arena: 2-D uint8 soup arena (modified in place)
+        idx1, idx2: 2-D int64 arrays (groups, pairs per group) of tape indices
+        budgets: 2-D int64 per-pair operation budgets (timeout draws)
+        max_ops: Maximum operations per interaction
+        ops_out: 2-D int64 output array of operation counts
+        flags_out: 2-D uint8 output array of FLAG_* bits
+    """
+    length = arena.shape[1]
+    for g in prange(idx1.shape[0]):
+        pair_buffer = np.empty(2 * length, dtype=np.uint8)
+        for k in range(idx1.shape[1]):
+            ops, flags = _run_pair_budget(
+                arena, idx1[g, k], idx2[g, k], pair_buffer, max_ops, budgets[g, k]
+            )
+            ops_out[g, k] = ops
+            flags_out[g, k] = flags
+
+
+# FNV-1a 64-bit parameters for tape fingerprints
+_FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+_FNV_PRIME = np.uint64(0x100000001b3)
+
+
+@njit(cache=True)
+def fingerprint_rows(arena, rows, out):
+    """
+    Compute 64-bit fingerprints of selected arena rows.
+
+    FNV-1a over the row bytes followed by a splitmix64 finalizer. The
+    value depends only on the bytes, so it is stable across processes
+    and runs (unlike Python's salted ``hash``).
+
+    Args:
+        arena: 2-D uint8 soup arena
+        rows: int64 array of row indices
+        out: uint64 output array, one fingerprint per entry of ``rows``
+    """
+    length = arena.shape[1]
+    for k in range(rows.shape[0]):
+        row = rows[k]
+        h = _FNV_OFFSET
+        for i in range(length):
+            h = (h ^ np.uint64(arena[row, i])) * _FNV_PRIME
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+        out[k] = h ^ (h >> np.uint64(31))
+
+
+# Opcode mask of the default instruction set (canonical forms, as analysis.zoo)
+_MASK = DEFAULT_INSTRUCTION_SET.mask
+
+
+@njit(parallel=True, cache=True)
+def canonical_fingerprints(arenas, out):
+    """
+    Fingerprint the canonical form (instruction bytes only) of every tape.
+
+    Tapes that differ only in their data bytes, or in where their
+    instructions sit, share a canonical fingerprint.
+
+    Args:
+        arenas: 3-D uint8 array (soups, size, tape_length)
+        out: uint64 output array of shape (soups, size)
+    """
+    for s in prange(arenas.shape[0]):
+        for t in range(arenas.shape[1]):
+            h = _FNV_OFFSET
+            for i in range(arenas.shape[2]):
+                byte = arenas[s, t, i]
+                if _MASK[byte]:
+                    h = (h ^ np.uint64(byte)) * _FNV_PRIME
+            h = (h ^ (h >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+            h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+            out[s, t] = h ^ (h >> np.uint64(31))
+
+
+@njit(parallel=True, cache=True)
+def run_soups(arenas, idx1, idx2, active, max_ops):
+    """
+    Run a block of random-pair interactions in each of many independent soups.
+
+    Soups run in parallel; within a soup the pairs run in order, as in
+    run_sequence (without timeouts).
+
+    Args:
+        arenas: 3-D uint8 array (soups, size, tape_length), modified in place
+        idx1, idx2: int64 arrays (soups, pairs) of tape indices
+        active: bool array (soups,); inactive soups are skipped
+        max_ops: Maximum operations per interaction
+    """
+    length = arenas.shape[2]
+    for s in prange(arenas.shape[0]):
+        if not active[s]:
+            continue
+        pair_buffer = np.empty(2 * length, dtype=np.uint8)
+        arena = arenas[s]
+        for k in range(idx1.shape[1]):
+            run_pair(arena, idx1[s, k], idx2[s, k], pair_buffer, max_ops)
+
+
+# Functions that read the opcode globals, directly or through a callee
+_SPECIALIZED = (
+    '_build_bracket_match', '_execute', 'execute_tape', 'execute_tape_profiled',
+    'run_pair', 'run_pair_profiled', '_run_pair_budget', 'run_pairs', 'run_sequence',
+    'run_pair_groups', 'run_soups', 'canonical_fingerprints',
+)
+
+
+class KernelSet(NamedTuple):
+    """Kernel entry points compiled for one instruction set."""
+    execute_tape: Callable
+    execute_tape_profiled: Callable
+    run_pair: Callable
+    run_pair_profiled: Callable
+    run_pairs: Callable
+    run_sequence: Callable
+    run_pair_groups: Callable
+    run_soups: Callable
+    canonical_fingerprints: Callable
+
+
+_KERNEL_SETS: Dict[Tuple[int, ...], KernelSet] = {}
+
+
+def kernels_for(instruction_set: InstructionSet) -> KernelSet:
+    """
+    Kernel functions specialized to an instruction set.
+
+    The default set gets this module's functions. Any other set gets
+    copies of the same Python functions with the opcode globals rebound
+    to its bytes, jitted afresh, so its opcodes are compile-time
+    constants too and every variant runs at full speed. numba cannot
+    disk-cache these copies: each process compiles a variant once, on
+    first use, and keeps it.
+
+    Args:
+        instruction_set: core.instruction_set.InstructionSet
+
+    Returns:
+        KernelSet
+    """
+    key = instruction_set.opcode_bytes
+    kernels = _KERNEL_SETS.get(key)
+    if kernels is None:
+        if key == DEFAULT_INSTRUCTION_SET.opcode_bytes:
+            namespace = globals()
+        else:
+            namespace = dict(globals())
+            namespace.update(zip(_OPCODE_GLOBALS, key[1:]))
+            namespace['_MASK'] = instruction_set.mask
+            for name in _SPECIALIZED:
+                dispatcher = globals()[name]
+                py_func = getattr(dispatcher, 'py_func', dispatcher)
+                clone = types.FunctionType(
+                    py_func.__code__, namespace, name, py_func.__defaults__
+                )
+                clone.__doc__ = py_func.__doc__
+                # Distinct qualname: numba mangles symbols from it, and a clone
+                # must never resolve to (or shadow) a disk-cached original
+                clone.__qualname__ = f'{py_func.__qualname__}_variant{len(_KERNEL_SETS)}'
+                # Same options as the original (njit implies nopython); callees
+                # resolve through ``namespace`` when first compiled
+                options = {
+                    option: value
+                    for option, value in getattr(dispatcher, 'targetoptions', {}).items()
+                    if option != 'nopython'
+                }
+                namespace[name] = njit(**options)(clone)
+        kernels = KernelSet(**{field: namespace[field] for field in KernelSet._fields})
+        _KERNEL_SETS[key] = kernels
+    return kernels
@@ -0,0 +1,126 @@
+"""
+Instruction-level execution profiles for BFF interpreters.
+
+An ``ExecutionProfile`` is a handful of fixed-size int64 counters that
+the reference interpreter (``BrainfuckInterpreter(tape, profile=...)``)
+and the compiled kernel (``kernel.execute_tape_profiled``) add to while
+they run:
+
+- ``opcodes[byte]``: instructions executed, by opcode byte
+- ``loop_iterations[pos]``: backward jumps taken by the ``]`` at pos
+- ``reads[pos]`` / ``writes[pos]``: tape bytes read / written by
+  instructions (the loop test byte, ``+``/``-`` operands, ``,`` source
+  and destination)
+- ``ops_histogram[bin]``: interactions by log2 operation count
+  (bins as in core.results)
+
+Positions index the executed buffer, i.e. the concatenated pair tape
+when profiling a Soup. Profiling is off unless a profile is passed in;
+the unprofiled kernel is compiled without any counter code.
+"""
+
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from .instruction_set import InstructionSet, get_instruction_set
+from .results import NUM_OPS_BINS, ops_bin
+
+
+class ExecutionProfile:
+    """
+    Accumulated execution counters for buffers of one length.
+
+    Attributes:
+        length: Executed buffer length the position counters cover
+        instruction_set: Instruction set whose opcodes summaries report
+        interactions: Number of recorded executions
+        opcodes: int64[256] execution counts by opcode byte
+        loop_iterations: int64[length] backward jumps by ``]`` position
+        reads: int64[length] reads by tape position
+        writes: int64[length] writes by tape position
+        ops_histogram: int64[NUM_OPS_BINS] executions by log2 ops bin
+    """
+
+    def __init__(self, length: int, instruction_set: Union[str, InstructionSet, None] = None):
+        """
+        Args:
+            length: Length of the executed buffer (2 * tape_length for soups)
+            instruction_set: Instruction set of the profiled code (default set if None)
+        """
+        self.length = length
+        self.instruction_set = get_instruction_set(instruction_set)
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters."""
+        self.interactions = 0
+        self.opcodes = np.zeros(256, dtype=np.int64)
+        self.loop_iterations = np.zeros(self.length, dtype=np.int64)
+        self.reads = np.zeros(self.length, dtype=np.int64)
+        self.writes = np.zeros(self.length, dtype=np.int64)
+        self.ops_histogram = np.zeros(NUM_OPS_BINS, dtype=np.int64)
+
+    def record_interaction(self, operations: int) -> None:
+        """Count one finished execution of ``operations`` ops."""
+        self.interactions += 1
+        self.ops_histogram[min(int(ops_bin(np.array([operations]))[0]), NUM_OPS_BINS - 1)] += 1
+
+    def merge(self, other: 'ExecutionProfile') -> None:
+        """Add another profile's counters into this one."""
+        if other.length != self.length:
+            raise ValueError(f"Profile length {other.length} != {self.length}")
+        if other.instruction_set != self.instruction_set:
+            raise ValueError(
+                f"Profile instruction set {other.instruction_set.name!r} != "
+                f"{self.instruction_set.name!r}"
+            )
+        self.interactions += other.interactions
+        self.opcodes += other.opcodes
+        self.loop_iterations += other.loop_iterations
+        self.reads += other.reads
+        self.writes += other.writes
+        self.ops_histogram += other.ops_histogram
+
+    @property
+    def operations(self) -> int:
+        """Total instructions executed."""
+        return int(self.opcodes.sum())
+
+    def hot_loops(self, k: int = 5) -> List[Tuple[int, int]]:
+        """
+        The ``]`` positions with the most iterations.
+
+        Returns:
+            List of (position, iterations), most iterated first
+        """
+        order = np.argsort(-self.loop_iterations, kind='stable')[:k]
+        return [
+            (int(position), int(self.loop_iterations[position]))
+            for position in order if self.loop_iterations[position] > 0
+        ]
+
+    def summary(self) -> Dict:
+        """JSON-serializable summary of the counters (opcodes in instruction set order)."""
+        operations = self.operations
+        opcodes = {op: int(self.opcodes[ord(op)]) for op in self.instruction_set.table}
+        return {
+            'interactions': self.interactions,
+            'operations': operations,
+            'opcodes': opcodes,
+            'opcode_fractions': {
+                op: count / operations if operations else 0.0
+                for op, count in opcodes.items()
+            },
+            'loop_iterations': int(self.loop_iterations.sum()),
+            'hot_loops': self.hot_loops(),
+            'reads': self.reads.tolist(),
+            'writes': self.writes.tolist(),
+            'ops_histogram': self.ops_histogram.tolist(),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ExecutionProfile(length={self.length}, interactions={self.interactions}, "
+            f"operations={self.operations})"
+        )
@@ -0,0 +1,226 @@
+"""
+On-disk interaction provenance log for BFF soups.
+
+Every interaction is appended as a compact record (idx1, idx2, ops,
+flags) so that who-met-whom can be reconstructed after a run (see
+analysis.provenance). Records carry no timestamp: record k of a log is
+interaction ``start_interaction + k + 1`` of the soup.
+
+File layout (little-endian):
+    8 bytes   magic b'BFFPROV1'
+    8 bytes   uint64 header length H
+    H bytes   UTF-8 JSON header: {'size', 'index_dtype', 'start_interaction'}
+    records   PROVENANCE_DTYPE rows: idx1, idx2 (uint16, or uint32 for
+              soups over 65536 tapes), ops (uint16, saturating), flags (uint8)
+
+Usage:
+    soup.provenance = ProvenanceLog('run.prov', soup.size)
+    soup.run(100_000)
+    soup.provenance.close()
+
+    records, header = read_provenance('run.prov')
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+
+PROVENANCE_MAGIC = b'BFFPROV1'
+
+# Operation counts above this are stored as this value
+MAX_LOGGED_OPS = 0xFFFF
+
+
+def provenance_dtype(size: int) -> np.dtype:
+    """Record dtype for a soup of ``size`` tapes."""
+    index = '<u2' if size <= 0x10000 else '<u4'
+    return np.dtype([
+        ('idx1', index),
+        ('idx2', index),
+        ('ops', '<u2'),
+        ('flags', 'u1'),
+    ])
+
+
+def _read_header(f, path) -> Dict:
+    """Read and validate the header, leaving ``f`` at the first record."""
+    magic = f.read(len(PROVENANCE_MAGIC))
+    if magic != PROVENANCE_MAGIC:
+        raise ValueError(f"{path} is not a provenance log (bad magic {magic!r})")
+    (header_length,) = struct.unpack('<Q', f.read(8))
+    return json.loads(f.read(header_length).decode('utf-8'))
+
+
+class ProvenanceLog:
+    """
+    Buffered append-only writer of interaction records.
+
+    Records collect in a fixed in-memory block and are written out when
+    it fills, on ``flush`` and on ``close``.
+
+    Attributes:
+        size: Number of tapes in the logged soup
+        start_interaction: Soup interaction count before the first record
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        size: int,
+        start_interaction: int = 0,
+        append: bool = False,
+        buffer_records: int = 1 << 16
+    ):
+        """
+        Args:
+            path: Log file to create
+            size: Number of tapes in the soup
+            start_interaction: Interaction count the log starts at
+            append: Continue an existing log instead of overwriting it
+            buffer_records: Records held in memory between writes
+
+        Raises:
+            ValueError: If appending to a log of a different soup size
+        """
+        self.path = Path(path)
+        self.size = size
+        self.dtype = provenance_dtype(size)
+
+        if append and self.path.exists():
+            with open(self.path, 'rb') as f:
+                header = _read_header(f, self.path)
+                self._data_offset = f.tell()
+            if header['size'] != size:
+                raise ValueError(f"{self.path} logs a soup of {header['size']} tapes, not {size}")
+            self.start_interaction = header['start_interaction']
+            self._file = open(self.path, 'r+b')
+            # Drop a torn final record
+            self._written = self._complete_records()
+            self._file.truncate(self._data_offset + self._written * self.dtype.itemsize)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self.start_interaction = start_interaction
+            header = json.dumps({
+                'size': size,
+                'index_dtype': self.dtype['idx1'].str,
+                'start_interaction': start_interaction,
+            }).encode('utf-8')
+            self._file = open(self.path, 'wb')
+            self._file.write(PROVENANCE_MAGIC)
+            self._file.write(struct.pack('<Q', len(header)))
+            self._file.write(header)
+            self._data_offset = self._file.tell()
+            self._written = 0
+
+        self._buffer = np.zeros(buffer_records, dtype=self.dtype)
+        self._buffered = 0
+
+    def _complete_records(self) -> int:
+        """Number of whole records currently in the file."""
+        data_bytes = os.fstat(self._file.fileno()).st_size - self._data_offset
+        return max(data_bytes, 0) // self.dtype.itemsize
+
+    def append(
+        self,
+        idx1: np.ndarray,
+        idx2: np.ndarray,
+        ops: np.ndarray,
+        flags: np.ndarray
+    ) -> None:
+        """
+        Append a batch of interactions, in execution order.
+
+        Args:
+            idx1, idx2: Tape indices of each interaction
+            ops: Operation counts (saturated at MAX_LOGGED_OPS)
+            flags: FLAG_* bits per interaction
+        """
+        n = len(idx1)
+        start = 0
+        while start < n:
+            take = min(n - start, self._buffer.shape[0] - self._buffered)
+            block = self._buffer[self._buffered:self._buffered + take]
+            block['idx1'] = idx1[start:start + take]
+            block['idx2'] = idx2[start:start + take]
+            block['ops'] = np.minimum(ops[start:start + take], MAX_LOGGED_OPS)
+            block['flags'] = flags[start:start + take]
+            self._buffered += take
+            start += take
+            if self._buffered == self._buffer.shape[0]:
+                self.flush()
+
+    def append_one(self, idx1: int, idx2: int, ops: int, flags: int) -> None:
+        """Append a single interaction."""
+        self._buffer[self._buffered] = (idx1, idx2, min(ops, MAX_LOGGED_OPS), flags)
+        self._buffered += 1
+        if self._buffered == self._buffer.shape[0]:
+            self.flush()
+
+    def truncate(self, interaction: int) -> None:
+        """
+        Drop records of interactions after ``interaction``.
+
+        Used when resuming from a checkpoint older than the end of the log.
+        """
+        self.flush()
+        keep = min(max(interaction - self.start_interaction, 0), self._written)
+        self._file.truncate(self._data_offset + keep * self.dtype.itemsize)
+        self._file.seek(0, os.SEEK_END)
+        self._written = keep
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        if self._buffered:
+            self._file.write(self._buffer[:self._buffered].tobytes())
+            self._written += self._buffered
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __len__(self) -> int:
+        return self._written + self._buffered
+
+    def __enter__(self) -> 'ProvenanceLog':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"ProvenanceLog({str(self.path)!r}, records={len(self)})"
+
+
+def read_provenance(path: Union[str, Path]) -> Tuple[np.ndarray, Dict]:
+    """
+    Memory-map the records of a provenance log.
+
+    Args:
+        path: Log written by ProvenanceLog
+
+    Returns:
+        Tuple (records, header); records is a read-only structured array
+        of provenance_dtype(header['size'])
+
+    Raises:
+        ValueError: If the file is not a provenance log
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        header = _read_header(f, path)
+        data_offset = f.tell()
+    dtype = provenance_dtype(header['size'])
+    num_records = (path.stat().st_size - data_offset) // dtype.itemsize
+    if num_records == 0:
+        return np.empty(0, dtype=dtype), header
+    records = np.memmap(path, dtype=dtype, mode='r', offset=data_offset, shape=(num_records,))
+    return records, header
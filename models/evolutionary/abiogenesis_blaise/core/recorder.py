@@ -0,0 +1,248 @@
+"""
+Append-only soup snapshot files for post-hoc replay.
+
+A snapshot file holds a sequence of full-soup frames recorded during a
+run. Frames have a fixed size, so a reader memory-maps the file and can
+random-access any frame without loading the run into RAM.
+
+File layout (little-endian):
+    8 bytes   magic b'BFFSNAP1'
+    8 bytes   uint64 header length H
+    H bytes   UTF-8 JSON header: {'size', 'tape_length', 'extra'}
+    frames    each: uint64 interaction count, then the arena,
+              size * tape_length raw bytes (row-major)
+
+The interaction counts of all frames form the index (a strided view over
+the mapped file). A frame cut short by a crash is ignored on read and
+dropped when the file is reopened for appending.
+
+Usage:
+    with SnapshotRecorder('run.snap', soup.size, soup.tape_length) as recorder:
+        recorder.record(soup)
+
+    snapshots = SnapshotReader('run.snap')
+    arena = snapshots[-1]
+    arena = snapshots.at(500_000)   # last frame at or before interaction 500k
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+
+
+SNAPSHOT_MAGIC = b'BFFSNAP1'
+
+
+def _frame_dtype(size: int, tape_length: int) -> np.dtype:
+    """Structured dtype of one frame."""
+    return np.dtype([
+        ('interaction', '<u8'),
+        ('arena', np.uint8, (size, tape_length)),
+    ])
+
+
+def _read_header(f, path) -> Dict:
+    """Read and validate the header, leaving ``f`` at the first frame."""
+    magic = f.read(len(SNAPSHOT_MAGIC))
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a snapshot file (bad magic {magic!r})")
+    (header_length,) = struct.unpack('<Q', f.read(8))
+    return json.loads(f.read(header_length).decode('utf-8'))
+
+
+class SnapshotRecorder:
+    """
+    Appends soup frames to a snapshot file.
+
+    Frames go through an ordinary buffered file handle; call ``flush``
+    (or close the recorder) to make them visible to readers.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        size: int,
+        tape_length: int,
+        extra: Optional[Dict] = None,
+        append: bool = False
+    ):
+        """
+        Args:
+            path: Snapshot file to create
+            size: Number of tapes per frame
+            tape_length: Bytes per tape
+            extra: Additional JSON-serializable data stored in the header
+            append: Continue an existing file instead of overwriting it
+
+        Raises:
+            ValueError: If appending to a file with a different soup shape
+        """
+        self.path = Path(path)
+        self.size = size
+        self.tape_length = tape_length
+        self.frame_bytes = _frame_dtype(size, tape_length).itemsize
+        self._frame_header = struct.Struct('<Q')
+
+        if append and self.path.exists():
+            with open(self.path, 'rb') as f:
+                header = _read_header(f, self.path)
+                self._data_offset = f.tell()
+            if (header['size'], header['tape_length']) != (size, tape_length):
+                raise ValueError(
+                    f"{self.path} holds {header['size']}x{header['tape_length']} frames, "
+                    f"not {size}x{tape_length}"
+                )
+            self._file = open(self.path, 'r+b')
+            # Drop a torn final frame
+            self._truncate_frames(self._complete_frames())
+        else:
+            header = json.dumps({
+                'size': size,
+                'tape_length': tape_length,
+                'extra': extra or {},
+            }).encode('utf-8')
+            self._file = open(self.path, 'wb')
+            self._file.write(SNAPSHOT_MAGIC)
+            self._file.write(struct.pack('<Q', len(header)))
+            self._file.write(header)
+            self._data_offset = self._file.tell()
+
+    def _complete_frames(self) -> int:
+        """Number of whole frames currently in the file."""
+        self._file.flush()
+        data_bytes = os.fstat(self._file.fileno()).st_size - self._data_offset
+        return max(data_bytes, 0) // self.frame_bytes
+
+    def _truncate_frames(self, num_frames: int) -> None:
+        """Cut the file to ``num_frames`` frames and seek to its end."""
+        self._file.truncate(self._data_offset + num_frames * self.frame_bytes)
+        self._file.seek(0, os.SEEK_END)
+
+    def __len__(self) -> int:
+        return self._complete_frames()
+
+    def record(self, soup) -> None:
+        """Append the soup's current arena and interaction count."""
+        self.record_arena(soup.arena, soup.interaction_count)
+
+    def record_arena(self, arena: np.ndarray, interaction: int) -> None:
+        """
+        Append one frame.
+
+        Args:
+            arena: (size, tape_length) uint8 array
+            interaction: Interaction count the frame was taken at
+        """
+        if arena.shape != (self.size, self.tape_length):
+            raise ValueError(
+                f"Arena shape {arena.shape} != ({self.size}, {self.tape_length})"
+            )
+        self._file.write(self._frame_header.pack(interaction))
+        self._file.write(np.ascontiguousarray(arena, dtype=np.uint8).data)
+
+    def truncate(self, interaction: int) -> None:
+        """
+        Drop frames recorded after ``interaction``.
+
+        Used when resuming from a checkpoint older than the last frame.
+        """
+        num_frames = self._complete_frames()
+        if num_frames == 0:
+            return
+        counts = np.memmap(
+            self.path, dtype=_frame_dtype(self.size, self.tape_length), mode='r',
+            offset=self._data_offset, shape=(num_frames,)
+        )['interaction']
+        keep = int(np.searchsorted(counts, interaction, side='right'))
+        del counts
+        self._truncate_frames(keep)
+
+    def flush(self) -> None:
+        """Flush buffered frames to disk."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> 'SnapshotRecorder':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class SnapshotReader:
+    """
+    Random access to the frames of a snapshot file.
+
+    Frames are read-only views into a memory map; nothing is loaded until
+    it is indexed. Copy a frame (``np.array(reader[i])``) to modify it.
+
+    Attributes:
+        size: Number of tapes per frame
+        tape_length: Bytes per tape
+        extra: Header data passed to the recorder
+        interactions: uint64 interaction count of each frame
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Snapshot file written by SnapshotRecorder
+
+        Raises:
+            ValueError: If the file is not a snapshot file
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            header = _read_header(f, self.path)
+            data_offset = f.tell()
+        self.size = header['size']
+        self.tape_length = header['tape_length']
+        self.extra = header['extra']
+
+        dtype = _frame_dtype(self.size, self.tape_length)
+        num_frames = (self.path.stat().st_size - data_offset) // dtype.itemsize
+        if num_frames:
+            self._frames = np.memmap(
+                self.path, dtype=dtype, mode='r', offset=data_offset, shape=(num_frames,)
+            )
+        else:
+            self._frames = np.empty(0, dtype=dtype)
+        self.interactions = self._frames['interaction']
+        self._arenas = self._frames['arena']
+
+    def __len__(self) -> int:
+        return self._frames.shape[0]
+
+    def __getitem__(self, index):
+        """Arena of frame ``index`` (or a stacked array for slices)."""
+        return self._arenas[index]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def at(self, interaction: int) -> np.ndarray:
+        """
+        Arena of the last frame taken at or before ``interaction``.
+
+        Raises:
+            IndexError: If every frame is later than ``interaction``
+        """
+        index = int(np.searchsorted(self.interactions, interaction, side='right')) - 1
+        if index < 0:
+            raise IndexError(f"No frame at or before interaction {interaction}")
+        return self[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"SnapshotReader({str(self.path)!r}, frames={len(self)}, "
+            f"shape=({self.size}, {self.tape_length}))"
+        )
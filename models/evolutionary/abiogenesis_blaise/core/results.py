@@ -0,0 +1,220 @@
+"""
+Compact interaction result containers for BFF soups.
+
+``Soup.run`` returns a list of ``InteractionResult`` objects by default.
+For long runs that is the dominant memory and allocation cost, so two
+fixed-size alternatives are provided:
+
+- ``InteractionRecords``: a preallocated NumPy record array with one
+  13-byte row (ops, idx1, idx2, flags) per interaction
+- ``RunningStats``: aggregates only (count, mean, max, log2 histogram of
+  ops, terminated/crash/timeout counts), constant memory
+
+Flags use the FLAG_* bits defined in core.kernel.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from .kernel import FLAG_TERMINATED, FLAG_CRASHED, FLAG_TIMED_OUT
+
+
+# Result modes accepted by Soup.run / Soup.run_epoch
+RESULT_MODES = ('list', 'records', 'stats')
+
+INTERACTION_DTYPE = np.dtype([
+    ('operations', '<i4'),
+    ('idx1', '<i4'),
+    ('idx2', '<i4'),
+    ('flags', 'u1'),
+])
+
+# Ops histogram bins: bin 0 holds 0 ops, bin b holds [2**(b-1), 2**b)
+NUM_OPS_BINS = 32
+
+
+def pack_flags(terminated: bool, crashed: bool, timed_out: bool) -> int:
+    """Combine outcome booleans into FLAG_* bits."""
+    return (
+        (FLAG_TERMINATED if terminated else 0)
+        | (FLAG_CRASHED if crashed else 0)
+        | (FLAG_TIMED_OUT if timed_out else 0)
+    )
+
+
+def ops_bin(operations: np.ndarray) -> np.ndarray:
+    """
+    Log2 histogram bin of each operation count.
+
+    Returns:
+        int64 array: 0 for 0 ops, otherwise floor(log2(ops)) + 1
+    """
+    operations = np.asarray(operations, dtype=np.int64)
+    bins = np.zeros(operations.shape, dtype=np.int64)
+    positive = operations > 0
+    bins[positive] = np.floor(np.log2(operations[positive])).astype(np.int64) + 1
+    return bins
+
+
+class InteractionRecords:
+    """
+    Preallocated columnar log of interaction outcomes.
+
+    Attributes:
+        capacity: Maximum number of records
+        count: Number of records written so far
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Number of interactions to reserve space for
+        """
+        self.capacity = capacity
+        self.count = 0
+        self._data = np.zeros(capacity, dtype=INTERACTION_DTYPE)
+
+    def append(
+        self,
+        operations: np.ndarray,
+        idx1: np.ndarray,
+        idx2: np.ndarray,
+        flags: np.ndarray
+    ) -> None:
+        """
+        Append a batch of interactions.
+
+        Raises:
+            ValueError: If the batch does not fit in the remaining capacity
+        """
+        n = len(operations)
+        if self.count + n > self.capacity:
+            raise ValueError(
+                f"InteractionRecords full: {self.count} + {n} > {self.capacity}"
+            )
+        block = self._data[self.count:self.count + n]
+        block['operations'] = operations
+        block['idx1'] = idx1
+        block['idx2'] = idx2
+        block['flags'] = flags
+        self.count += n
+
+    def extend(self, other: 'InteractionRecords') -> None:
+        """Append all records from another InteractionRecords."""
+        data = other.data
+        self.append(data['operations'], data['idx1'], data['idx2'], data['flags'])
+
+    @property
+    def data(self) -> np.ndarray:
+        """Structured array view of the filled records."""
+        return self._data[:self.count]
+
+    @property
+    def operations(self) -> np.ndarray:
+        """Operation counts of the filled records."""
+        return self._data['operations'][:self.count]
+
+    @property
+    def terminated(self) -> np.ndarray:
+        """Boolean mask of interactions that terminated normally."""
+        return (self.data['flags'] & FLAG_TERMINATED) != 0
+
+    @property
+    def crashed(self) -> np.ndarray:
+        """Boolean mask of interactions that crashed."""
+        return (self.data['flags'] & FLAG_CRASHED) != 0
+
+    @property
+    def timed_out(self) -> np.ndarray:
+        """Boolean mask of interactions that timed out."""
+        return (self.data['flags'] & FLAG_TIMED_OUT) != 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"InteractionRecords(count={self.count}, capacity={self.capacity})"
+
+
+class RunningStats:
+    """
+    Constant-memory aggregates over a stream of interactions.
+
+    Attributes:
+        count: Number of interactions seen
+        ops_sum: Total operations
+        ops_max: Largest operation count
+        terminated: Interactions that terminated normally
+        crashed: Interactions that crashed
+        timed_out: Interactions that timed out
+        ops_histogram: Counts per log2 ops bin (see NUM_OPS_BINS)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.ops_sum = 0
+        self.ops_max = 0
+        self.terminated = 0
+        self.crashed = 0
+        self.timed_out = 0
+        self.ops_histogram = np.zeros(NUM_OPS_BINS, dtype=np.int64)
+
+    def update(self, operations: np.ndarray, flags: np.ndarray) -> None:
+        """
+        Fold a batch of interactions into the aggregates.
+
+        Args:
+            operations: Operation counts
+            flags: FLAG_* bits per interaction
+        """
+        operations = np.asarray(operations, dtype=np.int64)
+        flags = np.asarray(flags, dtype=np.uint8)
+        if operations.shape[0] == 0:
+            return
+        self.count += int(operations.shape[0])
+        self.ops_sum += int(operations.sum())
+        self.ops_max = max(self.ops_max, int(operations.max()))
+        self.terminated += int(np.count_nonzero(flags & FLAG_TERMINATED))
+        self.crashed += int(np.count_nonzero(flags & FLAG_CRASHED))
+        self.timed_out += int(np.count_nonzero(flags & FLAG_TIMED_OUT))
+        bins = np.minimum(ops_bin(operations), NUM_OPS_BINS - 1)
+        self.ops_histogram += np.bincount(bins, minlength=NUM_OPS_BINS)
+
+    @property
+    def ops_mean(self) -> float:
+        """Mean operations per interaction."""
+        return self.ops_sum / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable summary."""
+        return {
+            'count': self.count,
+            'ops_mean': self.ops_mean,
+            'ops_max': self.ops_max,
+            'terminated': self.terminated,
+            'crashed': self.crashed,
+            'timed_out': self.timed_out,
+            'ops_histogram': self.ops_histogram.tolist(),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"RunningStats(count={self.count}, ops_mean={self.ops_mean:.1f}, "
+            f"ops_max={self.ops_max})"
+        )
+
+
+def records_from_list(results: List) -> InteractionRecords:
+    """Convert a list of InteractionResult into InteractionRecords."""
+    records = InteractionRecords(len(results))
+    records.append(
+        np.array([r.operations for r in results], dtype=np.int32),
+        np.array([r.idx1 for r in results], dtype=np.int32),
+        np.array([r.idx2 for r in results], dtype=np.int32),
+        np.array(
+            [pack_flags(r.terminated, r.crashed, r.timed_out) for r in results],
+            dtype=np.uint8
+        ),
+    )
+    return records
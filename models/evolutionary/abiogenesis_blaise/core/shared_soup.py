@@ -0,0 +1,317 @@
+"""
+Shared-memory multi-process runner for very large BFF soups.
+
+The soup arena is moved into ``multiprocessing.shared_memory`` and a pool
+of long-lived worker processes executes epochs in place. The coordinator
+(the calling process) draws each epoch's disjoint pairs from the soup's
+RNG, hands out batches of pair indices, and collects per-batch operation
+statistics and counts. Tapes never cross process boundaries - only small
+index and operation-count arrays and summary numbers do.
+
+Because an epoch's pairs are disjoint and all random draws are made by
+the coordinator, results are bit-identical to ``Soup.run_epoch`` for the
+same seed, whatever the number of workers. Soups whose epochs are not
+disjoint pairs (``Soup.epoch_groups``, e.g. the checkerboard phases of
+extensions.spatial) are run one phase at a time: a phase's groups are
+split across workers, each group runs its pairs in order, and the next
+phase starts once every group of the current one has finished.
+
+Usage:
+    soup = Soup(size=262_144, tape_length=64, seed=42)
+    with SharedSoupRunner(soup, num_workers=16) as runner:
+        for _ in range(100):
+            stats = runner.run_epoch()
+"""
+
+import multiprocessing as mp
+import queue
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import kernel
+from .instruction_set import InstructionSet, get_instruction_set
+from .soup import Soup
+
+
+# Seconds between worker liveness checks while waiting for batch results
+RESULT_POLL_SECONDS = 1.0
+
+
+@dataclass
+class EpochStats:
+    """
+    Aggregated statistics for one epoch run by SharedSoupRunner.
+
+    Attributes:
+        interactions: Number of pair interactions executed
+        ops_sum: Total operations over all interactions
+        ops_max: Largest operation count of any interaction
+        terminated: Number of interactions that ran off the end of the tape
+        crashed: Number of interactions that hit an unmatched bracket
+        timed_out: Number of interactions stopped by the timeout budget
+        operations: Operation count of each interaction, in the order of
+            the epoch's pairs (as Soup.run_epoch reports them)
+    """
+    interactions: int
+    ops_sum: int
+    ops_max: int
+    terminated: int = 0
+    crashed: int = 0
+    timed_out: int = 0
+    operations: Optional[np.ndarray] = None
+
+    @property
+    def ops_mean(self) -> float:
+        """Mean operations per interaction."""
+        return self.ops_sum / self.interactions if self.interactions else 0.0
+
+
+def _batch_stats(ops: np.ndarray, flags: np.ndarray) -> Dict[str, int]:
+    """Summarize one executed batch."""
+    return {
+        'interactions': int(ops.size),
+        'ops_sum': int(ops.sum()),
+        'ops_max': int(ops.max()) if ops.size else 0,
+        'terminated': int(np.count_nonzero(flags & kernel.FLAG_TERMINATED)),
+        'crashed': int(np.count_nonzero(flags & kernel.FLAG_CRASHED)),
+        'timed_out': int(np.count_nonzero(flags & kernel.FLAG_TIMED_OUT)),
+    }
+
+
+def epoch_batches(
+    soup: Soup,
+    idx1: np.ndarray,
+    idx2: np.ndarray,
+    budgets: np.ndarray,
+    batch_pairs: int
+) -> List[List[Tuple[np.ndarray, np.ndarray, np.ndarray]]]:
+    """
+    Split an epoch from ``soup.select_epoch_pairs`` into worker tasks.
+
+    Args:
+        soup: Soup that drew the pairs (its epoch_groups decide the split)
+        idx1, idx2, budgets: The epoch's pairs
+        batch_pairs: Approximate pairs per batch
+
+    Returns:
+        Phases in execution order, each a list of (idx1, idx2, budgets)
+        batches that touch disjoint tapes: 1-D pair arrays for soups
+        with disjoint epochs, 2-D (groups, pairs) arrays otherwise
+    """
+    groups = soup.epoch_groups()
+    if groups is None:
+        phases = [(idx1, idx2, budgets)]
+        step = batch_pairs
+    else:
+        phases = zip(*(array.reshape(groups) for array in (idx1, idx2, budgets)))
+        step = max(1, batch_pairs // groups[2])
+    return [
+        [
+            (phase_idx1[start:start + step], phase_idx2[start:start + step],
+             phase_budgets[start:start + step])
+            for start in range(0, phase_idx1.shape[0], step)
+        ]
+        for phase_idx1, phase_idx2, phase_budgets in phases
+    ]
+
+
+def _worker_main(
+    shm_name: str,
+    shape: Tuple[int, int],
+    tasks: mp.Queue,
+    results: mp.Queue,
+    instruction_set: Optional[InstructionSet] = None
+) -> None:
+    """
+    Worker loop: attach to the shared arena and execute pair batches.
+
+    Each task is (offset, idx1, idx2, budgets, max_ops), where offset is
+    the position of the batch's first pair in the epoch; ``None`` stops
+    the worker. 1-D index arrays are disjoint pairs (kernel.run_pairs),
+    2-D ones are groups of pairs (kernel.run_pair_groups). Each reply is
+    (offset, stats dict, operation counts in pair order).
+    """
+    if kernel.NUMBA_AVAILABLE:
+        # Parallelism comes from the process pool; avoid oversubscription
+        import numba
+        numba.set_num_threads(1)
+
+    kernels = kernel.kernels_for(get_instruction_set(instruction_set))
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        arena = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            offset, idx1, idx2, budgets, max_ops = task
+            ops = np.empty(idx1.shape, dtype=np.int64)
+            flags = np.empty(idx1.shape, dtype=np.uint8)
+            run = kernels.run_pair_groups if idx1.ndim == 2 else kernels.run_pairs
+            run(arena, idx1, idx2, budgets, max_ops, ops, flags)
+            results.put((offset, _batch_stats(ops, flags), ops.ravel()))
+        del arena
+    finally:
+        shm.close()
+
+
+class SharedSoupRunner:
+    """
+    Run a Soup's epochs across worker processes on a shared-memory arena.
+
+    While the runner is open, ``soup.arena`` is a view onto the shared
+    block, so the coordinator can sample diversity, hashes or checkpoints
+    between epochs as usual. On close the arena is copied back into
+    private memory and the shared block is released.
+    """
+
+    def __init__(
+        self,
+        soup: Soup,
+        num_workers: Optional[int] = None,
+        max_ops: int = 10000,
+        timeout_prob: float = 0.0,
+        batch_pairs: int = 4096
+    ):
+        """
+        Start workers and move the soup arena into shared memory.
+
+        Args:
+            soup: Soup to run (its arena is rebound to shared memory)
+            num_workers: Worker processes (default: CPU count)
+            max_ops: Maximum operations per interaction
+            timeout_prob: Probability of random timeout per operation
+            batch_pairs: Pairs per task handed to a worker (whole groups
+                for soups with epoch_groups)
+        """
+        if soup.profile is not None:
+            raise ValueError("SharedSoupRunner does not support profiled soups")
+        if soup.provenance is not None:
+            raise ValueError("SharedSoupRunner does not support provenance logging")
+        self.soup = soup
+        self.num_workers = num_workers or mp.cpu_count()
+        self.max_ops = max_ops
+        self.timeout_prob = timeout_prob
+        self.batch_pairs = batch_pairs
+
+        shape = soup.arena.shape
+        self._shm = shared_memory.SharedMemory(create=True, size=soup.arena.nbytes)
+        shared_arena = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf)
+        shared_arena[:] = soup.arena
+        soup._attach_arena(shared_arena)
+
+        self._workers = []
+        try:
+            # spawn: forking after numba has started threads is not safe
+            context = mp.get_context('spawn')
+            self._tasks = context.Queue()
+            self._results = context.Queue()
+            for _ in range(self.num_workers):
+                worker = context.Process(
+                    target=_worker_main,
+                    args=(self._shm.name, shape, self._tasks, self._results,
+                          soup.instruction_set),
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+        except BaseException:
+            for worker in self._workers:
+                worker.terminate()
+                worker.join()
+            self._release_arena()
+            raise
+
+    def run_epoch(self) -> EpochStats:
+        """
+        Run one epoch across the workers.
+
+        Returns:
+            EpochStats aggregated over all batches of the epoch
+        """
+        soup = self.soup
+        idx1, idx2, budgets = soup.select_epoch_pairs(self.max_ops, self.timeout_prob)
+
+        totals = EpochStats(
+            interactions=0, ops_sum=0, ops_max=0,
+            operations=np.empty(idx1.shape[0], dtype=np.int64)
+        )
+        offset = 0
+        for batches in epoch_batches(soup, idx1, idx2, budgets, self.batch_pairs):
+            for batch_idx1, batch_idx2, batch_budgets in batches:
+                self._tasks.put((offset, batch_idx1, batch_idx2, batch_budgets, self.max_ops))
+                offset += batch_idx1.size
+            # Waiting for every batch also keeps phases from overlapping
+            self._collect(len(batches), totals)
+
+        soup.interaction_count += totals.interactions
+        soup.refresh_fingerprints(np.concatenate([idx1, idx2]))
+
+        if soup.mutation_rate > 0:
+            soup.apply_mutations(rounds=totals.interactions)
+
+        return totals
+
+    def _collect(self, num_batches: int, totals: EpochStats) -> None:
+        """
+        Wait for ``num_batches`` replies and add their statistics to ``totals``.
+
+        Raises:
+            RuntimeError: If a worker process exits while replies are pending
+                (the epoch is then only partly applied to the arena)
+        """
+        for _ in range(num_batches):
+            while True:
+                try:
+                    offset, stats, ops = self._results.get(timeout=RESULT_POLL_SECONDS)
+                    break
+                except queue.Empty:
+                    for worker in self._workers:
+                        if not worker.is_alive():
+                            raise RuntimeError(
+                                f"SharedSoupRunner worker {worker.pid} exited with "
+                                f"code {worker.exitcode} while an epoch was running"
+                            )
+            totals.interactions += stats['interactions']
+            totals.ops_sum += stats['ops_sum']
+            totals.ops_max = max(totals.ops_max, stats['ops_max'])
+            totals.terminated += stats['terminated']
+            totals.crashed += stats['crashed']
+            totals.timed_out += stats['timed_out']
+            totals.operations[offset:offset + ops.size] = ops
+
+    def close(self) -> None:
+        """Stop workers, copy the arena back to private memory, free shared memory."""
+        if self._shm is None:
+            return
+        for _ in self._workers:
+            self._tasks.put(None)
+        for worker in self._workers:
+            worker.join(timeout=10 * RESULT_POLL_SECONDS)
+            if worker.is_alive():
+                # Still busy with the tasks of an abandoned epoch
+                worker.terminate()
+                worker.join()
+
+        self._release_arena()
+
+    def _release_arena(self) -> None:
+        """Copy the arena back to private memory and free the shared block."""
+        self.soup._attach_arena(self.soup.arena.copy())
+        try:
+            self._shm.close()
+        except BufferError:
+            # Tape views handed out while the runner was open still point
+            # at the block; it is freed once they are garbage collected
+            pass
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> 'SharedSoupRunner':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -3,13 +3,40 @@ Soup population dynamics engine for BFF abiogenesis experiment.
 
 The Soup manages a population of tapes and orchestrates their pairwise interactions.
 This is where the magic of spontaneous replication emergence happens.
+
+All tapes live in a single contiguous ``(size, tape_length)`` uint8 arena.
+``Soup.tapes`` hands out lightweight Tape views onto arena rows, so bulk
+operations (hashing, mutation, checkpoints) work on the arena directly.
+
+The soup also keeps a running multiset of 64-bit tape fingerprints,
+updated only for the tapes each interaction or mutation touches, so
+diversity and unique-tape counts are O(1) at any moment.
 """
 
+import hashlib
+import math
 import random
+import warnings
+import weakref
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional
-from .tape import Tape
-from .brainfuck import BrainfuckInterpreter
+from typing import Callable, Iterator, List, Tuple, Dict, Optional, Union
+
+import numpy as np
+
+from .tape import Tape, seeded_bytes
+from .brainfuck import BrainfuckInterpreter, draw_timeout_budget
+from .profiling import ExecutionProfile
+from .instruction_set import InstructionSet, get_instruction_set
+from .results import (
+    InteractionRecords, RunningStats, RESULT_MODES, pack_flags
+)
+from . import kernel
+
+
+# Interpreter engines: 'python' is the reference BrainfuckInterpreter,
+# 'numba' is the compiled kernel in core.kernel (bit-identical results)
+ENGINES = ('python', 'numba')
 
 
 @dataclass
@@ -33,6 +60,70 @@ class InteractionResult:
     timed_out: bool = False
 
 
+class SoupTapes:
+    """
+    Sequence of Tape views onto the rows of a soup arena.
+
+    Indexing returns a Tape whose buffer is the arena row, so modifying
+    the tape modifies the soup. Assigning a Tape copies its bytes into
+    the arena row. ``written_rows`` reports the rows of views handed out
+    since its last call and of views still alive, so the owner can treat
+    them as possibly written. (A view's ``buffer`` kept after the view
+    itself is gone is not tracked.)
+    """
+
+    def __init__(
+        self,
+        arena: np.ndarray,
+        on_write: Optional[Callable[[int], None]] = None
+    ):
+        """
+        Args:
+            arena: 2-D uint8 array of shape (size, tape_length)
+            on_write: Called with the row index after a Tape is assigned
+        """
+        self._arena = arena
+        self._on_write = on_write
+        # id(view) -> (weak reference to the view, row)
+        self._views: Dict[int, Tuple[weakref.ref, int]] = {}
+        # Rows of views handed out since the last written_rows call
+        self._recent: set = set()
+
+    def __len__(self) -> int:
+        return self._arena.shape[0]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Tape, List[Tape]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = self._arena[index]
+        tape = Tape(length=row.shape[0], buffer=row)
+        key = id(tape)
+        row = index % len(self)
+        self._views[key] = (weakref.ref(tape, lambda _, key=key: self._views.pop(key, None)), row)
+        self._recent.add(row)
+        return tape
+
+    def __setitem__(self, index: int, tape: Tape) -> None:
+        if tape.length != self._arena.shape[1]:
+            raise ValueError(
+                f"Tape length {tape.length} != soup tape length {self._arena.shape[1]}"
+            )
+        self._arena[index] = tape.buffer
+        if self._on_write is not None:
+            self._on_write(index % len(self))
+
+    def __iter__(self) -> Iterator[Tape]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def written_rows(self) -> List[int]:
+        """Rows of views handed out since the last call or still alive."""
+        rows = self._recent
+        rows.update(row for _, row in self._views.values())
+        self._recent = set()
+        return list(rows)
+
+
 class Soup:
     """
     Population of interacting tapes (the primordial soup).
@@ -42,10 +133,18 @@ class Soup:
     abiogenesis experiment.
 
     Key features:
-    - Random pairwise selection
+    - Contiguous uint8 arena storage (``arena``), with Tape views in ``tapes``
+    - Incremental fingerprint multiset for O(1) diversity queries
+    - Random pairwise selection, or epochs of disjoint pairs (run_epoch)
     - Tape concatenation and execution
     - Optional mutation
     - State tracking and checkpointing
+    - Selectable interpreter engine ('python' reference or 'numba' kernel)
+    - Optional instruction-level profiling (profile=True, profile_summary)
+    - Optional LRU cache of pair outcomes for low-diversity soups (pair_cache)
+    - Optional interaction provenance log (assign a core.provenance.ProvenanceLog
+      to ``provenance``)
+    - Selectable instruction set (core.instruction_set variants)
     """
 
     def __init__(
@@ -53,7 +152,11 @@ class Soup:
         size: int,
         tape_length: int = 64,
         mutation_rate: float = 0.0,
-        seed: Optional[int] = None
+        seed: Optional[int] = None,
+        engine: str = 'python',
+        profile: bool = False,
+        pair_cache: int = 0,
+        instruction_set: Union[str, InstructionSet] = 'bff7'
     ):
         """
         Initialize a soup of random tapes.
@@ -63,11 +166,35 @@ class Soup:
             tape_length: Length of each tape in bytes
             mutation_rate: Probability of mutation per byte per interaction
             seed: Random seed for reproducibility
+            engine: Interpreter engine, one of ENGINES
+            profile: Accumulate an instruction-level ExecutionProfile of
+                all interactions (slower; see profile_summary)
+            pair_cache: Capacity of the LRU cache of pair outcomes (0 = off;
+                see interact_pair). The cache replays pairs one at a time,
+                so with engine='numba' it disables the compiled batch paths
+                of run() and run_epoch() (several times slower per
+                interaction) and only pays off once few distinct tapes
+                remain; a RuntimeWarning says so
+            instruction_set: Opcode table, a name in INSTRUCTION_SETS or an
+                InstructionSet
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+
         self.size = size
         self.tape_length = tape_length
         self.mutation_rate = mutation_rate
+        self.engine = engine
         self.interaction_count = 0
+        # ProvenanceLog receiving every interaction, if set
+        self.provenance = None
+        self._init_pair_cache(pair_cache)
+        self._set_instruction_set(instruction_set)
+        self.profile = (
+            ExecutionProfile(2 * tape_length, self.instruction_set) if profile else None
+        )
+        # Bytes left before the next mutation (drawn on first use)
+        self._mutation_countdown: Optional[int] = None
 
         # Set random seed if provided
         if seed is not None:
@@ -76,14 +203,100 @@ class Soup:
         else:
             self._rng = random.Random()
 
-        # Initialize population with random tapes
-        self.tapes: List[Tape] = []
-        for i in range(size):
-            if seed is not None:
-                tape_seed = seed + i  # Different seed for each tape
-                self.tapes.append(Tape(length=tape_length, seed=tape_seed))
-            else:
-                self.tapes.append(Tape(length=tape_length))
+        # Initialize population with random tapes: tape i of a seeded soup
+        # draws from seed + i, so seeded runs keep their initial soups
+        if seed is not None:
+            arena = np.array(
+                [seeded_bytes(tape_length, seed + i) for i in range(size)],
+                dtype=np.uint8
+            ).reshape(size, tape_length)
+        else:
+            random_bytes = bytearray(self._rng.randbytes(size * tape_length))
+            arena = np.frombuffer(random_bytes, dtype=np.uint8).reshape(size, tape_length)
+        self._attach_arena(arena)
+
+    def _init_pair_cache(self, capacity: int) -> None:
+        """Set up an empty pair-outcome cache of ``capacity`` entries."""
+        if capacity > 0 and self.engine == 'numba':
+            warnings.warn(
+                "pair_cache disables the compiled numba batch paths of run() and "
+                "run_epoch(); it only pays off once few distinct tapes remain",
+                RuntimeWarning, stacklevel=3
+            )
+        self.pair_cache = capacity
+        # (fingerprint1, fingerprint2, limit) -> (input bytes, output bytes, ops, terminated, crashed)
+        self._pair_cache: Optional[OrderedDict] = OrderedDict() if capacity > 0 else None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _set_instruction_set(self, instruction_set) -> None:
+        """Select the opcode table used by both engines."""
+        self.instruction_set = get_instruction_set(instruction_set)
+        # Kernel functions with this set's opcodes compiled in
+        self._kernels = kernel.kernels_for(self.instruction_set)
+
+    def _attach_arena(self, arena: np.ndarray) -> None:
+        """Install ``arena`` as population storage and set up pair scratch space."""
+        self.arena = arena
+        # Rows handed out as Tape views may be written through them (e.g.
+        # soup.tapes[i].set_byte); fingerprint queries refresh those rows
+        # first (_sync_tape_views)
+        self.tapes = SoupTapes(
+            arena, on_write=lambda row: self._update_fingerprints(np.array([row]))
+        )
+        # Reusable buffer holding the concatenated pair during execution
+        self._pair_buffer = np.zeros(2 * self.tape_length, dtype=np.uint8)
+        self._pair_tape = Tape(length=2 * self.tape_length, buffer=self._pair_buffer)
+        self.refresh_fingerprints()
+
+    def refresh_fingerprints(self, rows: Optional[np.ndarray] = None) -> None:
+        """
+        Recompute tape fingerprints after external edits to the arena.
+
+        Args:
+            rows: Tape indices to refresh (None = rebuild for every tape)
+        """
+        if rows is not None:
+            self._update_fingerprints(np.unique(np.asarray(rows, dtype=np.int64)))
+            return
+
+        self._fingerprints = np.empty(self.size, dtype=np.uint64)
+        kernel.fingerprint_rows(
+            self.arena, np.arange(self.size, dtype=np.int64), self._fingerprints
+        )
+        values, first, counts = np.unique(
+            self._fingerprints, return_index=True, return_counts=True
+        )
+        self._fingerprint_counts = Counter(dict(zip(values.tolist(), counts.tolist())))
+        # Fingerprint -> a row holding it (the last one written; checked on use)
+        self._fingerprint_rows = dict(zip(values.tolist(), first.tolist()))
+
+    def _update_fingerprints(self, rows: np.ndarray) -> None:
+        """
+        Update the fingerprint multiset for ``rows`` (distinct int64 indices).
+        """
+        new = np.empty(rows.shape[0], dtype=np.uint64)
+        kernel.fingerprint_rows(self.arena, rows, new)
+        counts = self._fingerprint_counts
+        representatives = self._fingerprint_rows
+        for row, old_fp, new_fp in zip(
+            rows.tolist(), self._fingerprints[rows].tolist(), new.tolist()
+        ):
+            if old_fp == new_fp:
+                continue
+            counts[old_fp] -= 1
+            if counts[old_fp] == 0:
+                del counts[old_fp]
+                del representatives[old_fp]
+            counts[new_fp] += 1
+            representatives[new_fp] = row
+        self._fingerprints[rows] = new
+
+    def _sync_tape_views(self) -> None:
+        """Refresh the fingerprints of rows that live Tape views may have written."""
+        rows = self.tapes.written_rows()
+        if rows:
+            self._update_fingerprints(np.unique(np.array(rows, dtype=np.int64)))
 
     def select_pair(self) -> Tuple[Tape, Tape, int, int]:
         """
@@ -92,6 +305,11 @@ class Soup:
         Returns:
             Tuple of (tape1, tape2, index1, index2)
         """
+        idx1, idx2 = self._draw_pair()
+        return self.tapes[idx1], self.tapes[idx2], idx1, idx2
+
+    def _draw_pair(self) -> Tuple[int, int]:
+        """Draw two distinct random tape indices."""
         idx1 = self._rng.randint(0, self.size - 1)
         idx2 = self._rng.randint(0, self.size - 1)
 
@@ -99,7 +317,7 @@ class Soup:
         while idx2 == idx1:
             idx2 = self._rng.randint(0, self.size - 1)
 
-        return self.tapes[idx1], self.tapes[idx2], idx1, idx2
+        return idx1, idx2
 
     def interact_pair(
         self,
@@ -114,6 +332,15 @@ class Soup:
         The tapes are concatenated end-to-end and executed as a single program.
         After execution, they are separated and put back in the soup.
 
+        An interaction is a pure function of the two tapes and the operation
+        limit. With ``pair_cache`` set (and profiling off), outcomes are kept
+        in an LRU cache keyed by the tapes' fingerprints and the limit, and
+        a repeated pairing is replayed from it instead of executed. Entries
+        store the input bytes, so a fingerprint collision or a stale
+        fingerprint is a miss rather than a wrong result. Cached soups run
+        every pair through this method, so the numba engine loses its
+        compiled batch paths (see ``__init__``).
+
         Args:
             idx1: Index of first tape
             idx2: Index of second tape
@@ -123,35 +350,96 @@ class Soup:
         Returns:
             InteractionResult with execution metadata
         """
-        tape1 = self.tapes[idx1]
-        tape2 = self.tapes[idx2]
-
-        # Concatenate tapes
-        combined_data = tape1.data + tape2.data
-        combined_tape = Tape(length=len(combined_data), data=combined_data)
-
-        # Execute
-        interpreter = BrainfuckInterpreter(combined_tape)
-        exec_result = interpreter.run_from_tape(
-            start_position=0,
-            max_ops=max_ops,
-            timeout_prob=timeout_prob
-        )
-
-        # Separate and update tapes
-        # Note: The combined tape may have been modified during execution
-        tape1.data = combined_tape.data[:self.tape_length]
-        tape2.data = combined_tape.data[self.tape_length:]
+        # Probabilistic timeout as an operation budget drawn from the soup RNG
+        limit = draw_timeout_budget(timeout_prob, max_ops, self._rng)
+        length = self.tape_length
+
+        use_cache = self._pair_cache is not None and self.profile is None
+        outcome = None
+        if use_cache:
+            key = (int(self._fingerprints[idx1]), int(self._fingerprints[idx2]), limit)
+            inputs = self.arena[idx1].tobytes() + self.arena[idx2].tobytes()
+            outcome = self._pair_cache.get(key)
+            if outcome is not None and outcome[0] != inputs:
+                outcome = None
+
+        if outcome is not None:
+            # Replay a cached interaction
+            self._pair_cache.move_to_end(key)
+            self.cache_hits += 1
+            _, outputs, ops, terminated, crashed = outcome
+            self._pair_buffer[:] = np.frombuffer(outputs, dtype=np.uint8)
+            self.arena[idx1] = self._pair_buffer[:length]
+            self.arena[idx2] = self._pair_buffer[length:]
+        else:
+            if self.engine == 'numba':
+                if self.profile is None:
+                    ops, terminated, crashed, _, _, _, _ = self._kernels.run_pair(
+                        self.arena, idx1, idx2, self._pair_buffer, limit
+                    )
+                else:
+                    profile = self.profile
+                    ops, terminated, crashed, _, _, _, _ = self._kernels.run_pair_profiled(
+                        self.arena, idx1, idx2, self._pair_buffer, limit,
+                        profile.opcodes, profile.loop_iterations, profile.reads,
+                        profile.writes, profile.ops_histogram
+                    )
+                    profile.interactions += 1
+            else:
+                # Reference interpreter
+                # Concatenate tapes into the preallocated pair buffer
+                self._pair_buffer[:length] = self.arena[idx1]
+                self._pair_buffer[length:] = self.arena[idx2]
+
+                # Execute
+                interpreter = BrainfuckInterpreter(
+                    self._pair_tape, profile=self.profile, instruction_set=self.instruction_set
+                )
+                exec_result = interpreter.run_from_tape(start_position=0, max_ops=limit)
+                ops = exec_result.operations
+                terminated = exec_result.terminated
+                crashed = exec_result.crashed
+
+                # Separate and update tapes
+                # Note: The combined tape may have been modified during execution
+                self.arena[idx1] = self._pair_buffer[:length]
+                self.arena[idx2] = self._pair_buffer[length:]
+
+            if use_cache:
+                self.cache_misses += 1
+                self._pair_cache[key] = (
+                    inputs, self._pair_buffer.tobytes(), ops, terminated, crashed
+                )
+                if len(self._pair_cache) > self.pair_cache:
+                    self._pair_cache.popitem(last=False)
+
+        self._update_pair_fingerprints(idx1, idx2)
 
         return InteractionResult(
-            operations=exec_result.operations,
+            operations=ops,
             idx1=idx1,
             idx2=idx2,
-            terminated=exec_result.terminated,
-            crashed=exec_result.crashed,
-            timed_out=exec_result.timed_out
+            terminated=terminated,
+            crashed=crashed,
+            timed_out=limit < max_ops and ops == limit and not terminated and not crashed
         )
 
+    def pair_cache_info(self) -> Dict:
+        """Hit/miss counts and occupancy of the pair-outcome cache."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'capacity': self.pair_cache,
+            'entries': len(self._pair_cache) if self._pair_cache is not None else 0,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+        }
+
+    def _update_pair_fingerprints(self, idx1: int, idx2: int) -> None:
+        """Update fingerprints of the two tapes of an interaction."""
+        rows = (idx1,) if idx1 == idx2 else (idx1, idx2)
+        self._update_fingerprints(np.array(rows, dtype=np.int64))
+
     def interact_once(
         self,
         max_ops: int = 10000,
@@ -167,10 +455,15 @@ class Soup:
         Returns:
             InteractionResult
         """
-        _, _, idx1, idx2 = self.select_pair()
+        idx1, idx2 = self._draw_pair()
         result = self.interact_pair(idx1, idx2, max_ops, timeout_prob)
 
         self.interaction_count += 1
+        if self.provenance is not None:
+            self.provenance.append_one(
+                idx1, idx2, result.operations,
+                pack_flags(result.terminated, result.crashed, result.timed_out)
+            )
 
         # Apply mutations if enabled
         if self.mutation_rate > 0:
@@ -182,8 +475,9 @@ class Soup:
         self,
         num_interactions: int,
         max_ops: int = 10000,
-        timeout_prob: float = 0.0
-    ) -> List[InteractionResult]:
+        timeout_prob: float = 0.0,
+        results: str = 'list'
+    ) -> Union[List[InteractionResult], InteractionRecords, RunningStats]:
         """
         Run multiple interactions.
 
@@ -191,50 +485,292 @@ class Soup:
             num_interactions: Number of interactions to perform
             max_ops: Maximum operations per interaction
             timeout_prob: Probability of random timeout
+            results: Result mode, one of RESULT_MODES:
+                'list' - list of InteractionResult objects
+                'records' - preallocated InteractionRecords (13 bytes each)
+                'stats' - RunningStats aggregates only
 
         Returns:
-            List of InteractionResult objects
+            Results in the requested mode
         """
-        results = []
+        if results not in RESULT_MODES:
+            raise ValueError(f"Unknown results mode {results!r}, expected one of {RESULT_MODES}")
+
+        if results == 'list':
+            return [
+                self.interact_once(max_ops, timeout_prob)
+                for _ in range(num_interactions)
+            ]
+
+        idx1 = np.empty(num_interactions, dtype=np.int64)
+        idx2 = np.empty(num_interactions, dtype=np.int64)
+        ops = np.empty(num_interactions, dtype=np.int64)
+        flags = np.empty(num_interactions, dtype=np.uint8)
+
+        if (self.engine == 'numba' and self.mutation_rate == 0 and self.profile is None
+                and self._pair_cache is None):
+            # Without mutation the only draws are each interaction's pair
+            # and timeout budget, so make them all up front (in the same
+            # order) and run the whole batch in compiled code
+            budgets = np.empty(num_interactions, dtype=np.int64)
+            for k in range(num_interactions):
+                idx1[k], idx2[k] = self._draw_pair()
+                budgets[k] = draw_timeout_budget(timeout_prob, max_ops, self._rng)
+            self._kernels.run_sequence(self.arena, idx1, idx2, budgets, max_ops, ops, flags)
+            self.interaction_count += num_interactions
+            if self.provenance is not None:
+                self.provenance.append(idx1, idx2, ops, flags)
+            self._update_fingerprints(np.unique(np.concatenate([idx1, idx2])))
+        else:
+            for k in range(num_interactions):
+                result = self.interact_once(max_ops, timeout_prob)
+                idx1[k] = result.idx1
+                idx2[k] = result.idx2
+                ops[k] = result.operations
+                flags[k] = pack_flags(result.terminated, result.crashed, result.timed_out)
+
+        return self._package_results(results, ops, idx1, idx2, flags)
+
+    @staticmethod
+    def _package_results(
+        mode: str,
+        ops: np.ndarray,
+        idx1: np.ndarray,
+        idx2: np.ndarray,
+        flags: np.ndarray
+    ) -> Union[InteractionRecords, RunningStats]:
+        """Wrap per-interaction arrays as InteractionRecords or RunningStats."""
+        if mode == 'records':
+            records = InteractionRecords(ops.shape[0])
+            records.append(ops, idx1, idx2, flags)
+            return records
+        stats = RunningStats()
+        stats.update(ops, flags)
+        return stats
+
+    def select_epoch_pairs(
+        self,
+        max_ops: int = 10000,
+        timeout_prob: float = 0.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Shuffle the population into disjoint pairs for one epoch.
+
+        All random draws for the epoch come from one generator seeded from
+        the soup's RNG: the permutation, then one timeout draw per pair
+        (the pair's own slot in the stream). Nothing is drawn while pairs
+        execute, so results do not depend on execution order or thread count.
+
+        Args:
+            max_ops: Maximum operations per interaction
+            timeout_prob: Probability of random timeout per operation
 
-        for _ in range(num_interactions):
-            result = self.interact_once(max_ops, timeout_prob)
-            results.append(result)
+        Returns:
+            Tuple of (idx1, idx2, budgets) int64 arrays, one entry per pair.
+            ``budgets`` is the operation count at which each pair times out
+            (``max_ops`` when timeouts are disabled). With an odd soup size
+            one tape sits out the epoch.
+        """
+        generator = np.random.default_rng(self._rng.getrandbits(64))
+        num_pairs = self.size // 2
+        order = generator.permutation(self.size)[:2 * num_pairs]
+        pairs = order.reshape(num_pairs, 2).astype(np.int64)
+
+        if timeout_prob > 0:
+            # Geometric number of operations completed before a timeout
+            budgets = generator.geometric(timeout_prob, size=num_pairs) - 1
+            budgets = np.minimum(budgets, max_ops).astype(np.int64)
+        else:
+            budgets = np.full(num_pairs, max_ops, dtype=np.int64)
 
-        return results
+        return (
+            np.ascontiguousarray(pairs[:, 0]),
+            np.ascontiguousarray(pairs[:, 1]),
+            budgets,
+        )
 
-    def apply_mutations(self) -> None:
+    def run_epoch(
+        self,
+        max_ops: int = 10000,
+        timeout_prob: float = 0.0,
+        results: str = 'list'
+    ) -> Union[List[InteractionResult], InteractionRecords, RunningStats]:
+        """
+        Run one epoch: every tape interacts once, in disjoint pairs.
+
+        This is the scheduling used in the original BFF paper. Because no
+        tape appears in two pairs, the numba engine executes the whole
+        epoch in parallel across cores; the python engine (and a soup with
+        a pair cache) runs the same pairs serially with identical results.
+
+        Timeouts are drawn per pair up front (see select_epoch_pairs)
+        rather than per operation. Mutation, if enabled, is applied once
+        per interaction after the epoch completes.
+
+        Args:
+            max_ops: Maximum operations per interaction
+            timeout_prob: Probability of random timeout per operation
+            results: Result mode, one of RESULT_MODES (see run)
+
+        Returns:
+            Results in the requested mode, one entry per pair
+        """
+        if results not in RESULT_MODES:
+            raise ValueError(f"Unknown results mode {results!r}, expected one of {RESULT_MODES}")
+
+        idx1, idx2, budgets = self.select_epoch_pairs(max_ops, timeout_prob)
+        num_pairs = idx1.shape[0]
+        ops = np.empty(num_pairs, dtype=np.int64)
+        flags = np.empty(num_pairs, dtype=np.uint8)
+
+        if self.engine == 'numba' and self.profile is None and self._pair_cache is None:
+            self._run_epoch_pairs(idx1, idx2, budgets, max_ops, ops, flags)
+        else:
+            for k in range(num_pairs):
+                limit = int(budgets[k])
+                result = self.interact_pair(int(idx1[k]), int(idx2[k]), limit)
+                timed_out = (
+                    limit < max_ops
+                    and result.operations == limit
+                    and not result.terminated
+                    and not result.crashed
+                )
+                ops[k] = result.operations
+                flags[k] = pack_flags(result.terminated, result.crashed, timed_out)
+
+        self.interaction_count += num_pairs
+        self._update_fingerprints(np.unique(np.concatenate([idx1, idx2])))
+        if self.provenance is not None:
+            self.provenance.append(idx1, idx2, ops, flags)
+
+        if self.mutation_rate > 0:
+            self.apply_mutations(rounds=num_pairs)
+
+        if results == 'list':
+            return [
+                InteractionResult(
+                    operations=int(ops[k]),
+                    idx1=int(idx1[k]),
+                    idx2=int(idx2[k]),
+                    terminated=bool(flags[k] & kernel.FLAG_TERMINATED),
+                    crashed=bool(flags[k] & kernel.FLAG_CRASHED),
+                    timed_out=bool(flags[k] & kernel.FLAG_TIMED_OUT)
+                )
+                for k in range(num_pairs)
+            ]
+        return self._package_results(results, ops, idx1, idx2, flags)
+
+    def _run_epoch_pairs(
+        self,
+        idx1: np.ndarray,
+        idx2: np.ndarray,
+        budgets: np.ndarray,
+        max_ops: int,
+        ops: np.ndarray,
+        flags: np.ndarray
+    ) -> None:
+        """
+        Execute one epoch's pairs in compiled code (the numba path of run_epoch).
+
+        Must give the same result as running the pairs serially in order;
+        subclasses with their own epoch schedule override this together
+        with select_epoch_pairs.
+        """
+        self._kernels.run_pairs(self.arena, idx1, idx2, budgets, max_ops, ops, flags)
+
+    def epoch_groups(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Concurrency structure of the pairs from select_epoch_pairs.
+
+        Returns:
+            None if all pairs of an epoch are disjoint (they may run in any
+            order, e.g. across processes). Otherwise a shape (phases,
+            groups, pairs per group) of the epoch order: phases run one
+            after another, groups of a phase share no tapes, and the pairs
+            of a group run strictly in order (kernel.run_pair_groups).
+        """
+        return None
+
+    def apply_mutations(self, rounds: int = 1) -> np.ndarray:
         """
         Apply random mutations to the soup.
 
-        Each byte has a probability of mutation_rate of being randomized.
+        Each byte has a probability of mutation_rate of being randomized,
+        independently per round. Rather than testing every byte, the gaps
+        between mutated positions in the stream of (round, byte) positions
+        are drawn from a geometric distribution, and the distance to the
+        next mutation carries over between calls. Cost scales with the
+        number of mutations, not with the soup volume.
+
+        Args:
+            rounds: Number of mutation rounds to apply (one per interaction)
+
+        Returns:
+            Flat arena positions that were mutated (may repeat)
         """
-        if self.mutation_rate <= 0:
-            return
+        if self.mutation_rate <= 0 or rounds <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        flat = self.arena.reshape(-1)
+        total = flat.shape[0] * rounds
 
-        for tape in self.tapes:
-            for i in range(tape.length):
-                if self._rng.random() < self.mutation_rate:
-                    tape.data[i] = self._rng.randint(0, 255)
+        if self.mutation_rate >= 1:
+            positions = np.arange(total, dtype=np.int64) % flat.shape[0]
+        else:
+            if self._mutation_countdown is None:
+                self._mutation_countdown = self._mutation_gap()
+            found = []
+            position = self._mutation_countdown
+            while position < total:
+                found.append(position)
+                position += 1 + self._mutation_gap()
+            self._mutation_countdown = position - total
+            positions = np.array(found, dtype=np.int64) % flat.shape[0]
+
+        if positions.shape[0]:
+            values = np.frombuffer(self._rng.randbytes(positions.shape[0]), dtype=np.uint8)
+            # Repeated positions keep the later value, as in sequential rounds
+            flat[positions] = values
+            self._update_fingerprints(np.unique(positions // self.tape_length))
+
+        return positions
+
+    def _mutation_gap(self) -> int:
+        """Draw the number of unmutated bytes before the next mutation."""
+        # Geometric (failures before first success) by inversion
+        return int(math.log(1.0 - self._rng.random()) / math.log1p(-self.mutation_rate))
 
     def get_tape_hashes(self) -> List[str]:
         """
         Get hash of each tape in soup.
 
+        Computes SHA-256 of every tape; prefer get_fingerprints() or
+        top_replicators() for frequent sampling.
+
         Returns:
             List of hash strings
         """
-        return [tape.hash() for tape in self.tapes]
+        return [hashlib.sha256(row.tobytes()).hexdigest() for row in self.arena]
+
+    def get_fingerprints(self) -> np.ndarray:
+        """
+        Get the 64-bit fingerprint of each tape.
+
+        Returns:
+            uint64 array of length size (a copy)
+        """
+        self._sync_tape_views()
+        return self._fingerprints.copy()
 
     def count_unique_tapes(self) -> int:
         """
         Count number of unique tapes in soup.
 
         Returns:
-            Number of distinct tapes (by hash)
+            Number of distinct tapes (by fingerprint)
         """
-        hashes = self.get_tape_hashes()
-        return len(set(hashes))
+        self._sync_tape_views()
+        return len(self._fingerprint_counts)
 
     def get_diversity(self) -> float:
         """
@@ -245,19 +781,77 @@ class Soup:
         """
         return self.count_unique_tapes() / self.size
 
+    def top_replicators(self, k: int = 10) -> List[Tuple[int, int, int]]:
+        """
+        Most abundant tapes in the soup.
+
+        Args:
+            k: Number of entries to return
+
+        Returns:
+            List of (fingerprint, count, index of one copy), most common first
+        """
+        self._sync_tape_views()
+        top = []
+        for fp, count in self._fingerprint_counts.most_common(k):
+            row = self._fingerprint_rows[fp]
+            if int(self._fingerprints[row]) != fp:
+                # The recorded copy was overwritten since; find another one
+                row = int(np.flatnonzero(self._fingerprints == np.uint64(fp))[0])
+                self._fingerprint_rows[fp] = row
+            top.append((fp, count, row))
+        return top
+
+    def profile_summary(self) -> Optional[Dict]:
+        """
+        Summary of the instruction-level profile (see core.profiling).
+
+        Returns:
+            ExecutionProfile.summary() dict, or None if profiling is off
+        """
+        if self.profile is None:
+            return None
+        return self.profile.summary()
+
     def get_state(self) -> Dict:
         """
         Get complete soup state for checkpointing.
 
+        For large soups prefer core.checkpoint, which stores the arena as
+        raw bytes instead of JSON lists.
+
         Returns:
             Dictionary with all soup state
         """
+        state = self.get_metadata()
+        state['tapes'] = [
+            {'length': self.tape_length, 'data': row}
+            for row in self.arena.tolist()
+        ]
+        return state
+
+    def get_metadata(self) -> Dict:
+        """
+        Get JSON-serializable soup state other than the tapes.
+
+        Includes the RNG state and mutation countdown, so a restored soup
+        continues the exact trajectory of the original.
+
+        Returns:
+            Dictionary of scalar parameters and RNG state
+        """
+        version, internal, gauss_next = self._rng.getstate()
         return {
             'size': self.size,
             'tape_length': self.tape_length,
             'mutation_rate': self.mutation_rate,
+            'engine': self.engine,
             'interaction_count': self.interaction_count,
-            'tapes': [tape.to_dict() for tape in self.tapes]
+            'rng_state': [version, list(internal), gauss_next],
+            'mutation_countdown': self._mutation_countdown,
+            'profile': self.profile is not None,
+            'pair_cache': self.pair_cache,
+            'instruction_set': self.instruction_set.to_dict(),
         }
 
     @classmethod
@@ -268,19 +862,55 @@ class Soup:
         Args:
             state: Dictionary from get_state()
 
+        Returns:
+            Reconstructed Soup
+        """
+        arena = np.array(
+            [tape_dict['data'] for tape_dict in state['tapes']], dtype=np.uint8
+        ).reshape(state['size'], state['tape_length'])
+        return cls.from_arena(state, arena)
+
+    @classmethod
+    def from_arena(cls, metadata: Dict, arena: np.ndarray) -> 'Soup':
+        """
+        Restore soup from metadata and an arena array.
+
+        States saved without RNG state get a fresh unseeded RNG.
+
+        Args:
+            metadata: Dictionary from get_metadata() (or get_state())
+            arena: uint8 array of shape (size, tape_length), used in place
+
         Returns:
             Reconstructed Soup
         """
         # Create soup without initializing random tapes
         soup = cls.__new__(cls)
-        soup.size = state['size']
-        soup.tape_length = state['tape_length']
-        soup.mutation_rate = state['mutation_rate']
-        soup.interaction_count = state['interaction_count']
+        soup.size = metadata['size']
+        soup.tape_length = metadata['tape_length']
+        soup.mutation_rate = metadata['mutation_rate']
+        soup.engine = metadata.get('engine', 'python')
+        soup.interaction_count = metadata['interaction_count']
+        # A log file belongs to the run, not the soup; reattach after restoring
+        soup.provenance = None
+        soup._init_pair_cache(metadata.get('pair_cache', 0))
+        soup._set_instruction_set(metadata.get('instruction_set'))
+        # Counters are not saved; a profiled soup restarts from zero
+        soup.profile = (
+            ExecutionProfile(2 * soup.tape_length, soup.instruction_set)
+            if metadata.get('profile') else None
+        )
         soup._rng = random.Random()
+        if metadata.get('rng_state') is not None:
+            version, internal, gauss_next = metadata['rng_state']
+            soup._rng.setstate((version, tuple(internal), gauss_next))
+        soup._mutation_countdown = metadata.get('mutation_countdown')
 
-        # Restore tapes
-        soup.tapes = [Tape.from_dict(tape_dict) for tape_dict in state['tapes']]
+        if arena.shape != (soup.size, soup.tape_length):
+            raise ValueError(
+                f"Arena shape {arena.shape} != ({soup.size}, {soup.tape_length})"
+            )
+        soup._attach_arena(arena)
 
         return soup
 
@@ -289,5 +919,6 @@ class Soup:
         unique = self.count_unique_tapes()
         return (
             f"Soup(size={self.size}, tape_length={self.tape_length}, "
+            f"engine={self.engine!r}, instruction_set={self.instruction_set.name!r}, "
             f"interactions={self.interaction_count}, unique_tapes={unique})"
         )
@@ -3,12 +3,19 @@ Tape data structure for BFF (Brainfuck) abiogenesis experiment.
 
 A Tape represents a sequence of bytes that can contain both code and data.
 In the BFF experiment, tapes are 64 bytes long and interact in pairs.
+
+Tape storage is a 1-D NumPy ``uint8`` array. A standalone tape owns its
+array; tapes handed out by a Soup are views onto one row of the soup's
+contiguous ``(size, tape_length)`` arena, so reading or writing through
+the tape reads or writes the soup directly.
 """
 
 import random
 import hashlib
 from typing import List, Dict, Optional
 
+import numpy as np
+
 
 # Brainfuck instruction set (ASCII values)
 VALID_INSTRUCTIONS = {
@@ -21,6 +28,60 @@ VALID_INSTRUCTIONS = {
     93,   # ]  end loop
 }
 
+# Lookup table: INSTRUCTION_MASK[byte] is True for valid instructions
+INSTRUCTION_MASK = np.zeros(256, dtype=bool)
+INSTRUCTION_MASK[list(VALID_INSTRUCTIONS)] = True
+
+
+def seeded_bytes(length: int, seed: int) -> List[int]:
+    """
+    Random tape bytes drawn from ``random.Random(seed)``.
+
+    Args:
+        length: Number of bytes
+        seed: Random seed
+
+    Returns:
+        List of ``length`` bytes (integers 0-255)
+    """
+    rng = random.Random(seed)
+    return [rng.randint(0, 255) for _ in range(length)]
+
+
+class TapeData(list):
+    """
+    List of a tape's bytes that writes item assignments through to the tape.
+
+    Returned by ``Tape.data``: reads behave like a plain list, and
+    ``data[i] = x`` (or a slice assignment) also writes the tape's buffer.
+    Operations that would change the tape length raise TypeError.
+    """
+
+    __slots__ = ('_tape',)
+
+    def __init__(self, tape: 'Tape'):
+        super().__init__(tape.buffer.tolist())
+        self._tape = tape
+
+    def __setitem__(self, index, value) -> None:
+        buffer = self._tape.buffer
+        buffer[index] = value
+        super().__setitem__(index, buffer[index].tolist())
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._tape.buffer[:] = self
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._tape.buffer[:] = self
+
+    def _fixed_length(self, *args, **kwargs):
+        raise TypeError("Tape length is fixed")
+
+    append = extend = insert = pop = remove = clear = _fixed_length
+    __delitem__ = __iadd__ = __imul__ = _fixed_length
+
 
 class Tape:
     """
@@ -32,14 +93,16 @@ class Tape:
 
     Attributes:
         length: Number of bytes in the tape
-        data: List of bytes (integers 0-255)
+        buffer: uint8 array holding the bytes (may be a view into a soup arena)
+        data: List of bytes (integers 0-255); item assignments write through
     """
 
     def __init__(
         self,
         length: int,
         data: Optional[List[int]] = None,
-        seed: Optional[int] = None
+        seed: Optional[int] = None,
+        buffer: Optional[np.ndarray] = None
     ):
         """
         Initialize a tape.
@@ -48,21 +111,49 @@ class Tape:
             length: Number of bytes in the tape
             data: Optional explicit byte data. If None, initializes randomly.
             seed: Optional random seed for reproducibility
+            buffer: Optional 1-D uint8 array to use as storage without copying.
+                Takes precedence over ``data`` and ``seed``.
         """
         self.length = length
 
-        if data is not None:
+        if buffer is not None:
+            if buffer.dtype != np.uint8 or buffer.shape != (length,):
+                raise ValueError(
+                    f"Buffer must be uint8 with shape ({length},), "
+                    f"got {buffer.dtype} {buffer.shape}"
+                )
+            self._attach(buffer)
+        elif data is not None:
             # Copy data to avoid mutation of external list
-            self.data = data.copy()
-            if len(self.data) != length:
+            if len(data) != length:
                 raise ValueError(f"Data length {len(data)} != tape length {length}")
+            self._attach(np.array(data, dtype=np.uint8))
         else:
             # Initialize with random bytes
             if seed is not None:
-                rng = random.Random(seed)
-                self.data = [rng.randint(0, 255) for _ in range(length)]
+                values = seeded_bytes(length, seed)
             else:
-                self.data = [random.randint(0, 255) for _ in range(length)]
+                values = [random.randint(0, 255) for _ in range(length)]
+            self._attach(np.array(values, dtype=np.uint8))
+
+    def _attach(self, buffer: np.ndarray) -> None:
+        """Use ``buffer`` as backing storage."""
+        self.buffer = buffer
+        # memoryview indexing yields plain ints and is much faster than
+        # NumPy scalar indexing for the interpreter's byte-at-a-time access
+        self._bytes = memoryview(buffer)
+
+    @property
+    def data(self) -> TapeData:
+        """Tape bytes as a list whose item assignments write to the tape."""
+        return TapeData(self)
+
+    @data.setter
+    def data(self, values: List[int]) -> None:
+        """Overwrite tape bytes in place."""
+        if len(values) != self.length:
+            raise ValueError(f"Data length {len(values)} != tape length {self.length}")
+        self.buffer[:] = values
 
     def get_byte(self, position: int) -> int:
         """
@@ -74,7 +165,7 @@ class Tape:
         Returns:
             Byte value (0-255)
         """
-        return self.data[position]
+        return self._bytes[position]
 
     def set_byte(self, position: int, value: int) -> None:
         """
@@ -84,7 +175,7 @@ class Tape:
             position: Index in tape (0 to length-1)
             value: Byte value (0-255), will be clamped
         """
-        self.data[position] = max(0, min(255, value))
+        self._bytes[position] = max(0, min(255, value))
 
     def increment_byte(self, position: int) -> None:
         """
@@ -95,7 +186,7 @@ class Tape:
         Args:
             position: Index in tape (0 to length-1)
         """
-        self.data[position] = (self.data[position] + 1) % 256
+        self._bytes[position] = (self._bytes[position] + 1) % 256
 
     def decrement_byte(self, position: int) -> None:
         """
@@ -106,7 +197,7 @@ class Tape:
         Args:
             position: Index in tape (0 to length-1)
         """
-        self.data[position] = (self.data[position] - 1) % 256
+        self._bytes[position] = (self._bytes[position] - 1) % 256
 
     def hash(self) -> str:
         """
@@ -116,8 +207,7 @@ class Tape:
             Hex string hash of tape data
         """
         # Use SHA-256 for consistent hashing
-        data_bytes = bytes(self.data)
-        return hashlib.sha256(data_bytes).hexdigest()
+        return hashlib.sha256(self.buffer.tobytes()).hexdigest()
 
     def clone(self) -> 'Tape':
         """
@@ -126,7 +216,7 @@ class Tape:
         Returns:
             New Tape with same data
         """
-        return Tape(length=self.length, data=self.data.copy())
+        return Tape(length=self.length, buffer=self.buffer.copy())
 
     def to_dict(self) -> Dict:
         """
@@ -137,7 +227,7 @@ class Tape:
         """
         return {
             'length': self.length,
-            'data': self.data.copy()
+            'data': self.buffer.tolist()
         }
 
     @classmethod
@@ -168,7 +258,10 @@ class Tape:
         """
         if not isinstance(other, Tape):
             return False
-        return self.length == other.length and self.data == other.data
+        return (
+            self.length == other.length
+            and np.array_equal(self.buffer, other.buffer)
+        )
 
     def __ne__(self, other: object) -> bool:
         """Check inequality."""
@@ -184,11 +277,11 @@ class Tape:
         Returns:
             Number of valid instruction bytes
         """
-        return sum(1 for byte in self.data if byte in VALID_INSTRUCTIONS)
+        return int(INSTRUCTION_MASK[self.buffer].sum())
 
     def __repr__(self) -> str:
         """String representation for debugging."""
-        preview = self.data[:8] if len(self.data) > 8 else self.data
+        preview = self.buffer[:8].tolist()
         preview_str = ', '.join(str(b) for b in preview)
-        suffix = '...' if len(self.data) > 8 else ''
+        suffix = '...' if self.length > 8 else ''
         return f"Tape(length={self.length}, data=[{preview_str}{suffix}])"
@@ -0,0 +1,300 @@
+"""
+2-D spatial soup: tapes on a grid interacting only with nearby tapes.
+
+A SpatialSoup is a Soup whose arena rows are the cells of a
+``height x width`` grid in row-major order (row ``y * width + x``), with
+periodic (toroidal) boundaries. Every interaction pairs a tape with a
+partner drawn uniformly from its neighbourhood of radius ``radius``
+(Moore: Chebyshev distance, von Neumann: Manhattan distance), so
+replicators spread as waves instead of mixing through the whole soup.
+
+Epochs use domain decomposition. The grid is tiled into square blocks
+of side ``block_size >= 2 * radius`` and the blocks are coloured in a
+2 x 2 checkerboard. In each of the four phases every cell of the blocks
+of one colour initiates one interaction, in random order within its
+block. A block's pairs reach at most ``radius`` cells outside it, so
+blocks of the same colour never share a tape and the numba engine runs
+them concurrently (kernel.run_pair_groups); the python engine runs the
+same pairs serially with identical results. An epoch is ``size``
+interactions: every tape initiates exactly once.
+
+Serial runs (Soup.run, interact_once) draw a uniform random cell and a
+random neighbour, and are otherwise unchanged.
+
+Usage:
+    soup = SpatialSoup(256, 256, tape_length=64, radius=2, seed=0, engine='numba')
+    for _ in range(100):
+        soup.run_epoch(max_ops=2**13, results='stats')
+    species = soup.fingerprint_grid()    # (256, 256) uint64 fingerprints
+"""
+
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from core.soup import Soup
+from core.instruction_set import InstructionSet
+
+
+NEIGHBORHOODS = ('moore', 'von_neumann')
+
+
+def neighbor_offsets(radius: int, neighborhood: str = 'moore') -> np.ndarray:
+    """
+    Grid offsets of a cell's neighbours, excluding the cell itself.
+
+    Args:
+        radius: Interaction radius (>= 1)
+        neighborhood: 'moore' (square) or 'von_neumann' (diamond)
+
+    Returns:
+        int64 array of shape (n, 2) with (dy, dx) rows
+    """
+    if neighborhood not in NEIGHBORHOODS:
+        raise ValueError(f"Unknown neighborhood {neighborhood!r}, expected one of {NEIGHBORHOODS}")
+    if radius < 1:
+        raise ValueError(f"radius must be >= 1, got {radius}")
+    span = np.arange(-radius, radius + 1)
+    dy, dx = (a.ravel() for a in np.meshgrid(span, span, indexing='ij'))
+    if neighborhood == 'moore':
+        keep = (dy != 0) | (dx != 0)
+    else:
+        keep = ((dy != 0) | (dx != 0)) & (np.abs(dy) + np.abs(dx) <= radius)
+    return np.stack([dy[keep], dx[keep]], axis=1).astype(np.int64)
+
+
+def default_block_size(width: int, height: int, radius: int) -> int:
+    """
+    Smallest valid block side for a grid (see SpatialSoup).
+
+    Raises:
+        ValueError: If no block side fits the grid
+    """
+    for block_size in range(2 * radius, min(width, height) // 2 + 1):
+        if width % (2 * block_size) == 0 and height % (2 * block_size) == 0:
+            return block_size
+    raise ValueError(
+        f"No block size >= {2 * radius} tiles a {height}x{width} grid into an even "
+        f"number of blocks per side; use multiples of {4 * radius}"
+    )
+
+
+class SpatialSoup(Soup):
+    """
+    Soup of tapes on a 2-D periodic grid with local interactions.
+
+    Attributes (in addition to Soup's):
+        width, height: Grid dimensions (size = width * height)
+        radius: Interaction radius
+        neighborhood: 'moore' or 'von_neumann'
+        block_size: Side of the blocks of the epoch decomposition; must be
+            at least 2 * radius and tile each side into an even number of
+            blocks
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        tape_length: int = 64,
+        radius: int = 2,
+        neighborhood: str = 'moore',
+        block_size: Optional[int] = None,
+        mutation_rate: float = 0.0,
+        seed: Optional[int] = None,
+        engine: str = 'python',
+        profile: bool = False,
+        pair_cache: int = 0,
+        instruction_set: Union[str, InstructionSet] = 'bff7'
+    ):
+        """
+        Initialize a grid of random tapes.
+
+        Args:
+            width: Grid width in cells
+            height: Grid height in cells
+            tape_length: Length of each tape in bytes
+            radius: Interaction radius
+            neighborhood: One of NEIGHBORHOODS
+            block_size: Block side for run_epoch (None = default_block_size)
+            mutation_rate, seed, engine, profile, pair_cache, instruction_set:
+                As for Soup
+        """
+        self._set_grid(width, height, radius, neighborhood, block_size)
+        super().__init__(
+            size=width * height,
+            tape_length=tape_length,
+            mutation_rate=mutation_rate,
+            seed=seed,
+            engine=engine,
+            profile=profile,
+            pair_cache=pair_cache,
+            instruction_set=instruction_set,
+        )
+
+    def _set_grid(
+        self,
+        width: int,
+        height: int,
+        radius: int,
+        neighborhood: str,
+        block_size: Optional[int]
+    ) -> None:
+        """Validate the grid geometry and precompute the epoch decomposition."""
+        self._offsets = neighbor_offsets(radius, neighborhood)
+        if block_size is None:
+            block_size = default_block_size(width, height, radius)
+        if block_size < 2 * radius:
+            raise ValueError(f"block_size {block_size} < 2 * radius ({2 * radius})")
+        if width % (2 * block_size) or height % (2 * block_size):
+            raise ValueError(
+                f"block_size {block_size} must tile the {height}x{width} grid into an "
+                f"even number of blocks per side"
+            )
+
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.neighborhood = neighborhood
+        self.block_size = block_size
+
+        # Cells grouped by checkerboard phase, then block: shape
+        # (4, blocks per phase, cells per block)
+        cells = np.arange(width * height, dtype=np.int64)
+        block_y, block_x = (cells // width) // block_size, (cells % width) // block_size
+        phase = (block_y % 2) * 2 + block_x % 2
+        block = block_y * (width // block_size) + block_x
+        self._block_cells = cells[np.lexsort((cells, block, phase))].reshape(
+            4, -1, block_size * block_size
+        )
+
+    def _neighbors(self, cells: np.ndarray, choices: np.ndarray) -> np.ndarray:
+        """Row indices of the neighbours ``choices`` (offset indices) of ``cells``."""
+        dy, dx = self._offsets[choices, 0], self._offsets[choices, 1]
+        y = (cells // self.width + dy) % self.height
+        x = (cells % self.width + dx) % self.width
+        return y * self.width + x
+
+    def _draw_pair(self) -> Tuple[int, int]:
+        """Draw a random cell and a random neighbour of it."""
+        idx1 = self._rng.randint(0, self.size - 1)
+        choice = self._rng.randint(0, self._offsets.shape[0] - 1)
+        idx2 = self._neighbors(np.int64(idx1), choice)
+        return idx1, int(idx2)
+
+    def select_epoch_pairs(
+        self,
+        max_ops: int = 10000,
+        timeout_prob: float = 0.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw one epoch of local pairs in checkerboard block order.
+
+        All draws come from one generator seeded from the soup's RNG: the
+        order of the cells within each block, then each cell's neighbour,
+        then one timeout budget per pair.
+
+        Args:
+            max_ops: Maximum operations per interaction
+            timeout_prob: Probability of random timeout per operation
+
+        Returns:
+            Tuple of (idx1, idx2, budgets) int64 arrays of length size,
+            ordered by phase, then block, then position within the block
+            (run_epoch executes them in this order, blocks of one phase
+            concurrently)
+        """
+        generator = np.random.default_rng(self._rng.getrandbits(64))
+        idx1 = generator.permuted(self._block_cells, axis=2).ravel()
+        choices = generator.integers(self._offsets.shape[0], size=self.size)
+        idx2 = self._neighbors(idx1, choices)
+
+        if timeout_prob > 0:
+            budgets = generator.geometric(timeout_prob, size=self.size) - 1
+            budgets = np.minimum(budgets, max_ops).astype(np.int64)
+        else:
+            budgets = np.full(self.size, max_ops, dtype=np.int64)
+
+        return idx1, idx2, budgets
+
+    def _run_epoch_pairs(
+        self,
+        idx1: np.ndarray,
+        idx2: np.ndarray,
+        budgets: np.ndarray,
+        max_ops: int,
+        ops: np.ndarray,
+        flags: np.ndarray
+    ) -> None:
+        """Run the four checkerboard phases, blocks of each phase in parallel."""
+        shape = self._block_cells.shape
+        idx1, idx2, budgets, ops, flags = (
+            array.reshape(shape) for array in (idx1, idx2, budgets, ops, flags)
+        )
+        for phase in range(shape[0]):
+            self._kernels.run_pair_groups(
+                self.arena, idx1[phase], idx2[phase], budgets[phase], max_ops,
+                ops[phase], flags[phase]
+            )
+
+    def epoch_groups(self) -> Tuple[int, int, int]:
+        """Epochs run as (checkerboard phases, blocks per phase, cells per block)."""
+        return self._block_cells.shape
+
+    def grid(self) -> np.ndarray:
+        """
+        The arena as a (height, width, tape_length) view.
+
+        Returns:
+            uint8 array sharing memory with ``arena``
+        """
+        return self.arena.reshape(self.height, self.width, self.tape_length)
+
+    def fingerprint_grid(self) -> np.ndarray:
+        """
+        Tape fingerprints laid out on the grid (e.g. to map replicator waves).
+
+        Returns:
+            uint64 array of shape (height, width) (a copy)
+        """
+        return self.get_fingerprints().reshape(self.height, self.width)
+
+    def get_metadata(self) -> Dict:
+        """Soup metadata plus the grid geometry."""
+        metadata = super().get_metadata()
+        metadata.update({
+            'width': self.width,
+            'height': self.height,
+            'radius': self.radius,
+            'neighborhood': self.neighborhood,
+            'block_size': self.block_size,
+        })
+        return metadata
+
+    @classmethod
+    def from_arena(cls, metadata: Dict, arena: np.ndarray) -> 'SpatialSoup':
+        """
+        Restore a spatial soup from metadata and an arena array.
+
+        Args:
+            metadata: Dictionary from get_metadata() (or get_state())
+            arena: uint8 array of shape (size, tape_length), used in place
+
+        Returns:
+            Reconstructed SpatialSoup
+        """
+        soup = super().from_arena(metadata, arena)
+        soup._set_grid(
+            metadata['width'], metadata['height'], metadata['radius'],
+            metadata['neighborhood'], metadata['block_size']
+        )
+        return soup
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"SpatialSoup(grid={self.height}x{self.width}, tape_length={self.tape_length}, "
+            f"radius={self.radius}, neighborhood={self.neighborhood!r}, "
+            f"engine={self.engine!r}, interactions={self.interaction_count}, "
+            f"unique_tapes={self.count_unique_tapes()})"
+        )
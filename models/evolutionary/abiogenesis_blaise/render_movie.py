@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+BFF Soup Movies
+
+Render a soup's history as an animated GIF or a directory of PNG frames,
+from a snapshot file written by run_experiment.py (``--snapshot-every``)
+or from a series of binary checkpoints. Rows are tapes, columns are
+bytes; instruction bytes are highlighted by action (analysis.movie).
+
+Usage:
+    python render_movie.py experiments/run_<ts>.snap -o movie.gif --workers 4
+    python render_movie.py ckpts/ -o frames/ --family-sort --columns 8 --scale 2
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import time
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.instruction_set import INSTRUCTION_SETS
+from analysis.movie import frame_refs, render_movie
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="Render a BFF soup movie from snapshots or checkpoints",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        'sources', nargs='+',
+        help='A .snap file, a directory of .ckpt files, or files in movie order'
+    )
+    parser.add_argument(
+        '--output', '-o', type=str, required=True,
+        help='Output .gif file, or a directory for PNG frames'
+    )
+    parser.add_argument(
+        '--fps', type=float, default=20,
+        help='GIF frame rate'
+    )
+    parser.add_argument(
+        '--step', type=int, default=1,
+        help='Render every STEP-th frame'
+    )
+    parser.add_argument(
+        '--family-sort', action='store_true',
+        help='Group tapes by replicator family in every frame'
+    )
+    parser.add_argument(
+        '--columns', type=int, default=1,
+        help='Side-by-side columns of tapes (must divide the soup size)'
+    )
+    parser.add_argument(
+        '--scale', type=int, default=1,
+        help='Pixels per byte'
+    )
+    parser.add_argument(
+        '--instruction-set', choices=sorted(INSTRUCTION_SETS), default=None,
+        help='Instruction set of the soup (default: recorded with the sources)'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=0,
+        help='Worker processes (0 = render in this process)'
+    )
+
+    args = parser.parse_args()
+
+    frames = len(frame_refs(args.sources, step=args.step))
+    print(f"Rendering {frames} frames...")
+    start = time.perf_counter()
+    output = render_movie(
+        args.sources, args.output, fps=args.fps, step=args.step,
+        family_sort=args.family_sort, columns=args.columns, scale=args.scale,
+        instruction_set=args.instruction_set, workers=args.workers
+    )
+    print(f"🎞️  Movie saved to: {output} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
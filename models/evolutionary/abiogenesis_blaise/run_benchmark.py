@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+BFF Throughput Benchmarks
+
+Reproducible interactions/sec, ops/sec and peak-memory measurements for
+the soup engines, compared against a committed baseline
+(benchmarks/baseline.json). Cases cover random soups (pre-transition,
+short interactions), a soup seeded with a hand-built replicator
+(post-transition, long copy loops), several soup sizes and tape
+lengths, mutation on and off, both schedules and both engines.
+
+Every case uses fixed seeds, so the same work is timed on every run.
+Throughput is the best of ``repeats`` timed runs, after an untimed
+warm-up that loads or compiles the kernels. Peak memory is the
+tracemalloc peak of a separate run (numpy allocations included).
+
+Interpreter or soup optimizations should quote the comparison printed
+by this script before and after the change; refresh the baseline with
+``--save-baseline`` when a change is merged.
+
+Usage:
+    python run_benchmark.py                          # all cases vs baseline
+    python run_benchmark.py --quick --cases random-1k-64 seeded-1k-64
+    python run_benchmark.py --save-baseline          # overwrite the baseline
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.soup import Soup
+
+
+BASELINE_PATH = Path(__file__).parent / "benchmarks" / "baseline.json"
+
+# Copies the whole tape into its partner: find the tape's trailing zero,
+# step into the partner and copy byte by byte until the zero is copied
+REPLICATOR_PROGRAM = b'[>]>,[>,]'
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """
+    One benchmark configuration.
+
+    Attributes:
+        name: Case identifier (key in results and baseline)
+        soup_size: Number of tapes
+        tape_length: Bytes per tape
+        interactions: Pair interactions per timed run (rounded to whole
+            epochs for the 'epoch' schedule)
+        mutation_rate: Per-byte mutation probability per interaction
+        seeded_fraction: Fraction of tapes replaced by the replicator
+        schedule: 'run' (random pairs) or 'epoch' (disjoint pairs)
+        engine: Soup engine
+        max_ops: Operation limit per interaction
+    """
+    name: str
+    soup_size: int
+    tape_length: int
+    interactions: int
+    mutation_rate: float = 0.0
+    seeded_fraction: float = 0.0
+    schedule: str = 'run'
+    engine: str = 'numba'
+    max_ops: int = 2 ** 13
+
+
+DEFAULT_CASES = (
+    BenchmarkCase('random-1k-64', 1024, 64, 200_000),
+    BenchmarkCase('random-1k-128', 1024, 128, 100_000),
+    BenchmarkCase('random-8k-64', 8192, 64, 200_000),
+    BenchmarkCase('random-1k-64-mutation', 1024, 64, 20_000, mutation_rate=1e-5),
+    BenchmarkCase('random-8k-64-epoch', 8192, 64, 204_800, schedule='epoch'),
+    BenchmarkCase('seeded-1k-64', 1024, 64, 100_000, seeded_fraction=0.5),
+    BenchmarkCase('seeded-1k-64-mutation', 1024, 64, 20_000, mutation_rate=1e-5,
+                  seeded_fraction=0.5),
+    BenchmarkCase('python-random-256-64', 256, 64, 2_000, engine='python'),
+)
+
+
+def replicator_tape(tape_length: int) -> bytes:
+    """The hand-built replicator padded with no-ops to ``tape_length``."""
+    return REPLICATOR_PROGRAM.ljust(tape_length - 1, b'a') + b'\x00'
+
+
+def build_soup(case: BenchmarkCase, seed: int = 0) -> Soup:
+    """Create the case's initial soup (deterministic for a given seed)."""
+    soup = Soup(
+        size=case.soup_size, tape_length=case.tape_length,
+        mutation_rate=case.mutation_rate, seed=seed, engine=case.engine
+    )
+    copies = int(round(case.seeded_fraction * case.soup_size))
+    if copies:
+        soup.arena[:copies] = np.frombuffer(replicator_tape(case.tape_length), dtype=np.uint8)
+        soup.refresh_fingerprints()
+    return soup
+
+
+def run_workload(soup: Soup, case: BenchmarkCase, interactions: int) -> int:
+    """
+    Run ``interactions`` interactions on the case's schedule.
+
+    Returns:
+        Total operations executed
+    """
+    if case.schedule == 'epoch':
+        ops = 0
+        for _ in range(max(1, interactions // (case.soup_size // 2))):
+            ops += soup.run_epoch(max_ops=case.max_ops, results='stats').ops_sum
+        return ops
+    return soup.run(interactions, max_ops=case.max_ops, results='stats').ops_sum
+
+
+def run_case(case: BenchmarkCase, repeats: int = 3, scale: float = 1.0) -> Dict:
+    """
+    Measure one case.
+
+    Args:
+        case: BenchmarkCase to run
+        repeats: Timed runs (the fastest is reported)
+        scale: Multiplier on the case's interaction count
+
+    Returns:
+        Dict of the case configuration and interactions, operations,
+        seconds, interactions_per_sec, ops_per_sec and peak_memory_bytes
+    """
+    interactions = max(1, int(case.interactions * scale))
+    if case.schedule == 'epoch':
+        interactions = max(1, interactions // (case.soup_size // 2)) * (case.soup_size // 2)
+
+    # Warm-up: load or compile the kernels this case uses
+    run_workload(build_soup(case), case, min(interactions, case.soup_size))
+
+    best = None
+    operations = 0
+    for _ in range(repeats):
+        soup = build_soup(case)
+        start = time.perf_counter()
+        operations = run_workload(soup, case, interactions)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        run_workload(build_soup(case), case, interactions)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        **asdict(case),
+        'interactions': interactions,
+        'operations': operations,
+        'seconds': best,
+        'interactions_per_sec': interactions / best,
+        'ops_per_sec': operations / best,
+        'peak_memory_bytes': peak,
+    }
+
+
+def environment() -> Dict:
+    """Interpreter, library and machine details stored with results."""
+    try:
+        import numba
+        numba_version = numba.__version__
+    except ImportError:
+        numba_version = None
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'numba': numba_version,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run_benchmarks(
+    cases: List[BenchmarkCase] = DEFAULT_CASES,
+    repeats: int = 3,
+    scale: float = 1.0,
+    verbose: bool = True
+) -> Dict:
+    """
+    Run benchmark cases.
+
+    Returns:
+        Dict with 'timestamp', 'environment' and 'cases' (name -> run_case result)
+    """
+    results = {}
+    for case in cases:
+        if verbose:
+            print(f"  {case.name:<24}", end='', flush=True)
+        results[case.name] = run_case(case, repeats=repeats, scale=scale)
+        if verbose:
+            r = results[case.name]
+            print(f"{r['interactions_per_sec']:>12,.0f} int/s {r['ops_per_sec'] / 1e6:>9.1f} Mops/s "
+                  f"{r['peak_memory_bytes'] / 2**20:>8.1f} MiB")
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment(),
+        'cases': results,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """
+    Compare results with a baseline, case by case.
+
+    Throughput ratios are current / baseline; memory ratios likewise. A
+    case regresses when interactions/sec falls below ``1 - tolerance``
+    times the baseline or peak memory exceeds ``1 + tolerance`` times it.
+
+    Args:
+        results: Output of run_benchmarks
+        baseline: Earlier output of run_benchmarks
+        tolerance: Allowed relative slowdown / memory growth
+
+    Returns:
+        One dict per case present in both: name, interactions_ratio,
+        ops_ratio, memory_ratio, regression
+    """
+    rows = []
+    for name, current in results['cases'].items():
+        reference = baseline['cases'].get(name)
+        if reference is None:
+            continue
+        interactions_ratio = current['interactions_per_sec'] / reference['interactions_per_sec']
+        memory_ratio = current['peak_memory_bytes'] / max(reference['peak_memory_bytes'], 1)
+        rows.append({
+            'name': name,
+            'interactions_ratio': interactions_ratio,
+            'ops_ratio': current['ops_per_sec'] / max(reference['ops_per_sec'], 1e-9),
+            'memory_ratio': memory_ratio,
+            'regression': interactions_ratio < 1 - tolerance or memory_ratio > 1 + tolerance,
+        })
+    return rows
+
+
+def load_results(path: Path) -> Optional[Dict]:
+    """Load a results JSON file, or None if it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(results: Dict, path: Path) -> Path:
+    """Write results as JSON, creating the parent directory."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="BFF soup throughput benchmarks",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        '--cases', nargs='+', metavar='NAME',
+        choices=[case.name for case in DEFAULT_CASES],
+        help='Cases to run (default: all)'
+    )
+    parser.add_argument(
+        '--repeats', type=int, default=3,
+        help='Timed runs per case (fastest reported)'
+    )
+    parser.add_argument(
+        '--quick', action='store_true',
+        help='Run a tenth of each case\'s interactions'
+    )
+    parser.add_argument(
+        '--baseline', type=str, default=str(BASELINE_PATH),
+        help='Baseline results JSON'
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25,
+        help='Relative slowdown (or memory growth) reported as a regression'
+    )
+    parser.add_argument(
+        '--save-baseline', action='store_true',
+        help='Write the results to the baseline path instead of comparing'
+    )
+    parser.add_argument(
+        '--output', '-o', type=str, default=None,
+        help='Results JSON path (default: experiments/benchmark_<timestamp>.json)'
+    )
+
+    args = parser.parse_args()
+
+    cases = [case for case in DEFAULT_CASES if args.cases is None or case.name in args.cases]
+    print(f"Running {len(cases)} benchmark cases ({args.repeats} repeats"
+          f"{', quick' if args.quick else ''})...")
+    results = run_benchmarks(cases, repeats=args.repeats, scale=0.1 if args.quick else 1.0)
+
+    if args.save_baseline:
+        print(f"\nBaseline saved to: {save_results(results, args.baseline)}")
+        return
+
+    output = args.output or (
+        Path(__file__).parent / "experiments" / f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"\n📊 Results saved to: {save_results(results, output)}")
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    rows = compare(results, baseline, tolerance=args.tolerance)
+    print(f"\nVs baseline ({baseline['timestamp']}, {baseline['environment']['cpu_count']} CPUs):")
+    print(f"  {'case':<24}{'int/s':>8}{'ops/s':>8}{'memory':>8}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"  {row['name']:<24}{row['interactions_ratio']:>7.2f}x{row['ops_ratio']:>7.2f}x"
+              f"{row['memory_ratio']:>7.2f}x{flag}")
+    if any(row['regression'] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
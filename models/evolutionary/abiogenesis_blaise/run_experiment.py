@@ -8,20 +8,46 @@ Saves results and creates basic visualizations.
 Usage:
     python run_experiment.py
     python run_experiment.py --interactions 100000 --seed 42
+    python run_experiment.py --engine python   # reference interpreter
+    python run_experiment.py --soup-size 262144 --workers 16
+    python run_experiment.py --trace           # save per-interaction records
+    python run_experiment.py --profile         # per-opcode/loop/heatmap counters
+    python run_experiment.py --snapshot-every 0  # no soup snapshots for replay
+    python run_experiment.py --provenance      # log who met whom (analysis.provenance)
+    python run_experiment.py --pair-cache 65536  # memoize repeated pairings
+    python run_experiment.py --zoo experiments/zoo.sqlite  # catalog replicators
+    python run_experiment.py --instruction-set bff  # two-head BFF opcodes
+    python run_experiment.py --stop-on-transition  # end once the transition is detected
+    python run_experiment.py --resume experiments/checkpoints/run_<ts>.ckpt
 """
 
 import sys
 from pathlib import Path
 import argparse
+import contextlib
 import time
 import json
-from collections import Counter
 import numpy as np
 
 # Add core to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.soup import Soup
+from core.soup import Soup, ENGINES
+from core.instruction_set import INSTRUCTION_SETS
+from core.shared_soup import SharedSoupRunner
+from core.results import InteractionRecords
+from core.checkpoint import save_checkpoint, load_checkpoint
+from core.recorder import SnapshotRecorder
+from core.provenance import ProvenanceLog
+from analysis.replicators import ReplicatorTracker
+from analysis.complexity import ComplexityTracker
+from analysis.changepoint import TransitionDetector
+from analysis.zoo import ReplicatorZoo
+
+
+def _crossed(before: int, after: int, interval: int) -> bool:
+    """True if a multiple of ``interval`` lies in (before, after]."""
+    return after // interval > before // interval
 
 
 def run_experiment(
@@ -31,9 +57,81 @@ def run_experiment(
     mutation_rate: float = 0.0,
     seed: int = 42,
     batch_size: int = 1000,
-    sample_interval: int = 1000
+    sample_interval: int = 1000,
+    engine: str = 'numba',
+    epochs: bool = False,
+    workers: int = 0,
+    trace: bool = False,
+    checkpoint_every: int = 100_000,
+    resume: str = None,
+    replicator_interval: int = 5000,
+    profile: bool = False,
+    snapshot_every: int = 1000,
+    provenance: bool = False,
+    pair_cache: int = 0,
+    zoo: str = None,
+    instruction_set: str = 'bff7',
+    stop_on_transition: bool = False
 ):
-    """Run the BFF experiment with specified parameters."""
+    """
+    Run the BFF experiment with specified parameters.
+
+    A binary checkpoint is written every ``checkpoint_every`` interactions
+    (0 disables). With ``resume`` set to such a checkpoint, the run's saved
+    configuration replaces the other arguments and the simulation continues
+    bit-exactly from the saved soup and RNG state.
+
+    Every ``replicator_interval`` interactions (0 disables) the soup is
+    clustered into replicator families (analysis.replicators) and their
+    abundance is recorded in the metrics.
+
+    With ``profile`` the interpreter counts executed opcodes, loop
+    iterations and tape reads/writes; the summary goes to the metrics.
+
+    Every ``snapshot_every`` interactions (0 disables) the whole soup is
+    appended to ``run_<ts>.snap`` for replay with core.recorder.SnapshotReader.
+
+    With ``provenance`` every interaction is logged to ``run_<ts>.prov``
+    (core.provenance) for transmission analysis (analysis.provenance).
+
+    ``pair_cache`` > 0 memoizes up to that many pair outcomes (see
+    Soup.interact_pair); it pays off once the soup has collapsed to a few
+    distinct tapes. With the numba engine it replaces the compiled batch
+    paths by per-pair execution, which is several times slower before then.
+
+    With ``zoo`` set to a SQLite file, the soup's replicators are added to
+    that catalog (analysis.zoo) every ``replicator_interval`` interactions
+    and at the end of the run.
+
+    ``instruction_set`` selects the opcode table (core.instruction_set),
+    e.g. 'bff' for the two-head variant of the original paper.
+
+    The phase transition is detected online (analysis.changepoint) from
+    every interaction's operation count and the sampled diversity; with
+    ``stop_on_transition`` the run ends as soon as it is declared.
+    """
+
+    resumed = None
+    if resume is not None:
+        soup, resumed = load_checkpoint(resume)
+        config = resumed['config']
+        soup_size = config['soup_size']
+        tape_length = config['tape_length']
+        mutation_rate = config['mutation_rate']
+        seed = config['seed']
+        engine = config['engine']
+        epochs = config['epochs']
+        workers = config['workers']
+        total_interactions = config['total_interactions']
+        batch_size = config['batch_size']
+        sample_interval = config['sample_interval']
+        replicator_interval = config['replicator_interval']
+        snapshot_every = config.get('snapshot_every', 0)
+        provenance = config.get('provenance', False)
+        pair_cache = soup.pair_cache
+        zoo = config.get('zoo', zoo)
+        instruction_set = soup.instruction_set.name
+        stop_on_transition = config.get('stop_on_transition', False)
 
     print("="*70)
     print("BFF ABIOGENESIS EXPERIMENT")
@@ -44,69 +142,266 @@ def run_experiment(
     print(f"  Total interactions: {total_interactions:,}")
     print(f"  Mutation rate: {mutation_rate}")
     print(f"  Random seed: {seed}")
+    print(f"  Engine: {engine}")
+    print(f"  Instruction set: {instruction_set}")
+    print(f"  Scheduling: {'epochs of disjoint pairs' if epochs or workers else 'random pairs'}")
+    if workers:
+        print(f"  Worker processes: {workers} (shared-memory arena)")
     print(f"  Zero mutation evolution: {mutation_rate == 0.0}")
 
-    # Initialize soup
-    print(f"\nInitializing primordial soup...")
-    soup = Soup(
-        size=soup_size,
-        tape_length=tape_length,
-        mutation_rate=mutation_rate,
-        seed=seed
-    )
+    config = {
+        'soup_size': soup_size,
+        'tape_length': tape_length,
+        'mutation_rate': mutation_rate,
+        'seed': seed,
+        'engine': engine,
+        'epochs': epochs or workers > 0,
+        'workers': workers,
+        'total_interactions': total_interactions,
+        'batch_size': batch_size,
+        'sample_interval': sample_interval,
+        'replicator_interval': replicator_interval,
+        'snapshot_every': snapshot_every,
+        'provenance': provenance and workers == 0,
+        'pair_cache': pair_cache,
+        'zoo': zoo,
+        'instruction_set': instruction_set,
+        'stop_on_transition': stop_on_transition,
+    }
+
+    if resumed is not None:
+        print(f"\nResuming from {resume} at interaction {soup.interaction_count:,}")
+        timestamp = resumed['timestamp']
+        time_series = resumed['time_series']
+        transition_detected = resumed['transition_detected']
+        transition_point = resumed['transition_point']
+        if 'transition_detector' in resumed:
+            transition_detector = TransitionDetector.from_state(resumed['transition_detector'])
+        else:
+            transition_detector = TransitionDetector()
+        elapsed_before = resumed['runtime_seconds']
+        tracker = ReplicatorTracker.from_state(resumed['replicator_tracker'])
+    else:
+        # Initialize soup
+        print(f"\nInitializing primordial soup...")
+        soup = Soup(
+            size=soup_size,
+            tape_length=tape_length,
+            mutation_rate=mutation_rate,
+            seed=seed,
+            engine=engine,
+            profile=profile,
+            pair_cache=pair_cache,
+            instruction_set=instruction_set
+        )
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        time_series = {
+            'sampled_interactions': [],
+            'sampled_ops_mean': [],
+            'sampled_ops_max': [],
+            'sampled_diversity': [],
+            'sampled_high_order_entropy': [],
+        }
+        transition_detected = False
+        transition_point = None
+        transition_detector = TransitionDetector()
+        elapsed_before = 0.0
+        tracker = ReplicatorTracker(instruction_set=soup.instruction_set)
     print(f"  Initial diversity: {soup.get_diversity():.4f}")
     print(f"  Initial unique tapes: {soup.count_unique_tapes()}/{soup_size}")
 
     # Prepare tracking
     num_batches = total_interactions // batch_size
-    sampled_interactions = []
-    sampled_ops_mean = []
-    sampled_ops_max = []
-    sampled_diversity = []
+    sampled_interactions = time_series['sampled_interactions']
+    sampled_ops_mean = time_series['sampled_ops_mean']
+    sampled_ops_max = time_series['sampled_ops_max']
+    sampled_diversity = time_series['sampled_diversity']
+    sampled_high_order_entropy = time_series.setdefault('sampled_high_order_entropy', [])
+    complexity = ComplexityTracker()
 
-    transition_detected = False
-    transition_point = None
+    results_dir = Path(__file__).parent / "experiments"
+    checkpoint_dir = results_dir / "checkpoints"
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = checkpoint_dir / f"run_{timestamp}.ckpt"
+
+    # Soup snapshots for replay; a resumed run drops frames newer than its checkpoint
+    recorder = None
+    if snapshot_every:
+        snapshot_path = results_dir / f"run_{timestamp}.snap"
+        recorder = SnapshotRecorder(
+            snapshot_path, soup.size, soup.tape_length,
+            extra={'config': config}, append=resumed is not None
+        )
+        if resumed is not None:
+            recorder.truncate(soup.interaction_count)
+        else:
+            recorder.record(soup)
+
+    # Interaction provenance log (not available with shared-memory workers)
+    if provenance and workers > 0:
+        print("  Provenance logging is not supported with --workers; running without it")
+    elif provenance:
+        provenance_path = results_dir / f"run_{timestamp}.prov"
+        soup.provenance = ProvenanceLog(
+            provenance_path, soup.size,
+            start_interaction=soup.interaction_count, append=resumed is not None
+        )
+        if resumed is not None:
+            soup.provenance.truncate(soup.interaction_count)
+
+    # Replicator catalog shared across runs (resumed runs keep their run id)
+    replicator_zoo = None
+    if zoo is not None:
+        replicator_zoo = ReplicatorZoo(zoo)
+        zoo_run_id = replicator_zoo.start_run(f"run_{timestamp}", config, seed=seed)
+
+    def write_checkpoint():
+        """Save soup, RNG state and the run's progress for --resume."""
+        if recorder is not None:
+            recorder.flush()
+        if soup.provenance is not None:
+            soup.provenance.flush()
+        if replicator_zoo is not None:
+            replicator_zoo.flush()
+        save_checkpoint(checkpoint_path, soup, extra={
+            'config': config,
+            'timestamp': timestamp,
+            'time_series': time_series,
+            'transition_detected': transition_detected,
+            'transition_point': transition_point,
+            'transition_detector': transition_detector.get_state(),
+            'runtime_seconds': elapsed_before + time.time() - start_time,
+            'replicator_tracker': tracker.get_state(),
+        })
 
     # Run simulation
     print(f"\nRunning simulation ({num_batches:,} batches of {batch_size})...")
     print("Progress: ", end='', flush=True)
 
     start_time = time.time()
+    start_count = soup.interaction_count
     last_progress_time = start_time
-
-    for batch_num in range(num_batches):
-        # Run batch
-        results = soup.run(num_interactions=batch_size, max_ops=10000)
-
-        # Sample metrics
-        if soup.interaction_count % sample_interval == 0:
-            batch_ops = [r.operations for r in results]
-            sampled_interactions.append(soup.interaction_count)
-            sampled_ops_mean.append(np.mean(batch_ops))
-            sampled_ops_max.append(np.max(batch_ops))
-            sampled_diversity.append(soup.get_diversity())
-
-        # Check for phase transition
-        if not transition_detected and soup.interaction_count % 10000 == 0:
-            if len(sampled_ops_mean) > 10:
-                recent_mean = np.mean(sampled_ops_mean[-10:])
-                if recent_mean > 500:
-                    transition_detected = True
-                    transition_point = soup.interaction_count
-                    print(f"\n🎉 PHASE TRANSITION at {transition_point:,}! ", end='', flush=True)
-
-        # Progress indicator
-        if batch_num % (num_batches // 20) == 0:
-            print("█", end='', flush=True)
-
-        # Status updates
-        if soup.interaction_count % 200000 == 0:
-            elapsed = time.time() - last_progress_time
-            rate = 200000 / elapsed
-            last_progress_time = time.time()
-            print(f"\n[{soup.interaction_count:,}] {rate:.0f} int/sec, ops={sampled_ops_mean[-1]:.1f}, div={soup.get_diversity():.3f} ", end='', flush=True)
-
-    total_time = time.time() - start_time
+    last_progress_count = start_count
+
+    target_interactions = num_batches * batch_size
+    families = []
+    progress_step = max(1, target_interactions // 20)
+
+    # Full per-interaction log (13 bytes each); epochs may overshoot a batch
+    trace_records = None
+    if trace:
+        trace_records = InteractionRecords(target_interactions + batch_size + soup_size)
+
+    # Multi-process mode: arena in shared memory, epochs across workers
+    runner_context = contextlib.nullcontext()
+    if workers > 0 and soup.profile is not None:
+        print("  Profiling is not supported with --workers; running without it")
+        soup.profile = None
+    if workers > 0:
+        runner_context = SharedSoupRunner(soup, num_workers=workers, max_ops=10000)
+
+    # The runner releases its workers and shared memory however the loop exits
+    with runner_context as runner:
+        while soup.interaction_count < target_interactions:
+            before = soup.interaction_count
+
+            # Run batch
+            if runner is not None:
+                # Shared-memory workers report per-epoch ops statistics and per-pair counts
+                epoch_stats = []
+                while sum(e.interactions for e in epoch_stats) < batch_size:
+                    epoch_stats.append(runner.run_epoch())
+                batch_ops_mean = (
+                    sum(e.ops_sum for e in epoch_stats)
+                    / sum(e.interactions for e in epoch_stats)
+                )
+                batch_ops_max = max(e.ops_max for e in epoch_stats)
+                transition_detector.update_ops(
+                    np.concatenate([e.operations for e in epoch_stats]),
+                    first_interaction=before + 1
+                )
+            else:
+                if epochs:
+                    # Whole epochs of disjoint pairs, at least batch_size interactions
+                    records = InteractionRecords(batch_size + soup_size)
+                    while len(records) < batch_size:
+                        records.extend(soup.run_epoch(max_ops=10000, results='records'))
+                else:
+                    records = soup.run(
+                        num_interactions=batch_size, max_ops=10000, results='records'
+                    )
+                batch_ops = records.operations
+                batch_ops_mean = float(np.mean(batch_ops))
+                batch_ops_max = int(np.max(batch_ops))
+                if trace_records is not None:
+                    trace_records.extend(records)
+                transition_detector.update_ops(batch_ops, first_interaction=before + 1)
+
+            after = soup.interaction_count
+
+            # Sample metrics
+            if _crossed(before, after, sample_interval):
+                sampled_interactions.append(soup.interaction_count)
+                sampled_ops_mean.append(batch_ops_mean)
+                sampled_ops_max.append(batch_ops_max)
+                sampled_diversity.append(soup.get_diversity())
+                sampled_high_order_entropy.append(complexity.update(soup.arena).high_order_entropy)
+                transition_detector.update_diversity(sampled_diversity[-1], soup.interaction_count)
+
+            if recorder is not None and _crossed(before, after, snapshot_every):
+                recorder.record(soup)
+
+            # Replicator families (shared instruction-bearing substrings)
+            if replicator_interval and _crossed(before, after, replicator_interval):
+                families = tracker.update(soup.arena, soup.interaction_count)
+                if replicator_zoo is not None:
+                    replicator_zoo.ingest(
+                        zoo_run_id, soup.arena, soup.interaction_count, soup.instruction_set
+                    )
+
+            # Check for phase transition
+            transition = transition_detector.transition
+            if not transition_detected and transition is not None:
+                transition_detected = True
+                transition_point = transition.position
+                print(f"\n🎉 PHASE TRANSITION at {transition_point:,} "
+                      f"(confidence {transition.confidence:.3f})! ", end='', flush=True)
+                if stop_on_transition:
+                    break
+
+            # Progress indicator
+            if _crossed(before, after, progress_step):
+                print("█", end='', flush=True)
+
+            # Periodic checkpoint
+            if checkpoint_every and _crossed(before, after, checkpoint_every):
+                write_checkpoint()
+
+            # Status updates
+            if _crossed(before, after, 200000):
+                elapsed = time.time() - last_progress_time
+                rate = (soup.interaction_count - last_progress_count) / elapsed
+                last_progress_time = time.time()
+                last_progress_count = soup.interaction_count
+                print(f"\n[{soup.interaction_count:,}] {rate:.0f} int/sec, ops={sampled_ops_mean[-1]:.1f}, div={soup.get_diversity():.3f}, hoe={sampled_high_order_entropy[-1]:.3f} ", end='', flush=True)
+
+    if checkpoint_every:
+        write_checkpoint()
+    if recorder is not None:
+        num_snapshots = len(recorder)
+        recorder.close()
+    if soup.provenance is not None:
+        num_provenance = len(soup.provenance)
+        soup.provenance.close()
+    if replicator_zoo is not None:
+        replicator_zoo.ingest(
+            zoo_run_id, soup.arena, soup.interaction_count, soup.instruction_set
+        )
+        replicator_zoo.close()
+    run_time = time.time() - start_time
+    total_time = elapsed_before + run_time
+
+    final_complexity = complexity.update(soup.arena)
 
     print("\n\n" + "="*70)
     print("SIMULATION COMPLETE")
@@ -115,75 +410,117 @@ def run_experiment(
     # Final statistics
     print(f"\nPerformance:")
     print(f"  Total time: {total_time/60:.1f} minutes ({total_time:.1f} seconds)")
-    print(f"  Average speed: {total_interactions/total_time:.1f} interactions/second")
+    print(f"  Average speed: {(soup.interaction_count - start_count)/run_time:.1f} interactions/second")
+    if soup.pair_cache:
+        cache_info = soup.pair_cache_info()
+        print(f"  Pair cache: {cache_info['hit_rate']:.1%} hits "
+              f"({cache_info['entries']:,}/{cache_info['capacity']:,} entries)")
 
     print(f"\nFinal state:")
     print(f"  Diversity: {soup.get_diversity():.4f}")
+    print(f"  High-order entropy: {final_complexity.high_order_entropy:.4f} bits/byte")
     print(f"  Unique tapes: {soup.count_unique_tapes()}/{soup_size}")
 
-    if transition_detected:
+    transition = transition_detector.transition
+    if transition_detected and transition is not None:
+        print(f"\n✅ Phase transition detected at interaction {transition_point:,} "
+              f"(confidence {transition.confidence:.3f}, alarm at {transition.detected_at:,})")
+        print(f"   Final mean operations: {sampled_ops_mean[-1]:.1f}")
+    elif transition_detected:
         print(f"\n✅ Phase transition detected at interaction {transition_point:,}")
         print(f"   Final mean operations: {sampled_ops_mean[-1]:.1f}")
     else:
         print(f"\n⚠️  No clear phase transition detected")
         print(f"   Maximum mean operations: {max(sampled_ops_mean):.1f}")
 
+    profile_summary = soup.profile_summary()
+    if profile_summary is not None:
+        print(f"\nInstruction profile ({profile_summary['operations']:,} ops):")
+        for op, fraction in sorted(
+            profile_summary['opcode_fractions'].items(), key=lambda item: -item[1]
+        ):
+            print(f"  {op}  {100 * fraction:5.1f}%")
+        print(f"  Loop iterations: {profile_summary['loop_iterations']:,}")
+
     # Analyze population
-    tape_hashes = soup.get_tape_hashes()
-    hash_counts = Counter(tape_hashes)
+    top_replicators = soup.top_replicators(10)
 
     print(f"\nPopulation analysis:")
-    print(f"  Unique tapes: {len(hash_counts)}")
+    print(f"  Unique tapes: {soup.count_unique_tapes()}")
 
-    if len(hash_counts) > 0:
-        top1_count = hash_counts.most_common(1)[0][1]
+    if top_replicators:
+        top1_count = top_replicators[0][1]
         top1_frac = top1_count / soup_size
         print(f"  Dominant replicator: {top1_count} copies ({100*top1_frac:.1f}%)")
 
         print(f"\n  Top 10 replicators:")
-        for rank, (hash_val, count) in enumerate(hash_counts.most_common(10), 1):
+        for rank, (fingerprint, count, _) in enumerate(top_replicators, 1):
             pct = 100 * count / soup_size
-            print(f"    #{rank}: {count:4d} copies ({pct:5.1f}%) - {hash_val[:16]}...")
+            print(f"    #{rank}: {count:4d} copies ({pct:5.1f}%) - {fingerprint:016x}")
+
+    if replicator_interval and not (
+        tracker.history and tracker.history[-1][0] == soup.interaction_count
+    ):
+        families = tracker.update(soup.arena, soup.interaction_count)
+    if families:
+        print(f"\n  Replicator families: {len(families)}")
+        for family in families[:5]:
+            pct = 100 * family.abundance / soup_size
+            print(f"    family {family.family_id}: {family.abundance:4d} tapes ({pct:5.1f}%) "
+                  f"- motif {family.motif!r}")
 
     # Save results
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    results_dir = Path(__file__).parent / "experiments"
-    results_dir.mkdir(exist_ok=True)
-
     # Save metrics
     metrics_path = results_dir / f"run_{timestamp}_metrics.json"
     metrics = {
-        'config': {
-            'soup_size': soup_size,
-            'tape_length': tape_length,
-            'mutation_rate': mutation_rate,
-            'seed': seed,
-            'total_interactions': total_interactions
-        },
+        'config': config,
         'results': {
             'runtime_seconds': total_time,
             'transition_detected': transition_detected,
             'transition_point': transition_point,
+            'transition': transition.to_dict() if transition is not None else None,
             'final_diversity': soup.get_diversity(),
+            'final_complexity': final_complexity.to_dict(),
             'final_unique_count': soup.count_unique_tapes(),
         },
-        'time_series': {
-            'sampled_interactions': sampled_interactions,
-            'sampled_ops_mean': sampled_ops_mean,
-            'sampled_ops_max': sampled_ops_max,
-            'sampled_diversity': sampled_diversity,
-        }
+        'time_series': time_series
     }
+    if profile_summary is not None:
+        metrics['profile'] = profile_summary
+    if soup.pair_cache:
+        metrics['pair_cache'] = soup.pair_cache_info()
+    if replicator_interval:
+        interactions, family_ids, counts = tracker.abundance()
+        metrics['replicator_families'] = {
+            'interactions': interactions.tolist(),
+            'family_ids': family_ids.tolist(),
+            'abundance': counts.tolist(),
+            'motifs': {str(fid): motif.hex() for fid, motif in tracker.motifs.items()},
+        }
 
     with open(metrics_path, 'w') as f:
         json.dump(metrics, f, indent=2)
 
     print(f"\n📊 Metrics saved to: {metrics_path}")
 
-    # Save final state
-    checkpoint_dir = results_dir / "checkpoints"
-    checkpoint_dir.mkdir(exist_ok=True)
+    if trace_records is not None:
+        trace_path = results_dir / f"run_{timestamp}_trace.npy"
+        np.save(trace_path, trace_records.data)
+        print(f"🧾 Interaction trace saved to: {trace_path}")
 
+    if recorder is not None:
+        print(f"🎞️  Soup snapshots saved to: {snapshot_path} ({num_snapshots} frames)")
+
+    if config['provenance']:
+        print(f"🧬 Provenance log saved to: {provenance_path} ({num_provenance:,} records)")
+
+    if zoo is not None:
+        print(f"🦠 Replicators cataloged in: {zoo}")
+
+    if checkpoint_every:
+        print(f"💾 Binary checkpoint saved to: {checkpoint_path}")
+
+    # Save final state
     state_path = checkpoint_dir / f"run_{timestamp}_final.json"
     with open(state_path, 'w') as f:
         json.dump(soup.get_state(), f)
@@ -229,6 +566,69 @@ def main():
         '--batch-size', '-b', type=int, default=1000,
         help='Interactions per batch'
     )
+    parser.add_argument(
+        '--engine', choices=ENGINES, default='numba',
+        help='Interpreter engine (numba kernel or reference python interpreter)'
+    )
+    parser.add_argument(
+        '--instruction-set', choices=sorted(INSTRUCTION_SETS), default='bff7',
+        help='Opcode table (bff7: this experiment; bff: two-head BFF with { } .)'
+    )
+    parser.add_argument(
+        '--epochs', action='store_true',
+        help='Run epochs of disjoint pairs (parallel across cores with numba)'
+    )
+    parser.add_argument(
+        '--workers', '-w', type=int, default=0,
+        help='Worker processes sharing the soup arena (0 = single process); '
+             'implies --epochs, for soups of 64k+ tapes'
+    )
+    parser.add_argument(
+        '--trace', action='store_true',
+        help='Save every interaction (ops, idx1, idx2, flags) to run_<ts>_trace.npy '
+             '(single-process mode only)'
+    )
+    parser.add_argument(
+        '--checkpoint-every', type=int, default=100_000,
+        help='Write a binary checkpoint every N interactions (0 = off)'
+    )
+    parser.add_argument(
+        '--resume', type=str, default=None, metavar='CHECKPOINT',
+        help='Continue a run bit-exactly from a binary checkpoint '
+             '(its saved configuration overrides the other options)'
+    )
+    parser.add_argument(
+        '--replicator-interval', type=int, default=5000,
+        help='Track replicator families every N interactions (0 = off)'
+    )
+    parser.add_argument(
+        '--snapshot-every', type=int, default=1000,
+        help='Append the whole soup to run_<ts>.snap every N interactions (0 = off)'
+    )
+    parser.add_argument(
+        '--provenance', action='store_true',
+        help='Log every interaction (idx1, idx2, ops, flags) to run_<ts>.prov '
+             '(single-process mode only)'
+    )
+    parser.add_argument(
+        '--pair-cache', type=int, default=0,
+        help='Memoize up to N pair outcomes (LRU; 0 = off). Pays off after the '
+             'transition, when few distinct tapes remain; with the numba engine it '
+             'disables the compiled batch paths, which is several times slower before'
+    )
+    parser.add_argument(
+        '--zoo', type=str, default=None, metavar='SQLITE',
+        help='Add replicators seen during the run to this SQLite catalog '
+             '(every --replicator-interval interactions)'
+    )
+    parser.add_argument(
+        '--stop-on-transition', action='store_true',
+        help='End the run as soon as the phase transition is detected'
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='Profile opcodes, loops and tape reads/writes (slower; not with --workers)'
+    )
 
     args = parser.parse_args()
 
@@ -239,7 +639,21 @@ def main():
         tape_length=args.tape_length,
         mutation_rate=args.mutation_rate,
         seed=args.seed,
-        batch_size=args.batch_size
+        batch_size=args.batch_size,
+        engine=args.engine,
+        epochs=args.epochs,
+        workers=args.workers,
+        trace=args.trace,
+        checkpoint_every=args.checkpoint_every,
+        resume=args.resume,
+        replicator_interval=args.replicator_interval,
+        profile=args.profile,
+        snapshot_every=args.snapshot_every,
+        provenance=args.provenance,
+        pair_cache=args.pair_cache,
+        zoo=args.zoo,
+        instruction_set=args.instruction_set,
+        stop_on_transition=args.stop_on_transition
     )
 
 
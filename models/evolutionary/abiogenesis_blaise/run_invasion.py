@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+BFF Invasion-Fitness Assays
+
+Rank replicators by competitive strength. Each assay seeds a small soup
+with copies of replicator A and copies of replicator B (plus optional
+random background tapes) and runs random pair interactions until one of
+them has driven the other extinct or the interaction budget is spent.
+
+Tapes are typed by canonical form (instruction bytes only, as in
+analysis.zoo), so copies whose data bytes have drifted still count.
+Assays run under one instruction set (core.instruction_set), which
+decides both the canonical forms and the kernel that executes the soups;
+zoo replicators are taken from that set only, at one tape length.
+Thousands of assays run at once: every soup is a slice of one 3-D arena
+stepped in parallel by the compiled kernel (kernel.run_soups), and
+decided soups drop out at each check.
+
+``dominance_matrix`` runs every pairing of a list of replicators;
+entry [i, j] is the fraction of assays in which i excluded j.
+
+Usage:
+    python run_invasion.py --zoo experiments/zoo.sqlite --top 8 --trials 200
+    python run_invasion.py --zoo experiments/zoo.sqlite --instruction-set bff --tape-length 64
+    python run_invasion.py --tapes <hex> <hex> --soup-size 64 --copies 16
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+# Add core to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core import kernel
+from core.instruction_set import INSTRUCTION_SETS, InstructionSet, get_instruction_set
+
+
+# Outcome codes of a single assay
+WIN_A = 0
+WIN_B = 1
+UNDECIDED = -1
+BOTH_EXTINCT = -2
+
+
+@dataclass
+class CompetitionResult:
+    """
+    Outcomes of a batch of A-versus-B assays.
+
+    Attributes:
+        outcomes: int8 per assay: WIN_A, WIN_B, UNDECIDED or BOTH_EXTINCT
+        decided_at: Interactions run when the assay was decided (or the budget)
+        final_a: Tapes of type A at the end of each assay
+        final_b: Tapes of type B at the end of each assay
+    """
+    outcomes: np.ndarray
+    decided_at: np.ndarray
+    final_a: np.ndarray
+    final_b: np.ndarray
+
+    @property
+    def wins_a(self) -> int:
+        return int(np.count_nonzero(self.outcomes == WIN_A))
+
+    @property
+    def wins_b(self) -> int:
+        return int(np.count_nonzero(self.outcomes == WIN_B))
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable summary."""
+        return {
+            'trials': int(self.outcomes.shape[0]),
+            'wins_a': self.wins_a,
+            'wins_b': self.wins_b,
+            'undecided': int(np.count_nonzero(self.outcomes == UNDECIDED)),
+            'both_extinct': int(np.count_nonzero(self.outcomes == BOTH_EXTINCT)),
+        }
+
+
+def canonical_fingerprint(
+    tape: bytes,
+    instruction_set: Union[str, InstructionSet, None] = None
+) -> np.uint64:
+    """Canonical-form fingerprint of one tape (see kernel.canonical_fingerprints)."""
+    out = np.empty((1, 1), dtype=np.uint64)
+    kernel.kernels_for(get_instruction_set(instruction_set)).canonical_fingerprints(
+        np.frombuffer(tape, dtype=np.uint8).reshape(1, 1, -1), out
+    )
+    return out[0, 0]
+
+
+def seed_arenas(
+    pairs: Sequence[tuple],
+    copies_a: int,
+    copies_b: int,
+    soup_size: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Build one competition soup per (tape_a, tape_b) entry.
+
+    Rows [0, copies_a) hold A, the next copies_b rows hold B and the rest
+    are random background tapes.
+
+    Returns:
+        uint8 array (len(pairs), soup_size, tape_length)
+
+    Raises:
+        ValueError: If the copies do not fit or the tapes differ in length
+    """
+    if copies_a + copies_b > soup_size:
+        raise ValueError(f"{copies_a} + {copies_b} copies do not fit in {soup_size} tapes")
+    tape_length = len(pairs[0][0])
+    lengths = {len(tape) for pair in pairs for tape in pair}
+    if lengths != {tape_length}:
+        raise ValueError(f"Tapes must all have the same length, got {sorted(lengths)}")
+    arenas = rng.integers(0, 256, size=(len(pairs), soup_size, tape_length), dtype=np.uint8)
+    for k, (tape_a, tape_b) in enumerate(pairs):
+        arenas[k, :copies_a] = np.frombuffer(tape_a, dtype=np.uint8)
+        arenas[k, copies_a:copies_a + copies_b] = np.frombuffer(tape_b, dtype=np.uint8)
+    return arenas
+
+
+def run_competitions(
+    arenas: np.ndarray,
+    types: np.ndarray,
+    max_interactions: int = 100_000,
+    check_interval: int = 1000,
+    max_ops: int = 10000,
+    seed: Optional[int] = None,
+    instruction_set: Union[str, InstructionSet, None] = None
+) -> CompetitionResult:
+    """
+    Step many competition soups until each one is decided.
+
+    A soup is decided once the tapes of one type (by canonical
+    fingerprint) are all gone: the other type wins, or neither if both
+    vanished. Soups are checked every ``check_interval`` interactions.
+
+    Args:
+        arenas: uint8 array (soups, size, tape_length), modified in place
+        types: uint64 array (soups, 2) of the A and B canonical fingerprints
+        max_interactions: Interaction budget per soup
+        check_interval: Interactions between fixation checks
+        max_ops: Maximum operations per interaction
+        seed: Seed of the pair draws
+        instruction_set: Instruction set the soups run under (default set
+            if None); ``types`` must use its canonical forms
+
+    Returns:
+        CompetitionResult
+    """
+    kernels = kernel.kernels_for(get_instruction_set(instruction_set))
+    num_soups, size, _ = arenas.shape
+    rng = np.random.default_rng(seed)
+    outcomes = np.full(num_soups, UNDECIDED, dtype=np.int8)
+    decided_at = np.full(num_soups, max_interactions, dtype=np.int64)
+    active = np.ones(num_soups, dtype=bool)
+    fingerprints = np.empty((num_soups, size), dtype=np.uint64)
+
+    def count_types():
+        kernels.canonical_fingerprints(arenas, fingerprints)
+        return (
+            (fingerprints == types[:, :1]).sum(axis=1),
+            (fingerprints == types[:, 1:]).sum(axis=1),
+        )
+
+    count_a, count_b = count_types()
+    done = 0
+    while done < max_interactions and active.any():
+        block = min(check_interval, max_interactions - done)
+        # Two distinct tapes per interaction, independent draws per soup
+        idx1 = rng.integers(0, size, size=(num_soups, block))
+        idx2 = (idx1 + rng.integers(1, size, size=(num_soups, block))) % size
+        kernels.run_soups(arenas, idx1, idx2, active, max_ops)
+        done += block
+
+        count_a, count_b = count_types()
+
+        decided = active & ((count_a == 0) | (count_b == 0))
+        outcomes[decided & (count_b == 0) & (count_a > 0)] = WIN_A
+        outcomes[decided & (count_a == 0) & (count_b > 0)] = WIN_B
+        outcomes[decided & (count_a == 0) & (count_b == 0)] = BOTH_EXTINCT
+        decided_at[decided] = done
+        active &= ~decided
+
+    return CompetitionResult(outcomes, decided_at, count_a, count_b)
+
+
+def compete(
+    tape_a: bytes,
+    tape_b: bytes,
+    trials: int = 100,
+    soup_size: int = 64,
+    copies_a: int = 16,
+    copies_b: int = 16,
+    seed: Optional[int] = None,
+    instruction_set: Union[str, InstructionSet, None] = None,
+    **run_kwargs
+) -> CompetitionResult:
+    """
+    Run ``trials`` assays of A against B.
+
+    Args:
+        tape_a, tape_b: Replicator tapes (same length)
+        trials: Number of independent soups
+        soup_size: Tapes per soup
+        copies_a, copies_b: Initial copies of each replicator
+        seed: Seed of background tapes and pair draws
+        instruction_set: Instruction set of the assays (default set if None)
+        **run_kwargs: Passed to run_competitions
+
+    Returns:
+        CompetitionResult
+    """
+    rng = np.random.default_rng(seed)
+    arenas = seed_arenas([(tape_a, tape_b)] * trials, copies_a, copies_b, soup_size, rng)
+    types = np.empty((trials, 2), dtype=np.uint64)
+    types[:, 0] = canonical_fingerprint(tape_a, instruction_set)
+    types[:, 1] = canonical_fingerprint(tape_b, instruction_set)
+    return run_competitions(
+        arenas, types, seed=int(rng.integers(2**63)), instruction_set=instruction_set,
+        **run_kwargs
+    )
+
+
+def dominance_matrix(
+    tapes: List[bytes],
+    trials: int = 100,
+    soup_size: int = 64,
+    copies: int = 16,
+    seed: Optional[int] = None,
+    instruction_set: Union[str, InstructionSet, None] = None,
+    **run_kwargs
+) -> Dict:
+    """
+    Pairwise competition of every pair of replicators.
+
+    All pairings run together in one batch of ``trials`` soups per pair,
+    with ``copies`` of each competitor.
+
+    Args:
+        tapes: Replicator tapes (same length, distinct canonical forms)
+        trials: Assays per pair
+        soup_size: Tapes per soup
+        copies: Initial copies of each competitor
+        seed: Seed of background tapes and pair draws
+        instruction_set: Instruction set of the assays (default set if None)
+        **run_kwargs: Passed to run_competitions
+
+    Returns:
+        Dict with 'dominance' (K x K fraction of assays row excluded
+        column; NaN on the diagonal), 'wins' (K x K counts), 'undecided'
+        and 'both_extinct' (symmetric K x K counts) and 'trials'
+    """
+    num = len(tapes)
+    fingerprints = [canonical_fingerprint(tape, instruction_set) for tape in tapes]
+    if len(set(int(fp) for fp in fingerprints)) != num:
+        raise ValueError("Replicators must have distinct canonical forms")
+
+    pairs = [(i, j) for i in range(num) for j in range(i + 1, num)]
+    rng = np.random.default_rng(seed)
+    soups = [(tapes[i], tapes[j]) for i, j in pairs for _ in range(trials)]
+    wins = np.zeros((num, num), dtype=np.int64)
+    undecided = np.zeros((num, num), dtype=np.int64)
+    both_extinct = np.zeros((num, num), dtype=np.int64)
+
+    if pairs:
+        arenas = seed_arenas(soups, copies, copies, soup_size, rng)
+        types = np.array(
+            [(fingerprints[i], fingerprints[j]) for i, j in pairs for _ in range(trials)],
+            dtype=np.uint64
+        )
+        result = run_competitions(
+            arenas, types, seed=int(rng.integers(2**63)), instruction_set=instruction_set,
+            **run_kwargs
+        )
+        outcomes = result.outcomes.reshape(len(pairs), trials)
+        for p, (i, j) in enumerate(pairs):
+            wins[i, j] = np.count_nonzero(outcomes[p] == WIN_A)
+            wins[j, i] = np.count_nonzero(outcomes[p] == WIN_B)
+            undecided[i, j] = undecided[j, i] = np.count_nonzero(outcomes[p] == UNDECIDED)
+            both_extinct[i, j] = both_extinct[j, i] = np.count_nonzero(outcomes[p] == BOTH_EXTINCT)
+
+    dominance = wins / trials
+    np.fill_diagonal(dominance, np.nan)
+    return {
+        'dominance': dominance,
+        'wins': wins,
+        'undecided': undecided,
+        'both_extinct': both_extinct,
+        'trials': trials,
+    }
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="Pairwise invasion-fitness assays of BFF replicators",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        '--tapes', nargs='+', metavar='HEX',
+        help='Replicator tapes as hex strings (same length)'
+    )
+    source.add_argument(
+        '--zoo', type=str, metavar='SQLITE',
+        help='Take the most abundant replicators from a zoo (analysis.zoo)'
+    )
+    parser.add_argument(
+        '--top', type=int, default=8,
+        help='Number of zoo replicators to compete'
+    )
+    parser.add_argument(
+        '--instruction-set', choices=sorted(INSTRUCTION_SETS), default='bff7',
+        help='Instruction set the replicators run under (zoo programs of other sets '
+             'are skipped)'
+    )
+    parser.add_argument(
+        '--tape-length', type=int, default=None,
+        help='Tape length of the zoo replicators (default: that of the most '
+             'abundant one of the instruction set)'
+    )
+    parser.add_argument(
+        '--trials', type=int, default=100,
+        help='Assays per pair of replicators'
+    )
+    parser.add_argument(
+        '--soup-size', '-s', type=int, default=64,
+        help='Tapes per assay soup'
+    )
+    parser.add_argument(
+        '--copies', type=int, default=16,
+        help='Initial copies of each competitor'
+    )
+    parser.add_argument(
+        '--max-interactions', '-n', type=int, default=100_000,
+        help='Interaction budget per assay'
+    )
+    parser.add_argument(
+        '--check-interval', type=int, default=1000,
+        help='Interactions between fixation checks'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=42,
+        help='Random seed for reproducibility'
+    )
+
+    args = parser.parse_args()
+
+    if args.zoo is not None:
+        from analysis.zoo import ReplicatorZoo
+        with ReplicatorZoo(args.zoo) as zoo:
+            tape_length = args.tape_length
+            if tape_length is None:
+                first = zoo.top(1, instruction_set=args.instruction_set)
+                tape_length = len(first[0]['tape']) if first else None
+            programs = zoo.top(
+                args.top, instruction_set=args.instruction_set, tape_length=tape_length
+            )
+            tapes = [program['tape'] for program in programs]
+    else:
+        tapes = [bytes.fromhex(tape) for tape in args.tapes]
+    if len(tapes) < 2:
+        parser.error(f"need at least two {args.instruction_set} replicators")
+    if len({len(tape) for tape in tapes}) > 1:
+        parser.error("replicators must all have the same tape length")
+
+    num_assays = args.trials * len(tapes) * (len(tapes) - 1) // 2
+    print(f"Running {num_assays:,} assays ({len(tapes)} replicators, {args.trials} per pair)...")
+    start_time = time.time()
+    result = dominance_matrix(
+        tapes, trials=args.trials, soup_size=args.soup_size, copies=args.copies,
+        seed=args.seed, instruction_set=args.instruction_set,
+        max_interactions=args.max_interactions,
+        check_interval=args.check_interval
+    )
+    print(f"Done in {time.time() - start_time:.1f}s\n")
+
+    dominance = result['dominance']
+    print("Dominance (row excludes column):")
+    print("      " + "".join(f"{j:>7}" for j in range(len(tapes))))
+    for i in range(len(tapes)):
+        cells = "".join(
+            "      -" if i == j else f"{dominance[i, j]:7.2f}" for j in range(len(tapes))
+        )
+        print(f"  {i:>3} {cells}")
+    score = np.nanmean(dominance, axis=1)
+    print("\nRanking (mean dominance):")
+    for rank, i in enumerate(np.argsort(-score, kind='stable'), 1):
+        print(f"  #{rank}: replicator {i} ({score[i]:.2f}) - {tapes[i].hex()}")
+
+    results_dir = Path(__file__).parent / "experiments"
+    results_dir.mkdir(exist_ok=True)
+    out_path = results_dir / f"invasion_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(out_path, 'w') as f:
+        json.dump({
+            'config': vars(args),
+            'tapes': [tape.hex() for tape in tapes],
+            'dominance': np.where(np.isnan(dominance), None, dominance).tolist(),
+            'wins': result['wins'].tolist(),
+            'undecided': result['undecided'].tolist(),
+            'both_extinct': result['both_extinct'].tolist(),
+        }, f, indent=2)
+    print(f"\n📊 Results saved to: {out_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+BFF Abiogenesis Parameter Sweep
+
+Run a grid of (instruction set, soup size, tape length, mutation rate)
+configurations with replicate seeds across a process pool. Each run stops as soon as its
+phase transition is detected or its interaction/time budget is spent.
+
+Results stream into one columnar store (a directory):
+    schema.json        column dtypes, the grid of run configs and the
+                       run settings (budgets, engine, ...)
+    runs.jsonl         one line per finished run (config, outcome and
+                       its sample_start/num_samples row range)
+    samples/<col>.bin  raw little-endian columns, one row per sample,
+                       appended as runs finish
+
+Finished runs are skipped when a sweep is restarted on the same store.
+A restart may add runs to the grid, but a store refuses run settings or
+run ids that disagree with what it recorded.
+
+With --zoo, every run also feeds its replicators into a shared SQLite
+catalog (analysis.zoo) as it goes.
+
+Usage:
+    python run_sweep.py --soup-sizes 512 1024 --mutation-rates 0 1e-4 --seeds 20
+    python run_sweep.py --seeds 100 --max-interactions 5000000 --workers 16
+    python run_sweep.py --seeds 20 --zoo experiments/zoo.sqlite
+    python run_sweep.py --instruction-sets bff7 bff --seeds 20
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import inspect
+import itertools
+import json
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Add core to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.soup import Soup, ENGINES
+from core.instruction_set import INSTRUCTION_SETS
+from core import kernel
+from analysis.complexity import ComplexityTracker
+from analysis.changepoint import TransitionDetector
+from analysis.zoo import ReplicatorZoo
+
+
+# Columns of the per-sample table
+SAMPLE_COLUMNS = {
+    'run_id': '<i4',
+    'interaction': '<i8',
+    'ops_mean': '<f8',
+    'ops_max': '<i4',
+    'diversity': '<f8',
+    'unique_tapes': '<i4',
+    'high_order_entropy': '<f8',
+}
+
+# Besides the change-point detector (analysis.changepoint), a run counts
+# as transitioned once the soup's high-order entropy (bits per byte)
+# exceeds this. Random soups sit near 0.
+TRANSITION_ENTROPY = 1.0
+
+
+def expand_grid(
+    soup_sizes: Iterable[int],
+    tape_lengths: Iterable[int],
+    mutation_rates: Iterable[float],
+    seeds: Iterable[int],
+    instruction_sets: Iterable[str] = ('bff7',)
+) -> List[Dict]:
+    """
+    Cartesian product of the sweep parameters.
+
+    Returns:
+        List of run configs with consecutive ``run_id`` values
+    """
+    grid = itertools.product(instruction_sets, soup_sizes, tape_lengths, mutation_rates, seeds)
+    return [
+        {
+            'run_id': run_id,
+            'instruction_set': instruction_set,
+            'soup_size': soup_size,
+            'tape_length': tape_length,
+            'mutation_rate': mutation_rate,
+            'seed': seed,
+        }
+        for run_id, (instruction_set, soup_size, tape_length, mutation_rate, seed)
+        in enumerate(grid)
+    ]
+
+
+def run_single(
+    config: Dict,
+    max_interactions: int = 2_000_000,
+    max_seconds: Optional[float] = None,
+    sample_interval: int = 1000,
+    max_ops: int = 10000,
+    engine: str = 'numba',
+    transition_entropy: float = TRANSITION_ENTROPY,
+    zoo: Optional[str] = None,
+    zoo_interval: int = 10000,
+    zoo_prefix: str = 'sweep'
+) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """
+    Run one configuration until transition or budget.
+
+    The transition is declared by a TransitionDetector fed every
+    interaction's operation count and each diversity sample, or when
+    the high-order entropy exceeds ``transition_entropy``, whichever
+    comes first.
+
+    Args:
+        config: Run config from expand_grid
+        max_interactions: Interaction budget
+        max_seconds: Wall-clock budget (None = unlimited)
+        sample_interval: Interactions between samples
+        max_ops: Maximum operations per interaction
+        engine: Interpreter engine, one of ENGINES
+        transition_entropy: High-order entropy marking the transition
+        zoo: SQLite replicator catalog to feed (None = off)
+        zoo_interval: Interactions between zoo snapshots
+        zoo_prefix: Zoo run names are ``<zoo_prefix>/run_<run_id>``
+
+    Returns:
+        Tuple (run summary dict, sample columns)
+    """
+    soup = Soup(
+        size=config['soup_size'],
+        tape_length=config['tape_length'],
+        mutation_rate=config['mutation_rate'],
+        seed=config['seed'],
+        engine=engine,
+        instruction_set=config.get('instruction_set', 'bff7')
+    )
+    complexity = ComplexityTracker()
+    samples = {name: [] for name in SAMPLE_COLUMNS}
+
+    replicator_zoo = None
+    if zoo is not None:
+        replicator_zoo = ReplicatorZoo(zoo)
+        zoo_run_id = replicator_zoo.start_run(
+            f"{zoo_prefix}/run_{config['run_id']}", config, seed=config['seed']
+        )
+
+    detector = TransitionDetector()
+    transition_point = None
+    transition_confidence = None
+    stop_reason = 'budget'
+    start_time = time.time()
+
+    while soup.interaction_count < max_interactions:
+        before = soup.interaction_count
+        ops = soup.run(
+            num_interactions=min(sample_interval, max_interactions - soup.interaction_count),
+            max_ops=max_ops,
+            results='records'
+        ).operations
+        samples['run_id'].append(config['run_id'])
+        samples['interaction'].append(soup.interaction_count)
+        samples['ops_mean'].append(float(ops.mean()))
+        samples['ops_max'].append(int(ops.max()))
+        samples['diversity'].append(soup.get_diversity())
+        samples['unique_tapes'].append(soup.count_unique_tapes())
+        entropy = complexity.update(soup.arena).high_order_entropy
+        samples['high_order_entropy'].append(entropy)
+        if replicator_zoo is not None and soup.interaction_count // zoo_interval > before // zoo_interval:
+            replicator_zoo.ingest(
+                zoo_run_id, soup.arena, soup.interaction_count, soup.instruction_set
+            )
+
+        detector.update_ops(ops, first_interaction=before + 1)
+        detector.update_diversity(samples['diversity'][-1], soup.interaction_count)
+        transition = detector.transition
+        if transition is not None:
+            transition_point = transition.position
+            transition_confidence = transition.confidence
+            stop_reason = 'transition'
+            break
+        if entropy > transition_entropy:
+            transition_point = soup.interaction_count
+            stop_reason = 'transition'
+            break
+        if max_seconds is not None and time.time() - start_time > max_seconds:
+            stop_reason = 'time'
+            break
+
+    if replicator_zoo is not None:
+        replicator_zoo.ingest(
+            zoo_run_id, soup.arena, soup.interaction_count, soup.instruction_set
+        )
+        replicator_zoo.close()
+
+    summary = dict(config)
+    summary.update({
+        'transition_point': transition_point,
+        'transition_confidence': transition_confidence,
+        'stop_reason': stop_reason,
+        'interactions': soup.interaction_count,
+        'runtime_seconds': time.time() - start_time,
+        'final_diversity': soup.get_diversity(),
+        'final_high_order_entropy': samples['high_order_entropy'][-1] if samples['run_id'] else 0.0,
+    })
+    columns = {
+        name: np.asarray(values, dtype=SAMPLE_COLUMNS[name])
+        for name, values in samples.items()
+    }
+    return summary, columns
+
+
+def _worker_init() -> None:
+    """Pool initializer: one numba thread per process (parallelism is across runs)."""
+    if kernel.NUMBA_AVAILABLE:
+        import numba
+        numba.set_num_threads(1)
+
+
+class SweepStore:
+    """
+    Append-only columnar store for sweep results.
+
+    See the module docstring for the on-disk layout.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        configs: Optional[List[Dict]] = None,
+        settings: Optional[Dict] = None
+    ):
+        """
+        Open (or create) a store directory.
+
+        Args:
+            path: Store directory
+            configs: Run configs the caller is about to run; added to the
+                store's grid (None = no check)
+            settings: run_single settings of the sweep (None = no check)
+
+        Raises:
+            ValueError: If ``settings`` differ from the store's, or a
+                config reuses a recorded run id with other parameters
+        """
+        self.path = Path(path)
+        (self.path / 'samples').mkdir(parents=True, exist_ok=True)
+        self._schema_path = self.path / 'schema.json'
+        if self._schema_path.exists():
+            with open(self._schema_path) as f:
+                schema = json.load(f)
+        else:
+            schema = {'samples': SAMPLE_COLUMNS, 'configs': [], 'settings': settings}
+        self._check_grid(schema, configs, settings)
+        with open(self._schema_path, 'w') as f:
+            json.dump(schema, f, indent=2)
+        self.num_rows = self._truncate_columns()
+
+    @staticmethod
+    def _check_grid(schema: Dict, configs: Optional[List[Dict]], settings: Optional[Dict]) -> None:
+        """Validate ``configs`` and ``settings`` against ``schema`` and record them."""
+        if settings is not None:
+            settings = json.loads(json.dumps(settings))
+            if schema.get('settings') is None:
+                schema['settings'] = settings
+            elif schema['settings'] != settings:
+                raise ValueError(
+                    f"Sweep store was written with settings {schema['settings']}, "
+                    f"not {settings}"
+                )
+        grid = {config['run_id']: config for config in schema.setdefault('configs', [])}
+        for config in json.loads(json.dumps(configs or [])):
+            recorded = grid.get(config['run_id'])
+            if recorded is None:
+                grid[config['run_id']] = config
+                schema['configs'].append(config)
+            elif recorded != config:
+                raise ValueError(
+                    f"Sweep store has run {config['run_id']} as {recorded}, not {config}"
+                )
+
+    def _column_path(self, name: str) -> Path:
+        return self.path / 'samples' / f'{name}.bin'
+
+    def _truncate_columns(self) -> int:
+        """Cut all columns to a common row count (after an interrupted append)."""
+        rows = []
+        for name, dtype in SAMPLE_COLUMNS.items():
+            column_path = self._column_path(name)
+            size = column_path.stat().st_size if column_path.exists() else 0
+            rows.append(size // np.dtype(dtype).itemsize)
+        num_rows = min(rows)
+        for name, dtype in SAMPLE_COLUMNS.items():
+            with open(self._column_path(name), 'ab') as f:
+                f.truncate(num_rows * np.dtype(dtype).itemsize)
+        return num_rows
+
+    def finished_run_ids(self) -> set:
+        """Run ids already recorded in the store."""
+        return {run['run_id'] for run in self.finished_runs()}
+
+    def finished_runs(self) -> List[Dict]:
+        """Summaries of the runs already recorded in the store."""
+        runs_path = self.path / 'runs.jsonl'
+        if not runs_path.exists():
+            return []
+        with open(runs_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def pending(self, configs: List[Dict]) -> List[Dict]:
+        """The configs with no finished run of exactly that config in the store."""
+        keys = sorted({key for config in configs for key in config})
+
+        def identity(config):
+            return json.dumps([config.get(key) for key in keys])
+
+        done = {identity(run) for run in self.finished_runs()}
+        return [
+            config for config in configs
+            if identity(json.loads(json.dumps(config))) not in done
+        ]
+
+    def append(self, summary: Dict, columns: Dict[str, np.ndarray]) -> None:
+        """Append one run's samples, then its summary line."""
+        num_samples = columns['run_id'].shape[0]
+        for name, values in columns.items():
+            with open(self._column_path(name), 'ab') as f:
+                f.write(values.astype(SAMPLE_COLUMNS[name], copy=False).tobytes())
+        summary = dict(summary, sample_start=self.num_rows, num_samples=num_samples)
+        self.num_rows += num_samples
+        # Written last: a run is only "finished" once its samples are on disk
+        with open(self.path / 'runs.jsonl', 'a') as f:
+            f.write(json.dumps(summary) + '\n')
+
+
+def load_sweep(path: Path) -> Tuple[List[Dict], Dict[str, np.ndarray]]:
+    """
+    Read a sweep store.
+
+    Args:
+        path: Store directory written by run_sweep
+
+    Returns:
+        Tuple (run summaries, sample columns as arrays of equal length)
+    """
+    path = Path(path)
+    with open(path / 'schema.json') as f:
+        schema = json.load(f)['samples']
+    runs = []
+    runs_path = path / 'runs.jsonl'
+    if runs_path.exists():
+        with open(runs_path) as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+
+    samples = {}
+    for name, dtype in schema.items():
+        column_path = path / 'samples' / f'{name}.bin'
+        samples[name] = (
+            np.fromfile(column_path, dtype=dtype) if column_path.exists()
+            else np.empty(0, dtype=dtype)
+        )
+    # Keep only rows of finished runs (drops samples of interrupted appends)
+    num_rows = min(column.shape[0] for column in samples.values())
+    keep = np.zeros(num_rows, dtype=bool)
+    for run in runs:
+        keep[run['sample_start']:run['sample_start'] + run['num_samples']] = True
+    return runs, {name: column[:num_rows][keep] for name, column in samples.items()}
+
+
+def run_settings(run_kwargs: Dict) -> Dict:
+    """
+    The run_single settings that shape results, defaults filled in.
+
+    Zoo options only decide where replicators are catalogued, so they
+    are left out.
+    """
+    parameters = inspect.signature(run_single).parameters
+    return {
+        name: run_kwargs.get(name, parameter.default)
+        for name, parameter in parameters.items()
+        if name != 'config' and not name.startswith('zoo')
+    }
+
+
+def run_sweep(
+    configs: List[Dict],
+    store_path: Path,
+    workers: int = 0,
+    **run_kwargs
+) -> List[Dict]:
+    """
+    Run all configs, streaming results into a store.
+
+    Args:
+        configs: Run configs from expand_grid
+        store_path: Store directory (finished runs with the same config
+            are skipped)
+        workers: Worker processes (0 = run in this process)
+        **run_kwargs: Passed to run_single (zoo runs are named after the store)
+
+    Returns:
+        Summaries of the runs executed by this call, in completion order
+
+    Raises:
+        ValueError: If the store holds a sweep with other settings or
+            another config under one of the run ids
+    """
+    store = SweepStore(store_path, configs, run_settings(run_kwargs))
+    run_kwargs.setdefault('zoo_prefix', store.path.name)
+    pending = store.pending(configs)
+    print(f"Sweep: {len(configs)} runs, {len(configs) - len(pending)} already done, "
+          f"{len(pending)} to run -> {store.path}")
+
+    summaries = []
+
+    def record(summary, columns):
+        store.append(summary, columns)
+        summaries.append(summary)
+        outcome = (
+            f"transition at {summary['transition_point']:,}"
+            if summary['transition_point'] is not None
+            else f"no transition ({summary['stop_reason']})"
+        )
+        print(f"  [{len(summaries)}/{len(pending)}] run {summary['run_id']} "
+              f"{summary.get('instruction_set', 'bff7')} size={summary['soup_size']} len={summary['tape_length']} "
+              f"mut={summary['mutation_rate']} seed={summary['seed']}: "
+              f"{outcome}, {summary['runtime_seconds']:.1f}s", flush=True)
+
+    if workers == 0:
+        for config in pending:
+            record(*run_single(config, **run_kwargs))
+        return summaries
+
+    # spawn: forking after numba has started threads is not safe
+    context = mp.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=_worker_init
+    ) as pool:
+        futures = [pool.submit(run_single, config, **run_kwargs) for config in pending]
+        for future in as_completed(futures):
+            record(*future.result())
+    return summaries
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="Run a parameter sweep of BFF abiogenesis experiments",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        '--soup-sizes', type=int, nargs='+', default=[1024],
+        help='Soup sizes to sweep'
+    )
+    parser.add_argument(
+        '--tape-lengths', type=int, nargs='+', default=[64],
+        help='Tape lengths to sweep'
+    )
+    parser.add_argument(
+        '--mutation-rates', type=float, nargs='+', default=[0.0],
+        help='Mutation rates to sweep'
+    )
+    parser.add_argument(
+        '--instruction-sets', nargs='+', choices=sorted(INSTRUCTION_SETS), default=['bff7'],
+        help='Instruction sets to sweep'
+    )
+    parser.add_argument(
+        '--seeds', type=int, default=10,
+        help='Replicate seeds per configuration'
+    )
+    parser.add_argument(
+        '--base-seed', type=int, default=0,
+        help='First replicate seed'
+    )
+    parser.add_argument(
+        '--max-interactions', '-n', type=int, default=2_000_000,
+        help='Interaction budget per run'
+    )
+    parser.add_argument(
+        '--max-seconds', type=float, default=None,
+        help='Wall-clock budget per run'
+    )
+    parser.add_argument(
+        '--sample-interval', type=int, default=1000,
+        help='Interactions between samples'
+    )
+    parser.add_argument(
+        '--transition-entropy', type=float, default=TRANSITION_ENTROPY,
+        help='High-order entropy (bits/byte) at which a run counts as transitioned'
+    )
+    parser.add_argument(
+        '--engine', choices=ENGINES, default='numba',
+        help='Interpreter engine'
+    )
+    parser.add_argument(
+        '--workers', '-w', type=int, default=mp.cpu_count(),
+        help='Worker processes (0 = run in this process)'
+    )
+    parser.add_argument(
+        '--out', type=str, default=None,
+        help='Store directory (default: experiments/sweeps/sweep_<timestamp>); '
+             'reuse a store to resume an interrupted sweep'
+    )
+    parser.add_argument(
+        '--zoo', type=str, default=None, metavar='SQLITE',
+        help='Add every run\'s replicators to this SQLite catalog'
+    )
+
+    args = parser.parse_args()
+
+    out = args.out
+    if out is None:
+        out = Path(__file__).parent / "experiments" / "sweeps" / f"sweep_{time.strftime('%Y%m%d_%H%M%S')}"
+
+    configs = expand_grid(
+        args.soup_sizes, args.tape_lengths, args.mutation_rates,
+        range(args.base_seed, args.base_seed + args.seeds), args.instruction_sets
+    )
+    start_time = time.time()
+    summaries = run_sweep(
+        configs, Path(out), workers=args.workers,
+        max_interactions=args.max_interactions, max_seconds=args.max_seconds,
+        sample_interval=args.sample_interval, engine=args.engine,
+        transition_entropy=args.transition_entropy, zoo=args.zoo
+    )
+    transitions = [s for s in summaries if s['transition_point'] is not None]
+    print(f"\nSweep complete in {time.time() - start_time:.1f}s: "
+          f"{len(transitions)}/{len(summaries)} runs reached a transition")
+
+
+if __name__ == '__main__':
+    main()
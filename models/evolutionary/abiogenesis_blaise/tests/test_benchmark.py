@@ -0,0 +1,60 @@
+"""
+Tests for the throughput benchmark harness.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from run_benchmark import (
+    BenchmarkCase, DEFAULT_CASES, BASELINE_PATH, build_soup, compare, load_results,
+    replicator_tape, run_benchmarks, run_case
+)
+
+
+TINY = BenchmarkCase('tiny', 64, 32, 500)
+
+
+class TestCases:
+    """Workload construction."""
+
+    def test_replicator_copies_itself(self):
+        """The seeded replicator copies its whole tape into the partner."""
+        soup = build_soup(BenchmarkCase('seeded', 4, 32, 1, seeded_fraction=0.5))
+        assert soup.count_unique_tapes() == 3
+        soup.interact_pair(0, 2)
+        assert soup.arena[2].tobytes() == replicator_tape(32)
+
+    def test_seeded_soup_runs_long_loops(self):
+        """Post-transition cases execute far more operations per interaction."""
+        random_case = run_case(TINY, repeats=1)
+        seeded_case = run_case(BenchmarkCase('tiny-seeded', 64, 32, 500, seeded_fraction=0.5),
+                               repeats=1)
+        assert seeded_case['operations'] > 1.5 * random_case['operations']
+
+    def test_baseline_covers_default_cases(self):
+        """The committed baseline has an entry for every default case."""
+        baseline = load_results(BASELINE_PATH)
+        assert set(baseline['cases']) == {case.name for case in DEFAULT_CASES}
+
+
+class TestResults:
+    """Metrics and baseline comparison."""
+
+    def test_run_case_metrics(self):
+        """Rates are consistent with counts and the best time."""
+        result = run_case(BenchmarkCase('tiny-epoch', 64, 32, 500, schedule='epoch'), repeats=2)
+        assert result['interactions'] == 480
+        assert np.isclose(result['interactions_per_sec'] * result['seconds'], 480)
+        assert np.isclose(result['ops_per_sec'] * result['seconds'], result['operations'])
+        assert result['peak_memory_bytes'] > 0
+
+    def test_compare_flags_regressions(self):
+        """Slowdowns and memory growth beyond the tolerance are regressions."""
+        baseline = run_benchmarks([TINY], repeats=1, verbose=False)
+        slower = {'cases': {'tiny': dict(baseline['cases']['tiny'])}}
+        assert not compare(slower, baseline)[0]['regression']
+        slower['cases']['tiny']['interactions_per_sec'] /= 2
+        assert compare(slower, baseline)[0]['regression']
+        assert compare(slower, baseline, tolerance=0.6)[0]['interactions_ratio'] == 0.5
@@ -9,9 +9,12 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import random
+
+import numpy as np
 import pytest
 from core.tape import Tape
-from core.brainfuck import BrainfuckInterpreter, ExecutionResult
+from core.brainfuck import BrainfuckInterpreter, ExecutionResult, draw_timeout_budget
 
 
 class TestBasicInstructions:
@@ -215,6 +218,112 @@ class TestSelfModification:
         assert tape.get_byte(0) == 44  # Modified from 43
 
 
+class TestNoOpSkipping:
+    """Test the next-instruction index used to jump over no-op bytes."""
+
+    def test_skip_table_points_at_next_instruction(self):
+        """Each entry should point at the next instruction or the end."""
+        data = [0, 0, 43, 0, 62] + [0] * 11
+        interp = BrainfuckInterpreter(Tape(length=16, data=data))
+
+        skip = interp._build_skip_table()
+
+        assert skip[:5] == [2, 2, 2, 4, 4]
+        assert skip[5:] == [16] * 12
+
+    def test_write_creating_instruction_is_executed(self):
+        """A no-op turned into an instruction ahead of ip must run."""
+        # '<' wraps dp to 15, '-' turns '.' (46, no-op) into '-' (45),
+        # which must then execute when ip reaches position 15
+        data = [60, 45] + [0] * 13 + [46]
+        tape = Tape(length=16, data=data)
+
+        result = BrainfuckInterpreter(tape).run_from_tape()
+
+        assert result.operations == 3
+        assert tape.get_byte(15) == 44
+
+    def test_write_removing_instruction_is_skipped(self):
+        """An instruction turned into a no-op ahead of ip must not run."""
+        # '<' wraps dp to 15, '-' turns '+' (43) into '*' (42, no-op)
+        data = [60, 45] + [0] * 13 + [43]
+        tape = Tape(length=16, data=data)
+
+        result = BrainfuckInterpreter(tape).run_from_tape()
+
+        assert result.operations == 2
+        assert tape.get_byte(15) == 42
+
+    def test_update_matches_rebuild(self):
+        """Patching the index should equal rebuilding it from scratch."""
+        tape = Tape(length=16, data=[0, 43, 0, 0, 0, 62] + [0] * 10)
+        interp = BrainfuckInterpreter(tape)
+        skip = interp._build_skip_table()
+
+        tape.set_byte(3, 60)   # insert instruction
+        interp._update_skip_table(skip, 3)
+        assert skip == interp._build_skip_table()
+
+        tape.set_byte(5, 0)    # remove instruction
+        interp._update_skip_table(skip, 5)
+        assert skip == interp._build_skip_table()
+
+    def test_skip_matches_unskipped_execution(self):
+        """Skipping should not change results versus per-byte fetching."""
+        import random as stdlib_random
+        from core.kernel import execute_tape
+        rng = stdlib_random.Random(3)
+        alphabet = [60, 62, 43, 45, 44, 91, 93, 0, 1, 42, 46]
+        for _ in range(200):
+            data = [rng.choice(alphabet) for _ in range(64)]
+            fast = Tape(length=64, data=data)
+            slow = Tape(length=64, data=data)
+
+            fast_result = BrainfuckInterpreter(fast).run_from_tape(max_ops=500)
+            # The compiled kernel fetches every byte
+            ops, _, _, _, ip, _, _ = execute_tape(slow.buffer, 0, 500)
+            slow_result = ExecutionResult(
+                operations=ops, terminated=False, final_instruction_pointer=ip
+            )
+
+            assert fast.data == slow.data
+            assert fast_result.operations == slow_result.operations
+            assert fast_result.final_instruction_pointer == \
+                slow_result.final_instruction_pointer
+
+
+class TestSelfModifyingLoops:
+    """Loop matching should follow the tape as the program rewrites it."""
+
+    def test_created_bracket_is_matched(self):
+        """A ']' written after the bracket map was built should close the loop."""
+        # '[' at 0 is entered (byte 0 is nonzero) and builds the map, '<'
+        # moves dp to 15, '+' turns byte 92 into ']', '>' returns dp to 0,
+        # then '[-' ... ']' counts byte 0 down to zero
+        data = [91, 60, 43, 62, 91, 45] + [0] * 9 + [92]
+        tape = Tape(length=16, data=data)
+
+        result = BrainfuckInterpreter(tape).run_from_tape(max_ops=10000)
+
+        assert not result.crashed
+        assert result.terminated
+        assert tape.get_byte(0) == 0
+
+    def test_destroyed_bracket_crashes(self):
+        """Jumping from a '[' whose ']' was overwritten should crash."""
+        # '[' at 0 builds the map (4 <-> 15), '<' moves dp to 15, '-' turns
+        # the ']' into byte 92, '<' moves dp to 14 (zero), so '[' at 4 must
+        # jump forward but no longer has a partner
+        data = [91, 60, 45, 60, 91] + [0] * 10 + [93]
+        tape = Tape(length=16, data=data)
+
+        result = BrainfuckInterpreter(tape).run_from_tape(max_ops=10000)
+
+        assert result.crashed
+        assert result.final_instruction_pointer == 4
+        assert tape.get_byte(15) == 92
+
+
 class TestExecutionResult:
     """Test the ExecutionResult dataclass."""
 
@@ -294,3 +403,32 @@ class TestEdgeCases:
         result = interp.run_from_tape(max_ops=200)
 
         assert result.operations > 100
+
+
+class TestTimeoutBudget:
+    """Test geometric timeout budget draws."""
+
+    def test_disabled_and_certain_timeouts(self):
+        """p=0 gives the full budget, p=1 times out immediately."""
+        assert draw_timeout_budget(0.0, 1000) == 1000
+        assert draw_timeout_budget(1.0, 1000) == 0
+
+    def test_budget_capped_at_max_ops(self):
+        """Budgets never exceed max_ops."""
+        rng = random.Random(0)
+        draws = [draw_timeout_budget(1e-6, 50, rng) for _ in range(100)]
+        assert max(draws) <= 50
+
+    def test_geometric_mean(self):
+        """Budget is the number of ops completed before a timeout."""
+        rng = random.Random(1)
+        p = 0.01
+        draws = [draw_timeout_budget(p, 10**9, rng) for _ in range(20000)]
+        # Mean of a geometric count of failures is (1 - p) / p
+        assert abs(np.mean(draws) - (1 - p) / p) < 3.0
+
+    def test_reproducible_with_rng(self):
+        """Same seeded RNG gives the same draws."""
+        a = [draw_timeout_budget(0.05, 1000, random.Random(7)) for _ in range(3)]
+        b = [draw_timeout_budget(0.05, 1000, random.Random(7)) for _ in range(3)]
+        assert a == b
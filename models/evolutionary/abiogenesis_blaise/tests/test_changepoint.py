@@ -0,0 +1,130 @@
+"""
+Tests for online change-point detection.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core.soup import Soup
+from analysis.changepoint import CusumDetector, TransitionDetector
+
+
+def step_stream(seed, before=500, after=300, shift=1.5):
+    """Gaussian noise whose mean steps by ``shift`` after ``before`` samples."""
+    rng = np.random.default_rng(seed)
+    return np.concatenate([rng.normal(0, 1, before), rng.normal(shift, 1, after)])
+
+
+class TestCusumDetector:
+    """One-sided CUSUM on synthetic streams."""
+
+    @pytest.mark.parametrize('direction', [1, -1])
+    def test_locates_step(self, direction):
+        """A step change is found close to where it happened, in either direction."""
+        detector = CusumDetector(direction=direction, threshold=10, warmup=100)
+        values = direction * step_stream(0)
+        for position, value in enumerate(values, 1):
+            detector.update(value, position)
+        change = detector.change
+        assert change is not None
+        assert abs(change.position - 500) <= 10
+        assert 500 < change.detected_at <= 520
+        assert 0.8 < direction * change.magnitude < 2.5
+        assert change.confidence > 0.99
+
+    def test_no_alarm_without_change(self):
+        """A stationary stream does not alarm."""
+        detector = CusumDetector(threshold=12, warmup=1000)
+        detector.update_batch(np.random.default_rng(1).normal(3, 2, 50_000))
+        assert detector.change is None
+        assert detector.count == 50_000
+
+    def test_batch_matches_scalar(self):
+        """update_batch in arbitrary chunks equals per-observation updates."""
+        values = step_stream(2, shift=0.8)
+        for latch in (True, False):
+            single = CusumDetector(threshold=6, warmup=50, clip=2.5, latch=latch)
+            batched = CusumDetector(threshold=6, warmup=50, clip=2.5, latch=latch)
+            for value in values:
+                single.update(value)
+            for chunk in np.array_split(values, [7, 40, 41, 300, 333, 600]):
+                batched.update_batch(chunk)
+            assert (batched.change is None) == (single.change is None)
+            if single.change is not None:
+                assert batched.change.position == single.change.position
+                assert batched.change.detected_at == single.change.detected_at
+                assert batched.change.magnitude == pytest.approx(single.change.magnitude)
+            assert batched.count == single.count
+            assert batched.statistic == pytest.approx(single.statistic)
+
+    def test_unlatched_alarm_withdrawn(self):
+        """A transient excursion is withdrawn; a lasting one replaces it."""
+        rng = np.random.default_rng(3)
+        values = np.concatenate([
+            rng.normal(0, 1, 200), np.full(10, 4.0), rng.normal(0, 1, 300), np.full(50, 4.0)
+        ])
+        detector = CusumDetector(threshold=8, warmup=100, latch=False)
+        detector.update_batch(values[:510])
+        assert detector.change is None and detector.withdrawn == 1
+        detector.update_batch(values[510:])
+        assert detector.change is not None and detector.change.position > 210
+
+    def test_state_round_trip(self):
+        """A restored detector continues identically."""
+        values = step_stream(4)
+        original = CusumDetector(warmup=100)
+        original.update_batch(values[:300])
+        restored = CusumDetector.from_state(original.get_state())
+        original.update_batch(values[300:])
+        restored.update_batch(values[300:])
+        assert restored.change == original.change
+
+    def test_invalid_arguments(self):
+        """Direction must be +/-1 and the warm-up needs two observations."""
+        with pytest.raises(ValueError):
+            CusumDetector(direction=0)
+        with pytest.raises(ValueError):
+            CusumDetector(warmup=1)
+
+
+class TestTransitionDetector:
+    """Transition detection on live soups."""
+
+    @staticmethod
+    def run_soup(inject_at=None, interactions=40_000, batch=1000):
+        """Feed a random soup's ops and diversity; optionally seed a replicator."""
+        soup = Soup(size=256, tape_length=32, seed=5, engine='numba')
+        detector = TransitionDetector()
+        replicator = np.frombuffer(b'[>]>,[>,]'.ljust(31, b'a') + b'\x00', dtype=np.uint8)
+        while soup.interaction_count < interactions:
+            if soup.interaction_count == inject_at:
+                soup.arena[:4] = replicator
+                soup.refresh_fingerprints()
+            before = soup.interaction_count
+            records = soup.run(batch, max_ops=10000, results='records')
+            detector.update_ops(records.operations, first_interaction=before + 1)
+            detector.update_diversity(soup.get_diversity(), soup.interaction_count)
+        return detector
+
+    def test_detects_replicator_takeover(self):
+        """A seeded replicator's takeover is located just after it was seeded."""
+        transition = self.run_soup(inject_at=20_000).transition
+        assert transition is not None
+        assert 20_000 < transition.position < 25_000
+        assert transition.detected_at >= transition.position
+        assert transition.confidence > 0.9
+
+    def test_random_soup_has_no_transition(self):
+        """Neither stream declares a transition in a random soup."""
+        detector = self.run_soup()
+        assert detector.transition is None
+
+    def test_state_round_trip(self):
+        """Detector state survives serialization (for run checkpoints)."""
+        detector = self.run_soup(inject_at=20_000, interactions=30_000)
+        restored = TransitionDetector.from_state(detector.get_state())
+        assert restored.transition == detector.transition
+        assert restored.ops.count == detector.ops.count
@@ -0,0 +1,79 @@
+"""
+Tests for binary soup checkpoints.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core.soup import Soup
+from core.checkpoint import save_checkpoint, load_checkpoint
+
+
+class TestCheckpointRoundTrip:
+    """Saved checkpoints should restore the exact soup."""
+
+    def test_arena_and_metadata(self, tmp_path):
+        """Arena bytes, parameters and extra data should survive a round trip."""
+        soup = Soup(size=50, tape_length=32, mutation_rate=0.01, seed=4, engine='numba')
+        soup.run(200, max_ops=500)
+
+        path = save_checkpoint(tmp_path / 'soup.ckpt', soup, extra={'note': 'x'})
+        restored, extra = load_checkpoint(path)
+
+        assert extra == {'note': 'x'}
+        assert np.array_equal(restored.arena, soup.arena)
+        assert restored.arena.flags.writeable
+        assert restored.interaction_count == 200
+        assert restored.mutation_rate == 0.01
+        assert restored.engine == 'numba'
+        assert restored.count_unique_tapes() == soup.count_unique_tapes()
+
+    def test_checkpoint_smaller_than_json(self, tmp_path):
+        """Raw bytes should beat the JSON state for non-trivial soups."""
+        import json
+        soup = Soup(size=1024, tape_length=64, seed=1)
+        path = save_checkpoint(tmp_path / 'soup.ckpt', soup)
+        assert path.stat().st_size < len(json.dumps(soup.get_state())) / 3
+
+    @pytest.mark.parametrize('mutation_rate', [0.0, 0.005])
+    def test_resume_is_bit_exact(self, tmp_path, mutation_rate):
+        """A resumed soup should follow the uninterrupted trajectory exactly."""
+        reference = Soup(size=40, mutation_rate=mutation_rate, seed=9)
+        reference.run(600, max_ops=500)
+
+        soup = Soup(size=40, mutation_rate=mutation_rate, seed=9)
+        soup.run(250, max_ops=500)
+        save_checkpoint(tmp_path / 'soup.ckpt', soup)
+        resumed, _ = load_checkpoint(tmp_path / 'soup.ckpt')
+        resumed.run(350, max_ops=500)
+
+        assert np.array_equal(resumed.arena, reference.arena)
+        assert resumed.interaction_count == reference.interaction_count
+
+    def test_json_state_restores_rng(self):
+        """get_state/from_state should also carry the RNG forward."""
+        soup = Soup(size=20, seed=3)
+        restored = Soup.from_state(soup.get_state())
+        assert [soup.select_pair()[2:] for _ in range(5)] == \
+            [restored.select_pair()[2:] for _ in range(5)]
+
+
+class TestCheckpointErrors:
+    """Invalid files should be rejected."""
+
+    def test_bad_magic(self, tmp_path):
+        """Files without the checkpoint magic should raise ValueError."""
+        path = tmp_path / 'bogus.ckpt'
+        path.write_bytes(b'not a checkpoint')
+        with pytest.raises(ValueError):
+            load_checkpoint(path)
+
+    def test_truncated_arena(self, tmp_path):
+        """A truncated arena should raise ValueError."""
+        path = save_checkpoint(tmp_path / 'soup.ckpt', Soup(size=10, seed=1))
+        path.write_bytes(path.read_bytes()[:-5])
+        with pytest.raises(ValueError):
+            load_checkpoint(path)
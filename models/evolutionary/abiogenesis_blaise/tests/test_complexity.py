@@ -0,0 +1,54 @@
+"""
+Tests for the high-order entropy complexity metric.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core.soup import Soup
+from analysis.complexity import ComplexityTracker, high_order_entropy, shannon_entropy
+
+
+class TestHighOrderEntropy:
+    """Test the complexity measures on known inputs."""
+
+    def test_shannon_entropy(self):
+        """Uniform histograms over 2**n symbols have n bits of entropy."""
+        assert shannon_entropy(np.array([5, 5, 5, 5])) == pytest.approx(2.0)
+        assert shannon_entropy(np.array([7, 0, 0])) == 0.0
+
+    def test_random_soup_near_zero(self):
+        """Random bytes are incompressible: high-order entropy near 0."""
+        sample = high_order_entropy(Soup(size=512, seed=1).arena)
+        assert sample.shannon_entropy > 7.9
+        assert abs(sample.high_order_entropy) < 0.1
+
+    def test_copied_soup_is_high(self):
+        """A soup of copies of a few random tapes has broad bytes but compresses well."""
+        arena = Soup(size=512, seed=1).arena.copy()
+        arena[:] = arena[np.arange(512) % 4]
+        sample = high_order_entropy(arena)
+        assert sample.shannon_entropy > 7.0
+        assert sample.high_order_entropy > 5.0
+
+
+class TestComplexityTracker:
+    """Sampling a live soup should match computing from scratch."""
+
+    def test_repeated_samples_match_scratch(self):
+        """Repeated samples of a running soup should give exact results."""
+        soup = Soup(size=128, seed=2, mutation_rate=0.001)
+        tracker = ComplexityTracker()
+        for _ in range(5):
+            soup.run(200, max_ops=500)
+            assert tracker.update(soup.arena) == high_order_entropy(soup.arena)
+
+    def test_flat_input(self):
+        """1-D buffers should be accepted."""
+        data = np.zeros(1000, dtype=np.uint8)
+        sample = ComplexityTracker().update(data)
+        assert sample.shannon_entropy == 0.0
+        assert sample.compressed_bits < 1.0
@@ -0,0 +1,160 @@
+"""
+Tests for declarative instruction sets.
+
+Every variant must run bit-identically on the reference interpreter and
+the compiled kernel.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import random
+
+import numpy as np
+import pytest
+from core.tape import Tape, INSTRUCTION_MASK
+from core.brainfuck import BrainfuckInterpreter
+from core.soup import Soup
+from core.instruction_set import (
+    InstructionSet, BFF, BFF7, DEFAULT_INSTRUCTION_SET, get_instruction_set
+)
+from core import kernel
+
+
+# Console copy swapped for a data -> console copy
+PUSH = InstructionSet('bff7-push', {**BFF7.table, ',': 'copy_to_console'})
+
+
+def run_both(data, instruction_set, max_ops):
+    """Run reference and kernel on the same bytes; return both outcomes."""
+    tape = Tape(length=len(data), data=data)
+    result = BrainfuckInterpreter(tape, instruction_set=instruction_set).run_from_tape(
+        max_ops=max_ops
+    )
+    reference = (
+        (result.operations, result.terminated, result.crashed,
+         result.final_instruction_pointer, result.final_data_pointer,
+         result.final_console_pointer),
+        tape.data,
+    )
+    buf = np.array(data, dtype=np.uint8)
+    ops, terminated, crashed, _, ip, dp, cp = kernel.kernels_for(instruction_set).execute_tape(
+        buf, 0, max_ops
+    )
+    compiled = ((int(ops), terminated, crashed, int(ip), int(dp), int(cp)), buf.tolist())
+    return reference, compiled
+
+
+class TestInstructionSet:
+    """Opcode tables and their derived lookups."""
+
+    def test_default_matches_tape_mask(self):
+        """The default set is the classic 7-instruction BFF."""
+        assert get_instruction_set(None) is DEFAULT_INSTRUCTION_SET is BFF7
+        assert np.array_equal(BFF7.mask, INSTRUCTION_MASK)
+
+    def test_opcode_bytes(self):
+        """Absent actions map to -1."""
+        assert BFF.opcode_bytes.count(-1) == 2
+        assert BFF7.opcode_bytes.count(-1) == 5
+        assert BFF.mask.sum() == 10
+
+    @pytest.mark.parametrize('table', [
+        {'[': 'loop_start'},
+        {'[': 'loop_start', ']': 'loop_end', 'x': 'teleport'},
+        {'[': 'loop_start', ']': 'loop_end', '+': 'increment', '*': 'increment'},
+        {'[': 'loop_start', ']': 'loop_end', 'ab': 'increment'},
+    ])
+    def test_invalid_tables_rejected(self, table):
+        """Missing brackets, unknown actions and duplicate opcodes raise."""
+        with pytest.raises(ValueError):
+            InstructionSet('broken', table)
+
+    def test_kernels_compiled_per_set(self):
+        """The default set uses the module kernels; variants get their own, once."""
+        assert kernel.kernels_for(BFF7).run_pair is kernel.run_pair
+        assert kernel.kernels_for(BFF) is kernel.kernels_for(get_instruction_set('bff'))
+        assert kernel.kernels_for(BFF).run_pair is not kernel.run_pair
+
+    def test_lookup(self):
+        """Names, dicts and instances resolve; unknown names raise."""
+        assert get_instruction_set('bff') is BFF
+        assert get_instruction_set(BFF.to_dict()) is BFF
+        assert get_instruction_set(PUSH.to_dict()).opcode_bytes == PUSH.opcode_bytes
+        with pytest.raises(ValueError):
+            get_instruction_set('bf')
+
+
+class TestVariantsMatchReference:
+    """Kernel and reference interpreter agree on every variant."""
+
+    @pytest.mark.parametrize('instruction_set', [BFF7, BFF, PUSH], ids=lambda s: s.name)
+    def test_instruction_dense_tapes(self, instruction_set):
+        """Tapes drawn from the set's opcodes exercise every action."""
+        rng = random.Random(13)
+        alphabet = [ord(c) for c in instruction_set.table] + [0]
+        for _ in range(300):
+            data = [rng.choice(alphabet) for _ in range(96)]
+            reference, compiled = run_both(data, instruction_set, 2000)
+            assert compiled == reference
+
+    def test_two_head_copy(self):
+        """'.' copies data -> console and ',' console -> data, heads unmoved."""
+        data = list(b'}}}}}}}}.>,') + [0] * 5
+        reference, compiled = run_both(data, BFF, 100)
+        assert compiled == reference
+        # '.' wrote byte 0 ('}') at position 8; ',' then read it back into position 1
+        assert reference[1][8] == ord('}') and reference[1][1] == ord('}')
+        assert reference[0][4:] == (1, 8)
+
+
+class TestSoupVariants:
+    """Soups run and persist their instruction set."""
+
+    def test_engines_identical(self):
+        """Both engines produce the same soup under a variant."""
+        soups = [
+            Soup(size=48, tape_length=32, seed=4, engine=engine, instruction_set='bff')
+            for engine in ('python', 'numba')
+        ]
+        for soup in soups:
+            soup.run(1500, max_ops=1000, timeout_prob=0.01)
+            soup.run_epoch(max_ops=1000)
+        assert np.array_equal(soups[0].arena, soups[1].arena)
+
+    def test_profiles_identical(self):
+        """Profiled runs count reads and writes of both heads alike."""
+        soups = [
+            Soup(size=32, tape_length=32, seed=6, engine=engine, instruction_set=PUSH,
+                 profile=True)
+            for engine in ('python', 'numba')
+        ]
+        for soup in soups:
+            soup.run(500, max_ops=1000)
+        python, numba = (soup.profile for soup in soups)
+        for counter in ('opcodes', 'loop_iterations', 'reads', 'writes', 'ops_histogram'):
+            assert np.array_equal(getattr(python, counter), getattr(numba, counter))
+
+    def test_variant_changes_dynamics(self):
+        """The same seed gives a different soup under a different set."""
+        default = Soup(size=32, tape_length=32, seed=1, engine='numba')
+        two_head = Soup(size=32, tape_length=32, seed=1, engine='numba', instruction_set='bff')
+        default.run(2000, max_ops=1000)
+        two_head.run(2000, max_ops=1000)
+        assert not np.array_equal(default.arena, two_head.arena)
+
+    def test_state_round_trip(self):
+        """Custom sets survive get_state / from_state."""
+        soup = Soup(size=16, tape_length=16, seed=2, engine='numba', instruction_set=PUSH)
+        restored = Soup.from_state(soup.get_state())
+        assert restored.instruction_set == PUSH
+        soup.run(300, max_ops=500)
+        restored.run(300, max_ops=500)
+        assert np.array_equal(soup.arena, restored.arena)
+
+    def test_old_state_defaults(self):
+        """States saved before instruction sets existed load as the default."""
+        state = Soup(size=8, tape_length=8, seed=0).get_state()
+        del state['instruction_set']
+        assert Soup.from_state(state).instruction_set is BFF7
@@ -0,0 +1,92 @@
+"""
+Tests for invasion-fitness assays.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from run_invasion import (
+    compete, dominance_matrix, seed_arenas, WIN_A, UNDECIDED
+)
+
+
+TAPE_LENGTH = 32
+# Scans to its zero terminator, then copies itself onto the partner tape
+REPLICATOR = b'[>]>,[>,]'.ljust(TAPE_LENGTH - 1, b'a') + b'\x00'
+INERT = (b'+-' * 4).ljust(TAPE_LENGTH, b'a')
+OTHER_INERT = (b'>' * 8).ljust(TAPE_LENGTH, b'b')
+
+ASSAY = dict(soup_size=16, max_interactions=5000, check_interval=100)
+
+
+class TestCompete:
+    """Single A-versus-B assays."""
+
+    def test_seed_arenas_layout(self):
+        """Copies of A, then B, then background."""
+        arenas = seed_arenas([(REPLICATOR, INERT)] * 2, 3, 2, 8, np.random.default_rng(0))
+        assert arenas.shape == (2, 8, TAPE_LENGTH)
+        assert all(row.tobytes() == REPLICATOR for row in arenas[:, :3].reshape(-1, TAPE_LENGTH))
+        assert all(row.tobytes() == INERT for row in arenas[:, 3:5].reshape(-1, TAPE_LENGTH))
+        with pytest.raises(ValueError):
+            seed_arenas([(REPLICATOR, INERT)], 5, 5, 8, np.random.default_rng(0))
+        with pytest.raises(ValueError, match='same length'):
+            seed_arenas([(REPLICATOR, INERT + b'a')], 2, 2, 8, np.random.default_rng(0))
+
+    def test_replicator_beats_inert_tape(self):
+        """A copier should exclude a non-replicating rival, stopping early."""
+        result = compete(REPLICATOR, INERT, trials=20, copies_a=4, copies_b=4, seed=0, **ASSAY)
+        assert result.wins_a == 20
+        assert np.all(result.outcomes == WIN_A)
+        assert np.all(result.decided_at < ASSAY['max_interactions'])
+        assert np.all(result.final_b == 0) and np.all(result.final_a > 0)
+
+    def test_reproducible(self):
+        """The same seed should give the same outcomes."""
+        runs = [
+            compete(REPLICATOR, INERT, trials=10, copies_a=2, copies_b=6, seed=3, **ASSAY)
+            for _ in range(2)
+        ]
+        assert np.array_equal(runs[0].outcomes, runs[1].outcomes)
+        assert np.array_equal(runs[0].decided_at, runs[1].decided_at)
+
+    def test_budget_exhausted(self):
+        """Assays without interactions stay undecided with initial counts."""
+        result = compete(REPLICATOR, INERT, trials=3, copies_a=2, copies_b=3,
+                         seed=0, soup_size=16, max_interactions=0)
+        assert np.all(result.outcomes == UNDECIDED)
+        assert result.final_a.tolist() == [2, 2, 2]
+        assert result.final_b.tolist() == [3, 3, 3]
+
+
+class TestDominanceMatrix:
+    """Pairwise competition of several replicators."""
+
+    def test_matrix(self):
+        """The replicator should dominate both inert tapes."""
+        result = dominance_matrix([REPLICATOR, INERT, OTHER_INERT], trials=10,
+                                  copies=4, seed=1, **ASSAY)
+        dominance = result['dominance']
+        assert dominance.shape == (3, 3)
+        assert np.all(np.isnan(np.diag(dominance)))
+        assert dominance[0, 1] == dominance[0, 2] == 1.0
+        assert dominance[1, 0] == dominance[2, 0] == 0.0
+        decided = result['wins'] + result['wins'].T + result['undecided'] + result['both_extinct']
+        assert np.all(decided[~np.eye(3, dtype=bool)] == 10)
+
+    def test_duplicate_canonical_forms_rejected(self):
+        """Competitors that are the same type cannot be told apart."""
+        with pytest.raises(ValueError):
+            dominance_matrix([INERT, INERT.replace(b'a', b'c')], trials=2)
+
+    def test_instruction_set(self):
+        """Canonical forms come from the assay's instruction set."""
+        braces = INERT.replace(b'a', b'{')
+        with pytest.raises(ValueError):
+            dominance_matrix([INERT, braces], trials=2)
+        result = dominance_matrix([INERT, braces], trials=2, copies=4, seed=1,
+                                  instruction_set='bff', **ASSAY)
+        assert result['dominance'].shape == (2, 2)
@@ -0,0 +1,173 @@
+"""
+Tests for the compiled BFF interpreter kernel.
+
+The kernel must be bit-identical to the reference BrainfuckInterpreter:
+same final tape bytes, operation count, flags and pointers.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import random
+
+import numpy as np
+import pytest
+from core.tape import Tape
+from core.brainfuck import BrainfuckInterpreter
+from core.soup import Soup
+from core import kernel
+
+
+def run_reference(data, max_ops):
+    """Run the reference interpreter, returning (result tuple, final bytes)."""
+    tape = Tape(length=len(data), data=data)
+    interp = BrainfuckInterpreter(tape)
+    result = interp.run_from_tape(max_ops=max_ops)
+    summary = (
+        result.operations, result.terminated, result.crashed, result.timed_out,
+        result.final_instruction_pointer, result.final_data_pointer,
+        result.final_console_pointer,
+    )
+    return summary, tape.data
+
+
+def run_kernel(data, max_ops):
+    """Run the kernel, returning (result tuple, final bytes)."""
+    buf = np.array(data, dtype=np.uint8)
+    result = kernel.execute_tape(buf, 0, max_ops)
+    return tuple(int(x) if not isinstance(x, bool) else x for x in result), buf.tolist()
+
+
+class TestKernelMatchesReference:
+    """Kernel results should match the reference interpreter exactly."""
+
+    @pytest.mark.parametrize('program', [
+        '+++',
+        '>>>+<<-',
+        '+[-]',
+        '+[>+<-]',
+        ']',
+        '[',
+        '++[>,<-]',
+        ',,,,>>>>',
+    ])
+    def test_hand_written_programs(self, program):
+        """Small programs covering every instruction and crash paths."""
+        data = [ord(c) for c in program] + [0] * (32 - len(program))
+        assert run_kernel(data, 1000) == run_reference(data, 1000)
+
+    def test_random_tapes(self):
+        """Random 128-byte pair tapes should behave identically."""
+        rng = random.Random(7)
+        for _ in range(300):
+            data = [rng.randint(0, 255) for _ in range(128)]
+            assert run_kernel(data, 500) == run_reference(data, 500)
+
+    def test_instruction_dense_tapes(self):
+        """Tapes drawn only from instruction bytes exercise loops heavily."""
+        rng = random.Random(11)
+        alphabet = [60, 62, 43, 45, 44, 91, 93, 0]
+        for _ in range(300):
+            data = [rng.choice(alphabet) for _ in range(128)]
+            assert run_kernel(data, 2000) == run_reference(data, 2000)
+
+    @pytest.mark.parametrize('data', [
+        [91, 60, 43, 62, 91, 45] + [0] * 9 + [92],
+        [91, 60, 45, 60, 91] + [0] * 10 + [93],
+    ])
+    def test_self_modified_brackets(self, data):
+        """Bracket writes should invalidate matching exactly as in the reference."""
+        assert run_kernel(data, 10000) == run_reference(data, 10000)
+
+    def test_max_ops_limit(self):
+        """Infinite loop should stop at max_ops without terminating."""
+        data = [ord(c) for c in '+[]'] + [0] * 13
+        ops, terminated, crashed, timed_out, _, _, _ = kernel.execute_tape(
+            np.array(data, dtype=np.uint8), 0, 100
+        )
+        assert ops == 100
+        assert not terminated
+        assert not crashed
+
+
+class TestSoupEngine:
+    """Test engine selection on Soup."""
+
+    def test_unknown_engine_rejected(self):
+        """Unknown engine names should raise ValueError."""
+        with pytest.raises(ValueError):
+            Soup(size=10, engine='fortran')
+
+    def test_engines_produce_identical_runs(self):
+        """Same seed should give identical soups under both engines."""
+        soup_py = Soup(size=64, tape_length=64, seed=3, engine='python')
+        soup_nb = Soup(size=64, tape_length=64, seed=3, engine='numba')
+
+        results_py = soup_py.run(num_interactions=2000, max_ops=1000)
+        results_nb = soup_nb.run(num_interactions=2000, max_ops=1000)
+
+        assert [r.operations for r in results_py] == [r.operations for r in results_nb]
+        assert [r.crashed for r in results_py] == [r.crashed for r in results_nb]
+        assert np.array_equal(soup_py.arena, soup_nb.arena)
+
+    def test_engines_identical_with_timeouts(self):
+        """Timeout budgets come from the soup RNG, so engines still agree."""
+        soup_py = Soup(size=64, tape_length=64, seed=5, engine='python')
+        soup_nb = Soup(size=64, tape_length=64, seed=5, engine='numba')
+
+        results_py = soup_py.run(num_interactions=2000, max_ops=1000, timeout_prob=0.01)
+        results_nb = soup_nb.run(num_interactions=2000, max_ops=1000, timeout_prob=0.01)
+
+        assert [r.operations for r in results_py] == [r.operations for r in results_nb]
+        assert [r.timed_out for r in results_py] == [r.timed_out for r in results_nb]
+        assert any(r.timed_out for r in results_py)
+        assert np.array_equal(soup_py.arena, soup_nb.arena)
+
+    def test_fast_path_matches_interact_once(self):
+        """Batched numba run should match one-at-a-time interactions."""
+        batched = Soup(size=64, tape_length=64, seed=9, engine='numba')
+        single = Soup(size=64, tape_length=64, seed=9, engine='numba')
+
+        results = batched.run(num_interactions=500, max_ops=1000, timeout_prob=0.01)
+        expected = [single.interact_once(max_ops=1000, timeout_prob=0.01) for _ in range(500)]
+
+        assert [r.operations for r in results] == [r.operations for r in expected]
+        assert [r.timed_out for r in results] == [r.timed_out for r in expected]
+        assert np.array_equal(batched.arena, single.arena)
+
+    def test_engine_survives_state_round_trip(self):
+        """Engine choice should be restored from saved state."""
+        soup = Soup(size=10, seed=1, engine='numba')
+        restored = Soup.from_state(soup.get_state())
+        assert restored.engine == 'numba'
+
+
+class TestSoupBatches:
+    """Kernels over a stack of independent soups."""
+
+    def test_run_soups_matches_sequence(self):
+        """Each active soup should run its pairs in order; inactive ones are skipped."""
+        rng = np.random.default_rng(5)
+        arenas = rng.integers(0, 256, size=(4, 8, 16), dtype=np.uint8)
+        idx1 = rng.integers(0, 8, size=(4, 50))
+        idx2 = (idx1 + rng.integers(1, 8, size=(4, 50))) % 8
+        active = np.array([True, False, True, True])
+
+        expected = arenas.copy()
+        for s in (0, 2, 3):
+            budgets = np.full(50, 500, dtype=np.int64)
+            kernel.run_sequence(expected[s], idx1[s], idx2[s], budgets, 500,
+                                np.empty(50, np.int64), np.empty(50, np.uint8))
+        kernel.run_soups(arenas, idx1, idx2, active, 500)
+        assert np.array_equal(arenas, expected)
+
+    def test_canonical_fingerprints_ignore_data_bytes(self):
+        """Tapes with the same instruction bytes share a fingerprint."""
+        arenas = np.frombuffer(
+            b'ab[<]c' + b'[x<]yz' + b'[<]+aa' + b'zzzzzz', dtype=np.uint8
+        ).reshape(1, 4, 6).copy()
+        out = np.empty((1, 4), dtype=np.uint64)
+        kernel.canonical_fingerprints(arenas, out)
+        assert out[0, 0] == out[0, 1]
+        assert len(set(out[0].tolist())) == 3
@@ -0,0 +1,97 @@
+"""
+Tests for soup movie rendering.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from PIL import Image
+from core.soup import Soup
+from core.checkpoint import save_checkpoint
+from core.instruction_set import BFF
+from core.recorder import SnapshotRecorder
+from core.tape import INSTRUCTION_MASK
+from analysis.movie import byte_palette, family_order, layout_frame, render_frame, render_movie
+
+
+REPLICATOR = np.frombuffer(b'[>]>,[>,]'.ljust(31, b'a') + b'\x00', dtype=np.uint8)
+
+
+def seeded_soup(seed=0, mutation_rate=0.0):
+    """A random 64 x 32 soup with replicator copies on every fourth tape."""
+    soup = Soup(size=64, tape_length=32, seed=seed, mutation_rate=mutation_rate)
+    soup.arena[::4] = REPLICATOR
+    soup.refresh_fingerprints()
+    return soup
+
+
+class TestFrames:
+    """Palette, layout and family ordering."""
+
+    def test_palette_highlights_instructions(self):
+        """Instruction bytes are bright and coloured; data bytes are dim greys."""
+        palette = byte_palette().astype(int)
+        data = palette[~INSTRUCTION_MASK]
+        assert np.all(data[:, 0] == data[:, 1]) and data.max() < 80
+        assert palette[INSTRUCTION_MASK].max(axis=1).min() >= 200
+        assert len({tuple(color) for color in palette[INSTRUCTION_MASK]}) == 7
+        assert byte_palette(BFF)[ord('{')].min() < 200 <= byte_palette(BFF)[ord('{')].max()
+        assert palette[ord('{')].max() < 80
+
+    def test_layout(self):
+        """Columns tile consecutive tapes side by side; scale repeats pixels."""
+        arena = np.arange(8 * 4, dtype=np.uint8).reshape(8, 4)
+        image = layout_frame(arena, columns=2, scale=3)
+        assert image.shape == (12, 24)
+        assert np.array_equal(image[::3, ::3][:, 4:], arena[4:])
+        with pytest.raises(ValueError):
+            layout_frame(arena, columns=3)
+        rgb = render_frame(arena)
+        assert rgb.shape == (8, 4, 3) and np.array_equal(rgb, byte_palette()[arena])
+
+    def test_family_order_groups_replicators(self):
+        """Family members come first, identical copies in adjacent rows."""
+        soup = seeded_soup()
+        order = family_order(soup.arena)
+        assert np.array_equal(np.sort(order), np.arange(64))
+        assert np.all(soup.arena[order[:16]] == REPLICATOR)
+
+
+class TestMovies:
+    """Rendering series of snapshots and checkpoints."""
+
+    @staticmethod
+    def record_snapshots(path, frames=6):
+        """Record a mutating seeded soup every 200 interactions."""
+        soup = seeded_soup(mutation_rate=1e-3)
+        with SnapshotRecorder(path, soup.size, soup.tape_length,
+                              extra={'config': {'instruction_set': 'bff7'}}) as recorder:
+            for _ in range(frames):
+                soup.run(200)
+                recorder.record(soup)
+        return soup
+
+    def test_png_frames_from_checkpoints(self, tmp_path):
+        """Worker processes write one PNG per checkpoint, in order."""
+        soup = seeded_soup()
+        for number in range(4):
+            soup.run(200)
+            save_checkpoint(tmp_path / f"step_{number}.ckpt", soup)
+        output = render_movie(tmp_path, tmp_path / 'frames', family_sort=True, workers=2)
+        frames = sorted(output.glob('frame_*.png'))
+        assert len(frames) == 4
+        last = np.asarray(Image.open(frames[-1]).convert('RGB'))
+        assert np.array_equal(last, render_frame(soup.arena, family_sort=True))
+
+    def test_gif_from_snapshots(self, tmp_path):
+        """A GIF has one lossless palette frame per recorded snapshot."""
+        soup = self.record_snapshots(tmp_path / 'run.snap')
+        output = render_movie(tmp_path / 'run.snap', tmp_path / 'movie.gif', columns=2)
+        with Image.open(output) as gif:
+            assert gif.n_frames == 6
+            gif.seek(5)
+            rgb = np.asarray(gif.convert('RGB'))
+        assert np.array_equal(rgb, render_frame(soup.arena, columns=2))
@@ -0,0 +1,140 @@
+"""
+Tests for instruction-level execution profiling.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import random
+
+import numpy as np
+import pytest
+from core.tape import Tape
+from core.brainfuck import BrainfuckInterpreter
+from core.profiling import ExecutionProfile
+from core.soup import Soup
+from core import kernel
+
+
+def profile_reference(data, max_ops):
+    profile = ExecutionProfile(len(data))
+    interp = BrainfuckInterpreter(Tape(length=len(data), data=data), profile=profile)
+    result = interp.run_from_tape(max_ops=max_ops)
+    return profile, result
+
+
+def profile_kernel(data, max_ops):
+    profile = ExecutionProfile(len(data))
+    buf = np.array(data, dtype=np.uint8)
+    result = kernel.execute_tape_profiled(
+        buf, 0, max_ops, profile.opcodes, profile.loop_iterations,
+        profile.reads, profile.writes, profile.ops_histogram
+    )
+    profile.interactions += 1
+    return profile, result
+
+
+def assert_profiles_equal(a, b):
+    assert a.interactions == b.interactions
+    for name in ('opcodes', 'loop_iterations', 'reads', 'writes', 'ops_histogram'):
+        assert np.array_equal(getattr(a, name), getattr(b, name)), name
+
+
+class TestInterpreterProfile:
+    """Test counters collected by the reference interpreter."""
+
+    def test_simple_loop(self):
+        """'<++[-]' should count opcodes, loop iterations and reads/writes."""
+        data = [ord(c) for c in '<++[-]'] + [0] * 10
+        profile, result = profile_reference(data, 1000)
+
+        assert profile.opcodes[ord('<')] == 1
+        assert profile.opcodes[ord('+')] == 2
+        assert profile.opcodes[ord('-')] == 2
+        assert profile.opcodes[ord('[')] == 1
+        assert profile.opcodes[ord(']')] == 2
+        assert profile.operations == result.operations
+        # One backward jump from the ] at position 5
+        assert profile.loop_iterations[5] == 1
+        assert profile.loop_iterations.sum() == 1
+        # Everything operates on the last byte (data pointer wrapped left)
+        assert profile.writes[15] == 4
+        assert profile.reads[15] == 7
+        assert profile.writes.sum() == 4
+        assert profile.ops_histogram.sum() == 1
+
+    def test_copy_reads_console_byte(self):
+        """',' should read at the console pointer and write at the data pointer."""
+        data = [ord(c) for c in '>,'] + [0] * 6
+        profile, _ = profile_reference(data, 100)
+        assert profile.writes[1] == 1
+        assert profile.reads[0] == 1
+
+    def test_length_mismatch_rejected(self):
+        """A profile must cover the interpreter's tape."""
+        with pytest.raises(ValueError):
+            BrainfuckInterpreter(Tape(length=16), profile=ExecutionProfile(32))
+
+    def test_summary(self):
+        """Summary should be JSON-friendly and consistent."""
+        data = [ord(c) for c in '<++[-]'] + [0] * 10
+        profile, _ = profile_reference(data, 1000)
+        summary = profile.summary()
+        assert summary['operations'] == 8
+        assert summary['opcodes']['+'] == 2
+        assert sum(summary['opcode_fractions'].values()) == pytest.approx(1.0)
+        assert summary['hot_loops'] == [(5, 1)]
+
+
+class TestKernelProfile:
+    """The kernel should collect exactly the reference counters."""
+
+    def test_random_tapes(self):
+        """Profiles should match on random and instruction-dense tapes."""
+        rng = random.Random(5)
+        alphabet = [60, 62, 43, 45, 44, 91, 93, 0]
+        for trial in range(200):
+            if trial % 2:
+                data = [rng.choice(alphabet) for _ in range(64)]
+            else:
+                data = [rng.randint(0, 255) for _ in range(64)]
+            ref_profile, ref_result = profile_reference(data, 2000)
+            k_profile, k_result = profile_kernel(data, 2000)
+            assert_profiles_equal(ref_profile, k_profile)
+            assert k_result[0] == ref_result.operations
+
+
+class TestSoupProfile:
+    """Test profiling through Soup."""
+
+    def test_disabled_by_default(self):
+        """Soups should not profile unless asked."""
+        assert Soup(size=8, seed=1).profile_summary() is None
+
+    def test_engines_agree(self):
+        """Both engines should build identical profiles for the same run."""
+        soups = [Soup(size=32, seed=2, engine=e, profile=True) for e in ('python', 'numba')]
+        for soup in soups:
+            soup.run(300, max_ops=1000, results='stats')
+            soup.run_epoch(max_ops=1000)
+        assert_profiles_equal(soups[0].profile, soups[1].profile)
+        assert soups[0].profile.interactions == 316
+
+    def test_profiling_does_not_change_results(self):
+        """Profiled and unprofiled soups should evolve identically."""
+        plain = Soup(size=32, seed=3, engine='numba')
+        profiled = Soup(size=32, seed=3, engine='numba', profile=True)
+        stats_plain = plain.run(500, max_ops=1000, results='stats')
+        stats_profiled = profiled.run(500, max_ops=1000, results='stats')
+        assert np.array_equal(plain.arena, profiled.arena)
+        assert stats_profiled.ops_sum == stats_plain.ops_sum == profiled.profile.operations
+
+    def test_summary_covers_instruction_set(self):
+        """Summaries report every opcode of the soup's instruction set."""
+        soup = Soup(size=64, seed=4, engine='numba', profile=True, instruction_set='bff')
+        soup.run(2000, max_ops=1000, results='stats')
+        summary = soup.profile_summary()
+        assert set(summary['opcodes']) == set('<>{}+-.,[]')
+        assert sum(summary['opcodes'].values()) == summary['operations']
+        assert sum(summary['opcode_fractions'].values()) == pytest.approx(1.0)
@@ -0,0 +1,179 @@
+"""
+Tests for interaction provenance logs and transmission analysis.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core.soup import Soup
+from core.provenance import ProvenanceLog, read_provenance, provenance_dtype
+from core.recorder import SnapshotRecorder, SnapshotReader
+from analysis.provenance import (
+    contact_graph, motif_carriers, carrier_frames, trace_spread,
+    offspring_counts, trace_lineage
+)
+
+
+def _records(pairs):
+    """Provenance records from a list of (idx1, idx2) pairs."""
+    records = np.zeros(len(pairs), dtype=provenance_dtype(16))
+    records['idx1'] = [a for a, _ in pairs]
+    records['idx2'] = [b for _, b in pairs]
+    return records
+
+
+class TestProvenanceLog:
+    """Soups should log every interaction in order."""
+
+    @pytest.mark.parametrize('engine,mutation_rate', [
+        ('numba', 0.0), ('numba', 0.01), ('python', 0.0)
+    ])
+    def test_log_matches_records(self, tmp_path, engine, mutation_rate):
+        """Logged records should equal the run's own records."""
+        soup = Soup(size=32, tape_length=16, mutation_rate=mutation_rate,
+                    seed=1, engine=engine)
+        soup.provenance = ProvenanceLog(tmp_path / 'run.prov', soup.size, buffer_records=64)
+        expected = soup.run(300, max_ops=500, results='records').data
+        soup.provenance.close()
+
+        records, header = read_provenance(tmp_path / 'run.prov')
+        assert header['size'] == 32
+        assert records.dtype == provenance_dtype(32)
+        assert np.array_equal(records['idx1'], expected['idx1'])
+        assert np.array_equal(records['idx2'], expected['idx2'])
+        assert np.array_equal(records['ops'], expected['operations'])
+        assert np.array_equal(records['flags'], expected['flags'])
+
+    def test_epochs_and_single_interactions_logged(self, tmp_path):
+        """run_epoch and interact_once should log as well."""
+        soup = Soup(size=20, tape_length=16, seed=2, engine='numba')
+        soup.provenance = ProvenanceLog(tmp_path / 'run.prov', soup.size)
+        soup.run_epoch(max_ops=500)
+        soup.interact_once(max_ops=500)
+        soup.provenance.close()
+
+        records, _ = read_provenance(tmp_path / 'run.prov')
+        assert len(records) == soup.interaction_count == 11
+
+    def test_wide_indices_and_saturated_ops(self, tmp_path):
+        """Large soups use 32-bit indices; ops saturate at 16 bits."""
+        assert provenance_dtype(70000)['idx1'] == np.dtype('<u4')
+        with ProvenanceLog(tmp_path / 'run.prov', 70000) as log:
+            log.append_one(69999, 5, 100000, 0)
+        records, _ = read_provenance(tmp_path / 'run.prov')
+        assert records[0]['idx1'] == 69999
+        assert records[0]['ops'] == 0xFFFF
+
+    def test_append_and_truncate(self, tmp_path):
+        """Reopened logs continue; truncate drops records past a resume point."""
+        path = tmp_path / 'run.prov'
+        with ProvenanceLog(path, 16, start_interaction=100) as log:
+            log.append(np.arange(10), np.arange(10), np.zeros(10), np.zeros(10))
+        with ProvenanceLog(path, 16, append=True) as log:
+            assert len(log) == 10
+            log.truncate(104)
+            log.append_one(7, 8, 0, 0)
+
+        records, header = read_provenance(path)
+        assert header['start_interaction'] == 100
+        assert records['idx1'].tolist() == [0, 1, 2, 3, 7]
+
+    def test_bad_magic_rejected(self, tmp_path):
+        """Non-log files should raise ValueError."""
+        path = tmp_path / 'bogus.prov'
+        path.write_bytes(b'nothing here')
+        with pytest.raises(ValueError):
+            read_provenance(path)
+
+
+class TestContactGraph:
+    """Pairings should aggregate per unordered tape pair."""
+
+    def test_counts_and_times(self):
+        """Counts, first and last meetings should be per pair."""
+        records = _records([(1, 2), (3, 0), (2, 1), (0, 3), (1, 2)])
+        contacts = contact_graph(records, size=16, start_interaction=10)
+
+        assert contacts['tape_a'].tolist() == [0, 1]
+        assert contacts['tape_b'].tolist() == [3, 2]
+        assert contacts['count'].tolist() == [2, 3]
+        assert contacts['first'].tolist() == [12, 11]
+        assert contacts['last'].tolist() == [14, 15]
+
+    def test_sparse_path_matches_dense(self):
+        """Soups too large for the dense pair table should agree."""
+        rng = np.random.default_rng(0)
+        records = np.zeros(5000, dtype=provenance_dtype(5000))
+        records['idx1'] = rng.integers(0, 40, 5000)
+        records['idx2'] = rng.integers(0, 40, 5000)
+        dense = contact_graph(records, size=40)
+        sparse = contact_graph(records, size=5000)
+        for field in ('count', 'first', 'last'):
+            assert np.array_equal(dense[field], sparse[field])
+        assert np.array_equal(dense['tape_a'], sparse['tape_a'])
+
+
+class TestTraceSpread:
+    """New carriers should be attributed to carrier contacts."""
+
+    def test_motif_carriers(self):
+        """Tapes containing the motif anywhere should be marked."""
+        arena = np.zeros((3, 8), dtype=np.uint8)
+        arena[0, 5:8] = [1, 2, 3]
+        arena[2, 0:3] = [1, 2, 3]
+        arena[1, 0:2] = [1, 2]
+        assert motif_carriers(arena, bytes([1, 2, 3])).tolist() == [True, False, True]
+
+    def test_attribution(self):
+        """Infections come from the last established-carrier contact."""
+        carriers = np.zeros((2, 16), dtype=bool)
+        carriers[0, 0] = True
+        carriers[1, [0, 1, 2, 3, 9]] = True
+        records = _records([
+            (1, 0),   # 1: tape 1 meets carrier 0
+            (5, 1),   # 2: unrelated partner
+            (0, 1),   # 3: tape 1 meets carrier 0 again (chosen)
+            (2, 1),   # 4: tape 2 only meets new carrier 1
+            (3, 4),   # 5: tape 3 never meets a carrier
+        ])
+        events = trace_spread(records, [0, 5], carriers)
+
+        attributed = {int(e['target']): (int(e['interaction']), int(e['source'])) for e in events}
+        assert attributed == {1: (3, 0), 2: (4, 1), 3: (5, -1), 9: (5, -1)}
+        assert offspring_counts(events, 16)[[0, 1]].tolist() == [1, 1]
+        assert trace_lineage(events, 2) == [(3, 0, 1), (4, 1, 2)]
+
+    def test_records_before_first_frame_ignored(self):
+        """Interactions outside the frame windows should not count."""
+        carriers = np.zeros((2, 16), dtype=bool)
+        carriers[:, 0] = True
+        carriers[1, 1] = True
+        events = trace_spread(_records([(0, 1), (5, 6)]), [1, 2], carriers)
+        assert events['source'].tolist() == [-1]
+
+    def test_soup_run_end_to_end(self, tmp_path):
+        """Snapshots plus a log should explain every new carrier."""
+        soup = Soup(size=64, tape_length=16, seed=3, engine='numba')
+        soup.provenance = ProvenanceLog(tmp_path / 'run.prov', soup.size)
+        with SnapshotRecorder(tmp_path / 'run.snap', soup.size, soup.tape_length) as recorder:
+            recorder.record(soup)
+            for _ in range(5):
+                soup.run(200, max_ops=500, results='stats')
+                recorder.record(soup)
+        soup.provenance.close()
+
+        records, header = read_provenance(tmp_path / 'run.prov')
+        snapshots = SnapshotReader(tmp_path / 'run.snap')
+        motif = bytes(snapshots[0][0, :2])
+        interactions, carriers = carrier_frames(snapshots, motif)
+        events = trace_spread(records, interactions, carriers, header['start_interaction'])
+
+        new = carriers[1:] & ~carriers[:-1]
+        assert events.shape[0] == new.sum()
+        assert np.all(np.diff(events['interaction']) >= 0)
+        known = events['source'] >= 0
+        assert np.all(carriers[-1][events['target']])
+        assert np.all(events['source'][known] != events['target'][known])
@@ -0,0 +1,108 @@
+"""
+Tests for soup snapshot files.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core.soup import Soup
+from core.recorder import SnapshotRecorder, SnapshotReader
+
+
+def _record_run(path, soup, frames, interval):
+    """Record ``frames`` snapshots, ``interval`` interactions apart."""
+    arenas = []
+    with SnapshotRecorder(path, soup.size, soup.tape_length, extra={'seed': 1}) as recorder:
+        for _ in range(frames):
+            soup.run(interval, max_ops=500, results='stats')
+            recorder.record(soup)
+            arenas.append(soup.arena.copy())
+    return arenas
+
+
+class TestSnapshotRoundTrip:
+    """Recorded frames should read back exactly."""
+
+    def test_frames_and_index(self, tmp_path):
+        """Every frame and its interaction count should be recoverable."""
+        soup = Soup(size=32, tape_length=16, seed=1, engine='numba')
+        arenas = _record_run(tmp_path / 'run.snap', soup, frames=5, interval=100)
+
+        reader = SnapshotReader(tmp_path / 'run.snap')
+        assert len(reader) == 5
+        assert reader.extra == {'seed': 1}
+        assert reader.interactions.tolist() == [100, 200, 300, 400, 500]
+        for frame, arena in zip(reader, arenas):
+            assert np.array_equal(frame, arena)
+        assert np.array_equal(reader[-1], arenas[-1])
+        assert reader[1:3].shape == (2, 32, 16)
+
+    def test_frames_are_memory_mapped(self, tmp_path):
+        """Frames should be read-only views, not copies."""
+        soup = Soup(size=8, tape_length=8, seed=2)
+        _record_run(tmp_path / 'run.snap', soup, frames=2, interval=10)
+
+        reader = SnapshotReader(tmp_path / 'run.snap')
+        frame = reader[0]
+        assert np.shares_memory(frame, reader[0:1])
+        assert not np.shares_memory(frame, reader[1:])
+        assert not frame.flags.writeable
+
+    def test_lookup_by_interaction(self, tmp_path):
+        """at() should return the last frame at or before a count."""
+        soup = Soup(size=16, tape_length=16, seed=3)
+        arenas = _record_run(tmp_path / 'run.snap', soup, frames=3, interval=50)
+
+        reader = SnapshotReader(tmp_path / 'run.snap')
+        assert np.array_equal(reader.at(149), arenas[1])
+        assert np.array_equal(reader.at(150), arenas[2])
+        with pytest.raises(IndexError):
+            reader.at(10)
+
+    def test_bad_magic_rejected(self, tmp_path):
+        """Non-snapshot files should raise ValueError."""
+        path = tmp_path / 'bogus.snap'
+        path.write_bytes(b'not a snapshot file')
+        with pytest.raises(ValueError):
+            SnapshotReader(path)
+
+
+class TestSnapshotAppend:
+    """Reopening a snapshot file should continue it."""
+
+    def test_torn_frame_ignored_and_dropped(self, tmp_path):
+        """A partially written last frame should not be visible or kept."""
+        path = tmp_path / 'run.snap'
+        soup = Soup(size=8, tape_length=8, seed=4)
+        _record_run(path, soup, frames=3, interval=10)
+        with open(path, 'ab') as f:
+            f.write(b'\x00' * 20)
+
+        assert len(SnapshotReader(path)) == 3
+        with SnapshotRecorder(path, 8, 8, append=True) as recorder:
+            assert len(recorder) == 3
+            soup.run(10, max_ops=500)
+            recorder.record(soup)
+
+        reader = SnapshotReader(path)
+        assert reader.interactions.tolist() == [10, 20, 30, 40]
+        assert np.array_equal(reader[-1], soup.arena)
+
+    def test_truncate_after_interaction(self, tmp_path):
+        """truncate() should drop frames newer than a resume point."""
+        path = tmp_path / 'run.snap'
+        _record_run(path, Soup(size=8, tape_length=8, seed=5), frames=4, interval=10)
+
+        with SnapshotRecorder(path, 8, 8, append=True) as recorder:
+            recorder.truncate(25)
+        assert SnapshotReader(path).interactions.tolist() == [10, 20]
+
+    def test_shape_mismatch_rejected(self, tmp_path):
+        """Appending frames of another soup shape should raise ValueError."""
+        path = tmp_path / 'run.snap'
+        _record_run(path, Soup(size=8, tape_length=8, seed=6), frames=1, interval=10)
+        with pytest.raises(ValueError):
+            SnapshotRecorder(path, 16, 8, append=True)
@@ -0,0 +1,128 @@
+"""
+Tests for replicator detection and family tracking.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core.soup import Soup
+from analysis.replicators import (
+    KmerIndex, ReplicatorTracker, find_families, kmer_hashes, kmer_instruction_counts
+)
+
+
+MOTIF_A = np.frombuffer(b'[[<,]>+[-]<<]', dtype=np.uint8)
+MOTIF_B = np.frombuffer(b'+++[>,<-]>>,,', dtype=np.uint8)
+
+
+def planted_arena(copies_a=40, copies_b=15, seed=0):
+    """Random soup with two motifs planted at random offsets."""
+    arena = Soup(size=256, tape_length=64, seed=seed).arena.copy()
+    rng = np.random.default_rng(seed)
+    for tape in range(copies_a):
+        offset = rng.integers(0, 64 - MOTIF_A.shape[0])
+        arena[tape, offset:offset + MOTIF_A.shape[0]] = MOTIF_A
+    for tape in range(100, 100 + copies_b):
+        offset = rng.integers(0, 64 - MOTIF_B.shape[0])
+        arena[tape, offset:offset + MOTIF_B.shape[0]] = MOTIF_B
+    return arena
+
+
+class TestKmerIndex:
+    """Test k-mer hashing and indexing."""
+
+    def test_equal_windows_hash_equal(self):
+        """The same bytes at different offsets should hash identically."""
+        arena = np.zeros((2, 16), dtype=np.uint8)
+        arena[0, 1:5] = [1, 2, 3, 4]
+        arena[1, 9:13] = [1, 2, 3, 4]
+        hashes = kmer_hashes(arena, 4)
+        assert hashes[0, 1] == hashes[1, 9]
+        assert hashes[0, 0] != hashes[0, 1]
+
+    def test_instruction_counts(self):
+        """Window instruction counts should match a direct count."""
+        arena = planted_arena()
+        counts = kmer_instruction_counts(arena, 8)
+        from core.tape import INSTRUCTION_MASK
+        assert counts[3, 10] == INSTRUCTION_MASK[arena[3, 10:18]].sum()
+
+    def test_tapes_with_motif_kmer(self):
+        """A planted k-mer should be found in every tape carrying it."""
+        arena = planted_arena()
+        index = KmerIndex(arena, k=8)
+        motif_hash = kmer_hashes(MOTIF_A[None, :8], 8)[0, 0]
+        assert set(index.tapes_with(motif_hash).tolist()) == set(range(40))
+
+    def test_k_too_large(self):
+        """k longer than a tape should raise ValueError."""
+        with pytest.raises(ValueError):
+            kmer_hashes(np.zeros((2, 4), dtype=np.uint8), 8)
+
+
+class TestFindFamilies:
+    """Test clustering tapes into replicator families."""
+
+    def test_random_soup_has_no_families(self):
+        """Random tapes share no instruction-rich k-mers."""
+        assert find_families(Soup(size=256, seed=1).arena) == []
+
+    def test_planted_motifs_form_families(self):
+        """Shifted copies of each motif should cluster into one family each."""
+        families = find_families(planted_arena())
+        assert len(families) == 2
+        assert families[0].abundance == 40
+        assert families[1].abundance == 15
+        assert set(families[0].tapes.tolist()) == set(range(40))
+        assert families[0].motif in MOTIF_A.tobytes()
+        assert families[1].motif in MOTIF_B.tobytes()
+
+    def test_instruction_set(self):
+        """Opcodes of the soup's instruction set decide which k-mers are indexed."""
+        arena = Soup(size=64, tape_length=32, seed=2).arena.copy()
+        arena[:10, 4:16] = np.frombuffer(b'{.}{.}{.}{.}', dtype=np.uint8)
+        assert find_families(arena) == []
+        families = find_families(arena, instruction_set='bff')
+        assert set(families[0].tapes.tolist()) == set(range(10))
+
+
+class TestReplicatorTracker:
+    """Test family identity and abundance over time."""
+
+    def test_ids_persist_and_abundance_table(self):
+        """Families should keep their ids as their abundance changes."""
+        tracker = ReplicatorTracker()
+        arena = planted_arena()
+        tracker.update(arena, 0)
+
+        # Family B takes over half of family A's tapes
+        arena[:20] = arena[100]
+        families = tracker.update(arena, 1000)
+        assert {f.family_id: f.abundance for f in families} == {0: 20, 1: 35}
+
+        interactions, family_ids, counts = tracker.abundance()
+        assert interactions.tolist() == [0, 1000]
+        assert family_ids.tolist() == [0, 1]
+        assert counts.tolist() == [[40, 15], [20, 35]]
+
+    def test_new_family_gets_new_id(self):
+        """A family unrelated to earlier ones should get a fresh id."""
+        tracker = ReplicatorTracker()
+        arena = planted_arena(copies_b=0)
+        tracker.update(arena, 0)
+        families = tracker.update(planted_arena(copies_a=0), 1)
+        assert [f.family_id for f in families] == [1]
+
+    def test_state_round_trip(self):
+        """A restored tracker should continue assigning the same ids."""
+        tracker = ReplicatorTracker()
+        tracker.update(planted_arena(), 0)
+        restored = ReplicatorTracker.from_state(tracker.get_state())
+
+        arena = planted_arena(seed=3)
+        expected = [(f.family_id, f.abundance) for f in tracker.update(arena, 1)]
+        assert [(f.family_id, f.abundance) for f in restored.update(arena, 1)] == expected
+        assert restored.history == tracker.history
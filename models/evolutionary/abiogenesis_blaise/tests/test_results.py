@@ -0,0 +1,110 @@
+"""
+Tests for compact interaction result containers.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core.soup import Soup
+from core.results import (
+    InteractionRecords, RunningStats, INTERACTION_DTYPE, pack_flags, ops_bin,
+    records_from_list
+)
+from core.kernel import FLAG_TERMINATED, FLAG_CRASHED, FLAG_TIMED_OUT
+
+
+class TestInteractionRecords:
+    """Test the preallocated record array."""
+
+    def test_record_size(self):
+        """Each record should take 13 bytes."""
+        assert INTERACTION_DTYPE.itemsize == 13
+
+    def test_append_and_masks(self):
+        """Appended rows should be readable back with flag masks."""
+        records = InteractionRecords(4)
+        records.append(
+            np.array([5, 0, 7]), np.array([1, 2, 3]), np.array([4, 5, 6]),
+            np.array([FLAG_TERMINATED, FLAG_CRASHED, FLAG_TIMED_OUT], dtype=np.uint8)
+        )
+        assert len(records) == 3
+        assert records.operations.tolist() == [5, 0, 7]
+        assert records.terminated.tolist() == [True, False, False]
+        assert records.crashed.tolist() == [False, True, False]
+        assert records.timed_out.tolist() == [False, False, True]
+
+    def test_overflow_rejected(self):
+        """Appending past capacity should raise ValueError."""
+        records = InteractionRecords(1)
+        with pytest.raises(ValueError):
+            records.append(np.zeros(2), np.zeros(2), np.zeros(2), np.zeros(2, dtype=np.uint8))
+
+
+class TestRunningStats:
+    """Test constant-memory aggregates."""
+
+    def test_aggregates(self):
+        """Counts, mean, max and histogram should match the batch."""
+        stats = RunningStats()
+        stats.update(np.array([0, 1, 3, 1000]), np.array([1, 2, 1, 4], dtype=np.uint8))
+        stats.update(np.array([2]), np.array([0], dtype=np.uint8))
+        assert stats.count == 5
+        assert stats.ops_mean == pytest.approx(1006 / 5)
+        assert stats.ops_max == 1000
+        assert (stats.terminated, stats.crashed, stats.timed_out) == (2, 1, 1)
+        assert stats.ops_histogram.sum() == 5
+        assert stats.ops_histogram[0] == 1
+        assert stats.ops_histogram[2] == 2  # 2 and 3 ops
+
+    def test_ops_bin(self):
+        """Bins should be 0 for 0 ops and floor(log2)+1 otherwise."""
+        assert ops_bin(np.array([0, 1, 2, 3, 4, 1023, 1024])).tolist() == [0, 1, 2, 2, 3, 10, 11]
+
+
+class TestSoupResultModes:
+    """Compact modes should record exactly what list mode returns."""
+
+    @pytest.mark.parametrize('engine', ['python', 'numba'])
+    @pytest.mark.parametrize('mutation_rate', [0.0, 0.01])
+    def test_records_match_list(self, engine, mutation_rate):
+        """Same seed should give identical outcomes in list and records mode."""
+        soup_list = Soup(size=32, seed=5, mutation_rate=mutation_rate, engine=engine)
+        soup_rec = Soup(size=32, seed=5, mutation_rate=mutation_rate, engine=engine)
+
+        expected = records_from_list(soup_list.run(500, max_ops=1000))
+        records = soup_rec.run(500, max_ops=1000, results='records')
+
+        assert np.array_equal(records.data, expected.data)
+        assert np.array_equal(soup_rec.arena, soup_list.arena)
+        assert np.array_equal(soup_rec.get_fingerprints(), soup_list.get_fingerprints())
+        assert soup_rec.interaction_count == 500
+
+    def test_stats_mode(self):
+        """Stats mode should aggregate the same interactions."""
+        soup_list = Soup(size=32, seed=6, engine='numba')
+        soup_stats = Soup(size=32, seed=6, engine='numba')
+        results = soup_list.run(300, max_ops=1000)
+        stats = soup_stats.run(300, max_ops=1000, results='stats')
+        assert stats.count == 300
+        assert stats.ops_sum == sum(r.operations for r in results)
+        assert stats.crashed == sum(r.crashed for r in results)
+
+    def test_epoch_records(self):
+        """run_epoch should support records mode with timeout flags."""
+        soup_list = Soup(size=32, seed=8)
+        soup_rec = Soup(size=32, seed=8)
+        expected = records_from_list(soup_list.run_epoch(max_ops=1000, timeout_prob=0.01))
+        records = soup_rec.run_epoch(max_ops=1000, timeout_prob=0.01, results='records')
+        assert np.array_equal(records.data, expected.data)
+
+    def test_unknown_mode_rejected(self):
+        """Unknown result modes should raise ValueError."""
+        with pytest.raises(ValueError):
+            Soup(size=8, seed=1).run(10, results='dataframe')
+
+    def test_pack_flags(self):
+        """pack_flags should combine outcome bits."""
+        assert pack_flags(True, False, True) == FLAG_TERMINATED | FLAG_TIMED_OUT
@@ -0,0 +1,98 @@
+"""
+Tests for the shared-memory multi-process soup runner.
+
+The runner must reproduce Soup.run_epoch exactly, since workers only
+execute pairs the coordinator has already drawn.
+"""
+
+import os
+import sys
+from multiprocessing import context
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core.soup import Soup
+from core.shared_soup import SharedSoupRunner, EpochStats
+
+
+class TestSharedSoupRunner:
+    """Test multi-process epoch execution on shared memory."""
+
+    def test_matches_in_process_epochs(self):
+        """Two workers should produce the same soup as run_epoch."""
+        reference = Soup(size=128, tape_length=64, seed=9, engine='numba')
+        expected = [
+            reference.run_epoch(max_ops=1000, timeout_prob=0.01, results='records').operations
+            for _ in range(5)
+        ]
+
+        soup = Soup(size=128, tape_length=64, seed=9)
+        with SharedSoupRunner(soup, num_workers=2, max_ops=1000,
+                              timeout_prob=0.01, batch_pairs=16) as runner:
+            stats = [runner.run_epoch() for _ in range(5)]
+
+        assert np.array_equal(soup.arena, reference.arena)
+        assert soup.interaction_count == reference.interaction_count
+        assert all(s.interactions == 64 for s in stats)
+        for epoch, operations in zip(stats, expected):
+            assert np.array_equal(epoch.operations, operations)
+            assert epoch.ops_sum == operations.sum()
+
+    def test_arena_is_private_after_close(self):
+        """Soup should stay usable once the runner has released shared memory."""
+        soup = Soup(size=32, tape_length=64, seed=1)
+        with SharedSoupRunner(soup, num_workers=1, max_ops=500) as runner:
+            runner.run_epoch()
+
+        soup.run(num_interactions=10, max_ops=500)
+        assert soup.interaction_count == 16 + 10
+
+    def test_dead_worker_raises(self):
+        """A worker that dies mid-run should raise instead of hanging."""
+        soup = Soup(size=32, tape_length=64, seed=1)
+        with SharedSoupRunner(soup, num_workers=1, max_ops=500) as runner:
+            runner.run_epoch()
+            worker = runner._workers[0]
+            worker.terminate()
+            worker.join()
+            with pytest.raises(RuntimeError, match='exited'):
+                runner.run_epoch()
+        assert soup.arena.flags.owndata
+
+    def test_failed_start_releases_shared_memory(self, monkeypatch):
+        """A worker that fails to start should not leak the shared block."""
+        start = context.SpawnProcess.start
+        calls = []
+
+        def start_once(process):
+            calls.append(process)
+            if len(calls) > 1:
+                raise OSError("spawn failed")
+            start(process)
+
+        monkeypatch.setattr(context.SpawnProcess, 'start', start_once)
+        soup = Soup(size=32, tape_length=64, seed=1)
+        def shared_blocks():
+            return {name for name in os.listdir('/dev/shm') if name.startswith('psm_')}
+
+        blocks = shared_blocks()
+        with pytest.raises(OSError, match='spawn failed'):
+            SharedSoupRunner(soup, num_workers=2, max_ops=500)
+        assert shared_blocks() == blocks
+        assert soup.arena.flags.owndata
+        assert not calls[0].is_alive()
+
+
+class TestEpochStats:
+    """Test EpochStats aggregation helpers."""
+
+    def test_ops_mean(self):
+        """Mean should divide total ops by interactions."""
+        stats = EpochStats(interactions=4, ops_sum=10, ops_max=6)
+        assert stats.ops_mean == pytest.approx(2.5)
+
+    def test_ops_mean_empty(self):
+        """Empty epoch should report zero mean."""
+        assert EpochStats(interactions=0, ops_sum=0, ops_max=0).ops_mean == 0.0
@@ -6,10 +6,12 @@ which is the core mechanism of the BFF abiogenesis experiment.
 """
 
 import sys
+import warnings
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
+import numpy as np
 from core.tape import Tape
 from core.soup import Soup, InteractionResult
 
@@ -33,6 +35,12 @@ class TestSoupInitialization:
         for t1, t2 in zip(soup1.tapes, soup2.tapes):
             assert t1.data == t2.data
 
+    def test_seeded_tapes(self):
+        """Tape i of a seeded soup is the tape seeded with seed + i."""
+        soup = Soup(size=8, tape_length=64, seed=42)
+        for i, tape in enumerate(soup.tapes):
+            assert tape == Tape(length=64, seed=42 + i)
+
     def test_different_seeds_produce_different_soups(self):
         """Different seeds should produce different soups."""
         soup1 = Soup(size=50, tape_length=64, seed=42)
@@ -51,6 +59,48 @@ class TestSoupInitialization:
         assert all(tape.length == 128 for tape in soup.tapes)
 
 
+class TestArena:
+    """Test the contiguous uint8 arena backing the soup."""
+
+    def test_arena_shape_and_dtype(self):
+        """Arena should be a (size, tape_length) uint8 array."""
+        soup = Soup(size=20, tape_length=32, seed=42)
+
+        assert soup.arena.shape == (20, 32)
+        assert soup.arena.dtype == np.uint8
+
+    def test_tapes_are_views_onto_arena(self):
+        """Writing through a tape should modify the arena row."""
+        soup = Soup(size=10, tape_length=64, seed=42)
+
+        soup.tapes[3].set_byte(5, 77)
+
+        assert soup.arena[3, 5] == 77
+        assert soup.tapes[3].data == soup.arena[3].tolist()
+
+    def test_assigning_tape_copies_into_arena(self):
+        """Assigning a Tape should copy its bytes, not alias it."""
+        soup = Soup(size=10, tape_length=64, seed=42)
+        tape = Tape(length=64, data=[7] * 64)
+
+        soup.tapes[2] = tape
+        tape.set_byte(0, 0)
+
+        assert soup.arena[2].tolist() == [7] * 64
+
+    def test_interaction_writes_back_to_arena(self):
+        """Pair execution should update both arena rows in place."""
+        soup = Soup(size=2, tape_length=4)
+        # '+' at position 0 increments itself; tape 2 is untouched data
+        soup.tapes[0] = Tape(length=4, data=[43, 0, 0, 0])
+        soup.tapes[1] = Tape(length=4, data=[1, 2, 3, 4])
+
+        soup.interact_pair(0, 1)
+
+        assert soup.arena[0].tolist() == [44, 0, 0, 0]
+        assert soup.arena[1].tolist() == [1, 2, 3, 4]
+
+
 class TestTapeSelection:
     """Test random tape selection for interactions."""
 
@@ -128,6 +178,64 @@ class TestPairwiseInteraction:
         # but with 100 interactions it's extremely unlikely
 
 
+class TestEpochs:
+    """Test epoch scheduling with disjoint pairs."""
+
+    def test_epoch_pairs_are_disjoint(self):
+        """Every tape should appear in exactly one pair."""
+        soup = Soup(size=100, tape_length=64, seed=42)
+
+        idx1, idx2, budgets = soup.select_epoch_pairs()
+
+        assert len(idx1) == 50
+        assert sorted(np.concatenate([idx1, idx2]).tolist()) == list(range(100))
+        assert all(budgets == 10000)
+
+    def test_odd_size_leaves_one_out(self):
+        """With an odd soup size one tape should sit out."""
+        soup = Soup(size=11, tape_length=64, seed=42)
+
+        idx1, idx2, _ = soup.select_epoch_pairs()
+
+        assert len(idx1) == 5
+        assert len(set(np.concatenate([idx1, idx2]).tolist())) == 10
+
+    def test_run_epoch_counts_interactions(self):
+        """One epoch should perform size // 2 interactions."""
+        soup = Soup(size=64, tape_length=64, seed=42)
+
+        results = soup.run_epoch(max_ops=1000)
+
+        assert len(results) == 32
+        assert soup.interaction_count == 32
+
+    @pytest.mark.parametrize('timeout_prob', [0.0, 0.01])
+    def test_epoch_engines_identical(self, timeout_prob):
+        """Parallel numba epochs should match serial python epochs exactly."""
+        soup_py = Soup(size=64, tape_length=64, seed=5, engine='python')
+        soup_nb = Soup(size=64, tape_length=64, seed=5, engine='numba')
+
+        for _ in range(20):
+            results_py = soup_py.run_epoch(max_ops=1000, timeout_prob=timeout_prob)
+            results_nb = soup_nb.run_epoch(max_ops=1000, timeout_prob=timeout_prob)
+            assert [(r.idx1, r.idx2, r.operations, r.timed_out) for r in results_py] == \
+                [(r.idx1, r.idx2, r.operations, r.timed_out) for r in results_nb]
+
+        assert np.array_equal(soup_py.arena, soup_nb.arena)
+
+    def test_epoch_timeouts_occur(self):
+        """High timeout probability should produce timed-out pairs."""
+        soup = Soup(size=64, tape_length=64, seed=5)
+        # Infinite loop in every tape: '+[]'
+        for i in range(64):
+            soup.tapes[i] = Tape(length=64, data=[43, 91, 93] + [0] * 61)
+
+        results = soup.run_epoch(max_ops=1000, timeout_prob=0.05)
+
+        assert any(r.timed_out for r in results)
+        assert all(r.operations <= 1000 for r in results)
+
+
 class TestMutation:
     """Test mutation mechanism."""
 
@@ -173,6 +281,47 @@ class TestMutation:
             assert all(0 <= byte <= 255 for byte in tape.data)
 
 
+class TestSparseMutation:
+    """Test the geometric-skip mutation sampler."""
+
+    def test_mutation_count_matches_rate(self):
+        """Number of mutated positions should be close to rate * volume."""
+        soup = Soup(size=100, tape_length=64, mutation_rate=0.01, seed=42)
+
+        positions = soup.apply_mutations(rounds=100)
+
+        expected = 0.01 * 100 * 64 * 100
+        assert abs(len(positions) - expected) < 5 * np.sqrt(expected)
+
+    def test_positions_are_uniform_over_soup(self):
+        """Mutations should land across the whole arena, not just the start."""
+        soup = Soup(size=100, tape_length=64, mutation_rate=0.05, seed=1)
+
+        positions = soup.apply_mutations(rounds=20)
+
+        halves = np.bincount(positions // (50 * 64), minlength=2)
+        assert halves.min() > 0.4 * len(positions)
+
+    def test_mutation_reproducible_with_seed(self):
+        """Same seed should give identical mutations."""
+        soup1 = Soup(size=20, tape_length=64, mutation_rate=0.01, seed=7)
+        soup2 = Soup(size=20, tape_length=64, mutation_rate=0.01, seed=7)
+
+        for _ in range(50):
+            soup1.apply_mutations()
+            soup2.apply_mutations()
+
+        assert np.array_equal(soup1.arena, soup2.arena)
+
+    def test_countdown_carries_between_calls(self):
+        """Tiny rates should rarely mutate anything in a single call."""
+        soup = Soup(size=10, tape_length=64, mutation_rate=1e-6, seed=3)
+
+        counts = [len(soup.apply_mutations()) for _ in range(100)]
+
+        assert sum(counts) <= 2
+
+
 class TestMultipleInteractions:
     """Test running many interactions."""
 
@@ -250,6 +399,90 @@ class TestSoupStatistics:
         assert diversity > 0.8
 
 
+class TestFingerprintMultiset:
+    """Test the incrementally maintained fingerprint multiset."""
+
+    @staticmethod
+    def recount(soup):
+        """Unique count recomputed from scratch."""
+        return len({row.tobytes() for row in soup.arena})
+
+    def test_unique_count_tracks_interactions(self):
+        """Multiset should agree with a full recount after many interactions."""
+        soup = Soup(size=50, tape_length=64, seed=4, engine='numba')
+        for tape_index in range(1, 10):
+            soup.tapes[tape_index] = soup.tapes[0]
+
+        soup.run(num_interactions=2000, max_ops=1000)
+
+        assert soup.count_unique_tapes() == self.recount(soup)
+
+    def test_unique_count_tracks_epochs_and_mutation(self):
+        """Epochs and mutations should keep the multiset in sync."""
+        soup = Soup(size=50, tape_length=64, mutation_rate=0.001, seed=4)
+
+        for _ in range(10):
+            soup.run_epoch(max_ops=1000)
+
+        assert soup.count_unique_tapes() == self.recount(soup)
+
+    def test_fingerprints_match_recomputation(self):
+        """Stored fingerprints should equal a fresh rebuild."""
+        soup = Soup(size=30, tape_length=64, seed=2)
+        soup.run(num_interactions=500, max_ops=1000)
+        stored = soup.get_fingerprints()
+
+        soup.refresh_fingerprints()
+
+        assert np.array_equal(stored, soup.get_fingerprints())
+
+    def test_top_replicators(self):
+        """Most common tape should be reported first with its count."""
+        soup = Soup(size=20, tape_length=64, seed=1)
+        for tape_index in range(5):
+            soup.tapes[tape_index] = Tape(length=64, data=[0] * 64)
+
+        fingerprint, count, index = soup.top_replicators(1)[0]
+
+        assert count == 5
+        assert soup.arena[index].tolist() == [0] * 64
+        assert fingerprint == int(soup.get_fingerprints()[0])
+
+    def test_top_replicators_after_overwrite(self):
+        """The reported copy is still a copy after the recorded one is overwritten."""
+        soup = Soup(size=20, tape_length=64, seed=1)
+        for tape_index in range(5):
+            soup.tapes[tape_index] = Tape(length=64, data=[0] * 64)
+        soup.tapes[4] = Tape(length=64, data=[1] * 64)
+
+        _, count, index = soup.top_replicators(1)[0]
+
+        assert count == 4 and index < 4
+
+    def test_writes_through_views_tracked(self):
+        """Diversity sees writes made through Tape views, kept or temporary."""
+        soup = Soup(size=10, tape_length=64, seed=1)
+        view = soup.tapes[1]
+        view.data = soup.arena[0].tolist()
+        assert soup.count_unique_tapes() == 9
+
+        view.set_byte(0, (view.get_byte(0) + 1) % 256)
+        assert soup.count_unique_tapes() == 10
+
+        soup.tapes[2].buffer[:] = soup.arena[0]
+        assert soup.get_diversity() == 0.9
+        assert soup.top_replicators(1)[0][1] == 2
+
+    def test_refresh_after_arena_edit(self):
+        """Direct edits of the arena need an explicit refresh."""
+        soup = Soup(size=10, tape_length=64, seed=1)
+        soup.arena[1] = soup.arena[0]
+
+        soup.refresh_fingerprints([1])
+
+        assert soup.count_unique_tapes() == 9
+
+
 class TestSoupState:
     """Test soup state management."""
 
@@ -342,3 +575,90 @@ class TestInteractionResult:
         assert hasattr(result, 'idx1')
         assert hasattr(result, 'idx2')
         assert hasattr(result, 'terminated')
+
+
+class TestPairCache:
+    """Test memoization of pair outcomes."""
+
+    @staticmethod
+    def _low_diversity_soup(**kwargs):
+        """Soup of four distinct looping tapes, many copies each."""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            soup = Soup(size=64, tape_length=16, seed=8, **kwargs)
+        programs = [b'[<+>-]', b'+[>+<-]', b'-[-]', b'<[,>]']
+        for i in range(soup.size):
+            soup.arena[i] = 0
+            program = programs[i % len(programs)]
+            soup.arena[i, :len(program)] = np.frombuffer(program, dtype=np.uint8)
+        soup.refresh_fingerprints()
+        return soup
+
+    @pytest.mark.parametrize('engine', ['python', 'numba'])
+    def test_cached_run_matches_uncached(self, engine):
+        """Cached soups should follow the exact same trajectory."""
+        plain = self._low_diversity_soup(engine=engine)
+        cached = self._low_diversity_soup(engine=engine, pair_cache=64)
+
+        expected = plain.run(500, max_ops=2000)
+        results = cached.run(500, max_ops=2000)
+
+        assert [r.operations for r in results] == [r.operations for r in expected]
+        assert [r.crashed for r in results] == [r.crashed for r in expected]
+        assert np.array_equal(cached.arena, plain.arena)
+        assert cached.cache_hits > 0
+
+    def test_epochs_and_timeouts(self):
+        """Epochs with timeouts should also match with the cache on."""
+        plain = self._low_diversity_soup(engine='numba')
+        cached = self._low_diversity_soup(engine='numba', pair_cache=64)
+        for _ in range(5):
+            expected = plain.run_epoch(max_ops=2000, timeout_prob=0.001, results='records')
+            records = cached.run_epoch(max_ops=2000, timeout_prob=0.001, results='records')
+            assert np.array_equal(records.data, expected.data)
+        assert np.array_equal(cached.arena, plain.arena)
+
+    def test_numba_engine_warns(self):
+        """A cache on the numba engine warns that batch paths are disabled."""
+        with pytest.warns(RuntimeWarning, match='numba'):
+            Soup(size=8, tape_length=16, engine='numba', pair_cache=8)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            Soup(size=8, tape_length=16, engine='numba')
+            Soup(size=8, tape_length=16, pair_cache=8)
+
+    def test_capacity_bounded(self):
+        """The cache should never exceed its capacity."""
+        soup = Soup(size=32, tape_length=16, seed=1, pair_cache=8)
+        soup.run(200, max_ops=500)
+        info = soup.pair_cache_info()
+        assert info['entries'] == 8
+        assert info['hits'] + info['misses'] == 200
+
+    def test_stale_fingerprint_is_a_miss(self):
+        """Untracked arena edits must not replay a wrong outcome."""
+        soup = self._low_diversity_soup(pair_cache=16)
+        soup.interact_pair(0, 1, max_ops=2000)
+        soup.arena[0] = soup.arena[4]
+        soup.arena[1] = soup.arena[5]
+        soup.refresh_fingerprints()
+        soup.interact_pair(4, 5, max_ops=2000)
+        hits = soup.cache_hits
+
+        # Edit tape 8 without refreshing its (now stale) fingerprint
+        soup.arena[8, :] = 0
+        reference = Soup.from_arena(soup.get_metadata(), soup.arena.copy())
+        reference._init_pair_cache(0)
+        expected = reference.interact_pair(8, 9, max_ops=2000)
+        result = soup.interact_pair(8, 9, max_ops=2000)
+
+        assert soup.cache_hits == hits
+        assert result.operations == expected.operations
+        assert np.array_equal(soup.arena, reference.arena)
+
+    def test_cache_capacity_survives_state_round_trip(self):
+        """The cache setting should be restored from saved state."""
+        soup = Soup(size=10, seed=1, pair_cache=100)
+        restored = Soup.from_state(soup.get_state())
+        assert restored.pair_cache == 100
+        assert restored.pair_cache_info()['entries'] == 0
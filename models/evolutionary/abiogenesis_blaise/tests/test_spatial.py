@@ -0,0 +1,147 @@
+"""
+Tests for the 2-D spatial soup extension.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from core import kernel
+from core.checkpoint import save_checkpoint, load_checkpoint
+from core.shared_soup import SharedSoupRunner, epoch_batches
+from extensions.spatial import SpatialSoup, neighbor_offsets, default_block_size
+
+
+def grid_distance(soup, idx1, idx2, metric):
+    """Periodic distance between grid cells under ``metric`` (max or sum)."""
+    dy = np.abs(np.asarray(idx1) // soup.width - np.asarray(idx2) // soup.width)
+    dx = np.abs(np.asarray(idx1) % soup.width - np.asarray(idx2) % soup.width)
+    dy = np.minimum(dy, soup.height - dy)
+    dx = np.minimum(dx, soup.width - dx)
+    return metric(dy, dx)
+
+
+class TestGeometry:
+    """Neighbourhoods and block decomposition."""
+
+    def test_neighbor_offsets(self):
+        """Moore and von Neumann neighbourhoods exclude the centre."""
+        assert neighbor_offsets(1, 'moore').shape == (8, 2)
+        assert neighbor_offsets(2, 'moore').shape == (24, 2)
+        assert neighbor_offsets(2, 'von_neumann').shape == (12, 2)
+        with pytest.raises(ValueError):
+            neighbor_offsets(0)
+
+    def test_block_size(self):
+        """Blocks cover at least the interaction diameter and tile the grid evenly."""
+        assert default_block_size(256, 256, 2) == 4
+        assert default_block_size(256, 256, 3) == 8
+        with pytest.raises(ValueError):
+            default_block_size(20, 22, 3)
+        with pytest.raises(ValueError):
+            SpatialSoup(16, 16, radius=2, block_size=2)
+        with pytest.raises(ValueError):
+            SpatialSoup(20, 20, radius=2, block_size=4)
+
+
+class TestSpatialPairs:
+    """Interactions stay local, and epochs respect the decomposition."""
+
+    @pytest.mark.parametrize('neighborhood, metric', [
+        ('moore', np.maximum), ('von_neumann', np.add),
+    ])
+    def test_partners_within_radius(self, neighborhood, metric):
+        """Serial draws and epoch pairs both pick neighbours within the radius."""
+        soup = SpatialSoup(16, 24, tape_length=8, radius=2, neighborhood=neighborhood, seed=1)
+        serial = np.array([soup._draw_pair() for _ in range(2000)])
+        idx1, idx2, _ = soup.select_epoch_pairs()
+        for a, b in (serial.T, (idx1, idx2)):
+            distance = grid_distance(soup, a, b, metric)
+            assert distance.min() >= 1 and distance.max() <= 2
+
+    def test_epoch_covers_every_cell(self):
+        """Every tape initiates exactly one interaction per epoch."""
+        soup = SpatialSoup(16, 16, tape_length=8, seed=2)
+        idx1, _, _ = soup.select_epoch_pairs()
+        assert np.array_equal(np.sort(idx1), np.arange(soup.size))
+
+    def test_blocks_of_a_phase_are_disjoint(self):
+        """No tape is touched by two blocks of the same phase."""
+        soup = SpatialSoup(32, 16, tape_length=8, radius=2, seed=3)
+        idx1, idx2, _ = soup.select_epoch_pairs()
+        shape = soup._block_cells.shape
+        for phase in range(4):
+            touched = [
+                set(a.tolist()) | set(b.tolist())
+                for a, b in zip(idx1.reshape(shape)[phase], idx2.reshape(shape)[phase])
+            ]
+            assert sum(map(len, touched)) == len(set().union(*touched))
+
+
+class TestSpatialRuns:
+    """Engines, scheduling and persistence."""
+
+    def test_engines_identical(self):
+        """Parallel blocks give the same soup as serial python execution."""
+        soups = [
+            SpatialSoup(16, 16, tape_length=32, seed=4, engine=engine, mutation_rate=1e-3)
+            for engine in ('python', 'numba')
+        ]
+        for soup in soups:
+            for _ in range(3):
+                soup.run_epoch(max_ops=1000, timeout_prob=0.01)
+            soup.run(300, max_ops=1000)
+        assert np.array_equal(soups[0].arena, soups[1].arena)
+        assert soups[0].interaction_count == 3 * 256 + 300
+
+    def test_epoch_matches_sequence(self):
+        """Running the epoch pairs strictly in order gives the same arena."""
+        soup = SpatialSoup(16, 16, tape_length=32, seed=5, engine='numba')
+        expected = soup.arena.copy()
+        state = soup._rng.getstate()
+        idx1, idx2, budgets = soup.select_epoch_pairs(max_ops=1000)
+        kernel.run_sequence(expected, idx1, idx2, budgets, 1000,
+                            np.empty(soup.size, np.int64), np.empty(soup.size, np.uint8))
+        soup._rng.setstate(state)
+        soup.run_epoch(max_ops=1000)
+        assert np.array_equal(soup.arena, expected)
+
+    def test_worker_batches_are_disjoint(self):
+        """Concurrent worker batches never share a tape; phases stay in order."""
+        soup = SpatialSoup(32, 32, tape_length=8, radius=2, seed=8)
+        idx1, idx2, budgets = soup.select_epoch_pairs()
+        phases = epoch_batches(soup, idx1, idx2, budgets, batch_pairs=64)
+        assert len(phases) == 4
+        assert np.array_equal(np.concatenate([b[0].ravel() for p in phases for b in p]), idx1)
+        for batches in phases:
+            touched = [set(a.ravel().tolist()) | set(b.ravel().tolist()) for a, b, _ in batches]
+            assert sum(map(len, touched)) == len(set().union(*touched))
+
+    def test_shared_runner_matches_epochs(self):
+        """Worker processes run the phases in order with identical results."""
+        reference = SpatialSoup(32, 32, tape_length=32, seed=7, engine='numba')
+        soup = SpatialSoup(32, 32, tape_length=32, seed=7)
+        expected = [
+            reference.run_epoch(max_ops=1000, timeout_prob=0.01, results='records').operations
+            for _ in range(5)
+        ]
+        with SharedSoupRunner(soup, num_workers=2, max_ops=1000, timeout_prob=0.01,
+                              batch_pairs=64) as runner:
+            stats = [runner.run_epoch() for _ in range(5)]
+        assert np.array_equal(soup.arena, reference.arena)
+        assert all(s.interactions == 1024 for s in stats)
+        assert all(np.array_equal(s.operations, ops) for s, ops in zip(stats, expected))
+
+    def test_checkpoint_round_trip(self, tmp_path):
+        """Grid geometry and trajectory survive a checkpoint."""
+        soup = SpatialSoup(8, 16, tape_length=16, radius=1, neighborhood='von_neumann',
+                           seed=6, engine='numba')
+        save_checkpoint(tmp_path / 'spatial.ckpt', soup)
+        restored, _ = load_checkpoint(tmp_path / 'spatial.ckpt', soup_class=SpatialSoup)
+        assert (restored.width, restored.height, restored.neighborhood) == (8, 16, 'von_neumann')
+        soup.run_epoch(max_ops=500)
+        restored.run_epoch(max_ops=500)
+        assert np.array_equal(soup.fingerprint_grid(), restored.fingerprint_grid())
+        assert soup.grid().shape == (16, 8, 16)
@@ -0,0 +1,135 @@
+"""
+Tests for the parameter sweep driver.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from run_sweep import SweepStore, expand_grid, load_sweep, run_single, run_sweep
+
+
+def small_grid():
+    return expand_grid([16, 32], [32], [0.0], [0, 1])
+
+
+class TestGrid:
+    """Test grid expansion."""
+
+    def test_cartesian_product(self):
+        """Every combination should appear once with consecutive ids."""
+        configs = expand_grid([16, 32], [32, 64], [0.0, 1e-4], range(3))
+        assert len(configs) == 24
+        assert [c['run_id'] for c in configs] == list(range(24))
+        assert len({(c['soup_size'], c['tape_length'], c['mutation_rate'], c['seed'])
+                    for c in configs}) == 24
+
+    def test_instruction_sets(self):
+        """Instruction sets are the outermost grid dimension and reach the soup."""
+        configs = expand_grid([16], [32], [0.0], range(2), instruction_sets=['bff7', 'bff'])
+        assert [c['instruction_set'] for c in configs] == ['bff7', 'bff7', 'bff', 'bff']
+        summary, _ = run_single(configs[2], max_interactions=500, sample_interval=500)
+        assert summary['instruction_set'] == 'bff'
+
+
+class TestRunSingle:
+    """Test a single sweep run."""
+
+    def test_budget_stop(self):
+        """Runs without a transition should stop at the interaction budget."""
+        summary, columns = run_single(small_grid()[0], max_interactions=2500, sample_interval=1000)
+        assert summary['stop_reason'] == 'budget'
+        assert summary['transition_point'] is None
+        assert summary['interactions'] == 2500
+        assert columns['interaction'].tolist() == [1000, 2000, 2500]
+
+    def test_transition_stop(self):
+        """Runs should stop at the first sample past the transition threshold."""
+        summary, columns = run_single(
+            small_grid()[0], max_interactions=5000, sample_interval=1000,
+            transition_entropy=-10.0
+        )
+        assert summary['stop_reason'] == 'transition'
+        assert summary['transition_point'] == 1000
+        assert columns['run_id'].shape[0] == 1
+
+    def test_reproducible(self):
+        """The same config should give the same samples."""
+        _, first = run_single(small_grid()[1], max_interactions=2000)
+        _, second = run_single(small_grid()[1], max_interactions=2000)
+        for name in first:
+            assert np.array_equal(first[name], second[name])
+
+
+class TestSweepStore:
+    """Test the streamed columnar store."""
+
+    def test_sweep_and_load(self, tmp_path):
+        """All runs and their samples should be readable back."""
+        run_sweep(small_grid(), tmp_path / 'store', max_interactions=2000)
+        runs, samples = load_sweep(tmp_path / 'store')
+        assert sorted(run['run_id'] for run in runs) == [0, 1, 2, 3]
+        assert samples['run_id'].shape[0] == 8
+        for run in runs:
+            rows = samples['run_id'] == run['run_id']
+            assert samples['interaction'][rows].tolist() == [1000, 2000]
+
+    def test_restart_skips_finished_runs(self, tmp_path):
+        """Rerunning on the same store should only run missing ids."""
+        configs = small_grid()
+        run_sweep(configs[:2], tmp_path / 'store', max_interactions=1000)
+        executed = run_sweep(configs, tmp_path / 'store', max_interactions=1000)
+        assert sorted(s['run_id'] for s in executed) == [2, 3]
+        runs, samples = load_sweep(tmp_path / 'store')
+        assert len(runs) == 4
+        assert samples['run_id'].shape[0] == 4
+
+    def test_restart_rejects_other_sweeps(self, tmp_path):
+        """A store refuses other settings and other configs under its run ids."""
+        run_sweep(small_grid()[:2], tmp_path / 'store', max_interactions=1000)
+        with pytest.raises(ValueError, match='settings'):
+            run_sweep(small_grid(), tmp_path / 'store', max_interactions=2000)
+        with pytest.raises(ValueError, match='run 0'):
+            run_sweep(expand_grid([64], [32], [0.0], [0]), tmp_path / 'store',
+                      max_interactions=1000)
+        runs, _ = load_sweep(tmp_path / 'store')
+        assert len(runs) == 2
+
+    def test_interrupted_append_is_dropped(self, tmp_path):
+        """Samples written without a summary line should be ignored."""
+        config = small_grid()[0]
+        summary, columns = run_single(config, max_interactions=2000)
+        store = SweepStore(tmp_path / 'store')
+        store.append(summary, columns)
+        # Simulate a crash after writing only part of a second run
+        with open(tmp_path / 'store' / 'samples' / 'run_id.bin', 'ab') as f:
+            f.write(np.array([9], dtype='<i4').tobytes())
+
+        SweepStore(tmp_path / 'store').append(
+            dict(summary, run_id=1), dict(columns, run_id=np.ones(2, dtype='<i4'))
+        )
+        runs, samples = load_sweep(tmp_path / 'store')
+        assert samples['run_id'].tolist() == [0, 0, 1, 1]
+
+    def test_process_pool(self, tmp_path):
+        """Runs in worker processes should match in-process runs."""
+        configs = small_grid()[:2]
+        run_sweep(configs, tmp_path / 'serial', max_interactions=1000)
+        run_sweep(configs, tmp_path / 'pool', workers=2, max_interactions=1000)
+        _, serial = load_sweep(tmp_path / 'serial')
+        _, pool = load_sweep(tmp_path / 'pool')
+        order_serial = np.argsort(serial['run_id'], kind='stable')
+        order_pool = np.argsort(pool['run_id'], kind='stable')
+        assert np.array_equal(serial['ops_mean'][order_serial], pool['ops_mean'][order_pool])
+
+    def test_runs_feed_zoo(self, tmp_path):
+        """Each run should register in (and feed) a shared zoo."""
+        from analysis.zoo import ReplicatorZoo
+        run_sweep(small_grid()[:2], tmp_path / 'store', workers=2,
+                  max_interactions=2000, zoo=str(tmp_path / 'zoo.sqlite'), zoo_interval=1000)
+        with ReplicatorZoo(tmp_path / 'zoo.sqlite') as zoo:
+            runs = zoo.runs()
+        assert sorted(run['name'] for run in runs) == ['store/run_0', 'store/run_1']
+        assert all(run['config']['soup_size'] == 16 for run in runs)
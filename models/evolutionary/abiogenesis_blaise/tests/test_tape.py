@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
+import numpy as np
 from core.tape import Tape
 
 
@@ -47,6 +48,19 @@ class TestTapeInitialization:
         assert tape.data[0] == 1  # Tape data unchanged
 
 
+    def test_buffer_initialization_is_zero_copy(self):
+        """Tape built on a buffer should view it, not copy it."""
+        buffer = np.zeros(64, dtype=np.uint8)
+        tape = Tape(length=64, buffer=buffer)
+        tape.set_byte(3, 9)
+        assert buffer[3] == 9
+
+    def test_buffer_shape_mismatch(self):
+        """Buffer of the wrong shape should be rejected."""
+        with pytest.raises(ValueError):
+            Tape(length=64, buffer=np.zeros(32, dtype=np.uint8))
+
+
 class TestTapeByteOperations:
     """Test individual byte manipulation."""
 
@@ -62,6 +76,17 @@ class TestTapeByteOperations:
         tape.set_byte(10, 42)
         assert tape.data[10] == 42
 
+    def test_data_writes_through(self):
+        """Item and slice assignments on data write the tape; resizing raises."""
+        tape = Tape(length=8, data=[0] * 8)
+        data = tape.data
+        data[2:4] = [7, 9]
+        data[-1] = 5
+        assert tape.buffer.tolist() == [0, 0, 7, 9, 0, 0, 0, 5] == data
+        with pytest.raises(TypeError):
+            data.append(1)
+        assert len(tape.data) == 8
+
     def test_increment_byte(self):
         """Should increment byte with wrapping at 256."""
         tape = Tape(length=64, data=[0] * 64)
@@ -0,0 +1,146 @@
+"""
+Tests for the SQLite replicator zoo.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from core import kernel
+from core.instruction_set import BFF
+from analysis.zoo import ReplicatorZoo, canonical_form, observe_replicators
+
+
+REPLICATOR = b'[[{.>]-]]' + b'<<[,>]+-'
+
+
+def _soup_with(programs, size=32, tape_length=32, seed=0):
+    """Random-data arena with programs written over the first rows."""
+    rng = np.random.default_rng(seed)
+    # Data bytes only (no instructions), so random rows never qualify
+    arena = rng.choice(np.frombuffer(b'abcdefgh', dtype=np.uint8), size=(size, tape_length))
+    row = 0
+    for program, copies in programs:
+        for _ in range(copies):
+            arena[row, :len(program)] = np.frombuffer(program, dtype=np.uint8)
+            row += 1
+    return arena
+
+
+class TestCanonicalForm:
+    """Canonical forms keep only instruction bytes."""
+
+    def test_strips_data_bytes(self):
+        assert canonical_form(b'a[b<c]d') == b'[<]'
+        assert canonical_form(np.frombuffer(b'xx+-', dtype=np.uint8)) == b'+-'
+
+    def test_instruction_set(self):
+        """Instruction bytes are those of the given set, as in the kernel's fingerprints."""
+        assert canonical_form(b'a{b.c]', BFF) == b'{.]'
+        assert canonical_form(b'a{b.c]') == b']'
+        tapes = np.frombuffer(b'{.]xxxxx' + b'yy{.z]zz' + b'{+]xxxxx', dtype=np.uint8)
+        fingerprints = np.empty((1, 3), dtype=np.uint64)
+        kernel.kernels_for(BFF).canonical_fingerprints(tapes.reshape(1, 3, 8), fingerprints)
+        assert fingerprints[0, 0] == fingerprints[0, 1] != fingerprints[0, 2]
+
+    def test_observe_groups_variants(self):
+        """Copies differing in data bytes or position share one entry."""
+        arena = _soup_with([(REPLICATOR, 3)])
+        arena[3, 5:5 + len(REPLICATOR)] = np.frombuffer(REPLICATOR, dtype=np.uint8)
+        arena[3, :5] = ord('a')
+
+        observed = observe_replicators(arena, min_abundance=2, min_instructions=8)
+        assert len(observed) == 1
+        canonical, tape, abundance = observed[0]
+        assert canonical == canonical_form(REPLICATOR)
+        assert abundance == 4
+        assert tape.startswith(REPLICATOR)
+
+    def test_thresholds(self):
+        """Rare or short programs are not recorded."""
+        arena = _soup_with([(REPLICATOR, 1), (b'+-+-', 5)])
+        assert observe_replicators(arena, min_abundance=2, min_instructions=8) == []
+
+
+class TestReplicatorZoo:
+    """Batched ingestion and indexed lookups."""
+
+    def test_ingest_and_lookup(self, tmp_path):
+        """Programs should record first sighting and peak abundance."""
+        with ReplicatorZoo(tmp_path / 'zoo.sqlite', batch_size=2) as zoo:
+            run_id = zoo.start_run('run_a', {'soup_size': 32}, seed=7)
+            zoo.ingest(run_id, _soup_with([(REPLICATOR, 2)]), 1000)
+            zoo.ingest(run_id, _soup_with([(REPLICATOR, 9)]), 2000)
+            zoo.ingest(run_id, _soup_with([(REPLICATOR, 4)]), 3000)
+
+        with ReplicatorZoo(tmp_path / 'zoo.sqlite') as zoo:
+            assert len(zoo) == 1
+            program = zoo.lookup(b'zz' + REPLICATOR)
+            assert program['canonical'] == canonical_form(REPLICATOR)
+            assert program['first_interaction'] == 1000
+            assert program['peak_abundance'] == 9
+            assert program['peak_interaction'] == 2000
+
+            (sighting,) = zoo.sightings(program['id'])
+            assert sighting['name'] == 'run_a'
+            assert sighting['seed'] == 7
+            assert sighting['config'] == {'soup_size': 32}
+            assert zoo.lookup(b'+++') is None
+
+    def test_pending_batch_not_written_until_flush(self, tmp_path):
+        """Snapshots below batch_size stay in memory."""
+        path = tmp_path / 'zoo.sqlite'
+        zoo = ReplicatorZoo(path, batch_size=10)
+        run_id = zoo.start_run('run_a', {})
+        zoo.ingest(run_id, _soup_with([(REPLICATOR, 3)]), 100)
+
+        reader = ReplicatorZoo(path)
+        assert len(reader) == 0
+        zoo.flush()
+        assert len(reader) == 1
+        reader.close()
+        zoo.close()
+
+    def test_across_runs(self, tmp_path):
+        """Later runs update peaks but not the first sighting."""
+        other = b'>>[-<+>]<<' + b',,[]'
+        with ReplicatorZoo(tmp_path / 'zoo.sqlite', batch_size=1) as zoo:
+            first = zoo.start_run('run_a', {}, seed=1)
+            second = zoo.start_run('run_b', {}, seed=2)
+            assert zoo.start_run('run_a', {}, seed=1) == first
+
+            zoo.ingest(first, _soup_with([(REPLICATOR, 3)]), 500)
+            zoo.ingest(second, _soup_with([(REPLICATOR, 6), (other, 2)]), 100)
+
+            program = zoo.lookup(REPLICATOR)
+            assert (program['first_run'], program['first_interaction']) == (first, 500)
+            assert (program['peak_run'], program['peak_abundance']) == (second, 6)
+            assert [s['name'] for s in zoo.sightings(program['id'])] == ['run_a', 'run_b']
+            assert [p['canonical'] for p in zoo.top(2)] == [
+                canonical_form(REPLICATOR), canonical_form(other)
+            ]
+
+    def test_programs_keyed_by_instruction_set(self, tmp_path):
+        """The same tapes under two instruction sets are two programs."""
+        arena = _soup_with([(REPLICATOR, 3)])
+        with ReplicatorZoo(tmp_path / 'zoo.sqlite', batch_size=1) as zoo:
+            run_id = zoo.start_run('run', {}, seed=1)
+            zoo.ingest(run_id, arena, 100)
+            zoo.ingest(run_id, arena, 100, instruction_set='bff')
+            bff7, bff = zoo.lookup(REPLICATOR), zoo.lookup(REPLICATOR, BFF)
+            assert len(zoo) == 2 and bff7['id'] != bff['id']
+            assert bff['instruction_set'] == 'bff'
+            assert bff['canonical'] == canonical_form(REPLICATOR, BFF)
+            assert [p['id'] for p in zoo.top(5, instruction_set='bff')] == [bff['id']]
+            assert len(zoo.top(5, tape_length=len(bff['tape']))) == 2
+            assert zoo.top(5, tape_length=len(bff['tape']) + 1) == []
+
+    def test_lookup_uses_index(self, tmp_path):
+        """Canonical-form lookups should be index searches, not scans."""
+        with ReplicatorZoo(tmp_path / 'zoo.sqlite') as zoo:
+            plan = zoo._connection.execute(
+                'EXPLAIN QUERY PLAN SELECT id FROM programs '
+                'WHERE instruction_set = ? AND canonical = ?', ('bff7', b'x')
+            ).fetchall()
+        assert any(row[-1].startswith('SEARCH') and 'INDEX' in row[-1] for row in plan)